@@ -3,42 +3,204 @@
 import os
 import tempfile
 from fastapi import UploadFile
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTasks
+from starlette.concurrency import run_in_threadpool
+from modules.spooled_upload import SpooledUpload
 from services.audio_summarizer import AudioSummarizerService
-import shutil
+from services.job_queue import JobQueue, Job
 
 class AudioAPI:
     """Class to handle audio-related API logic."""
 
     def __init__(self):
         self.audio_service = AudioSummarizerService()
+        self.jobs = JobQueue()
 
-    async def summarize_audio(self, file: UploadFile, pdf_name: str) -> FileResponse:
+    @staticmethod
+    def _save_upload(file: UploadFile) -> SpooledUpload:
         """
-        Process uploaded audio and return summarized audio.
+        Wrap an upload for the pipeline: Starlette's spool file is adopted when
+        it is already on disk (no second copy), small uploads stay in memory.
+        The SHA-256 is computed on the way.
+        Raises UploadTooLargeError above UPLOAD_MAX_MB.
         """
-        # Save uploaded file temporarily
-        suffix = os.path.splitext(file.filename)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_input:
-            shutil.copyfileobj(file.file, temp_input)
-            temp_input_path = temp_input.name
+        return SpooledUpload.from_spooled(file.file, filename=file.filename)
 
+    @staticmethod
+    def _new_output_path() -> str:
         temp_output = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
         temp_output.close()  # Close to allow writing later
+        return temp_output.name
+
+    @staticmethod
+    def _remove(path: str):
+        if path and os.path.exists(path):
+            os.remove(path)
 
+    async def summarize_audio(self, file: UploadFile, pdf_name: str) -> FileResponse:
+        """
+        Process uploaded audio and return summarized audio.
+        Provider calls are awaited on the event loop (decoding runs in worker
+        threads); cloned-voice cleanup runs after the response has been sent.
+        """
+        # Spool the upload (memory, or the file Starlette already wrote when large)
+        upload = await run_in_threadpool(self._save_upload, file)
+        output_path = self._new_output_path()
+
+        background = BackgroundTasks()
         try:
-            output_path, _summary_text = self.audio_service.process_audio(
-                audio_path=temp_input_path,
+            output_path, _summary_text = await self.audio_service.aprocess_audio(
+                audio_path=upload,
                 pdf_name=pdf_name,
-                output_path=temp_output.name
-            )
-            return FileResponse(
-                output_path,
-                media_type="audio/mpeg",
-                filename=f"summarized_{file.filename}"
+                output_path=output_path,
+                defer=background.add_task,
+                audio_hash=upload.sha256,
             )
+        except Exception:
+            self._remove(output_path)
+            raise
+        finally:
+            # Release the upload
+            upload.close()
+
+        # Delete the output once it has been sent
+        background.add_task(self._remove, output_path)
+        return FileResponse(
+            output_path,
+            media_type="audio/mpeg",
+            filename=f"summarized_{file.filename}",
+            background=background,
+        )
 
+    async def summarize_audio_stream(self, file: UploadFile, pdf_name: str) -> StreamingResponse:
+        """
+        Process uploaded audio and stream the summarized speech as MP3 chunks
+        while it is being synthesized.
+        """
+        upload = await run_in_threadpool(self._save_upload, file)
+        # Runs after the response even if the client disconnects before reading
+        background = BackgroundTasks()
+        try:
+            audio_stream, _summary_text = await self.audio_service.aprocess_audio_stream(
+                audio_path=upload,
+                pdf_name=pdf_name,
+                audio_hash=upload.sha256,
+                defer=background.add_task,
+            )
         finally:
-            # Cleanup input file
-            if os.path.exists(temp_input_path):
-                os.remove(temp_input_path)
+            # Speech synthesis no longer needs the upload
+            upload.close()
+
+        return StreamingResponse(
+            audio_stream,
+            media_type="audio/mpeg",
+            headers={"Content-Disposition": f'attachment; filename="summarized_{file.filename}"'},
+            background=background,
+        )
+
+    async def summarize_audio_incremental(self, body, filename: str, pdf_name: str) -> FileResponse:
+        """
+        Process a raw audio request body while it is being uploaded:
+        decoding, voice cloning and transcription start before the last byte arrives.
+        """
+        output_path = self._new_output_path()
+
+        background = BackgroundTasks()
+        try:
+            output_path, _summary_text = await self.audio_service.aprocess_audio_incremental(
+                body=body,
+                pdf_name=pdf_name,
+                output_path=output_path,
+                defer=background.add_task,
+            )
+        except Exception:
+            self._remove(output_path)
+            raise
+
+        background.add_task(self._remove, output_path)
+        return FileResponse(
+            output_path,
+            media_type="audio/mpeg",
+            filename=f"summarized_{filename}",
+            background=background,
+        )
+
+    # -------------------------------------------------------------
+    # ⏳ Job-based API
+    # -------------------------------------------------------------
+    async def submit_summarize_job(self, file: UploadFile, pdf_name: str) -> dict:
+        """
+        Save the upload and queue the summarization pipeline.
+        Returns immediately with the job id.
+        Raises QueueFullError when the queue is at capacity.
+        """
+        upload = await run_in_threadpool(self._save_upload, file)
+        output_path = self._new_output_path()
+
+        try:
+            job = self.jobs.submit(
+                self._run_job,
+                upload=upload,
+                pdf_name=pdf_name,
+                output_path=output_path,
+                filename=file.filename,
+            )
+        except Exception:
+            upload.close()
+            self._remove(output_path)
+            raise
+
+        return job.to_dict()
+
+    def _run_job(
+        self,
+        upload: SpooledUpload,
+        pdf_name: str,
+        output_path: str,
+        filename: str,
+        job: Job,
+    ) -> dict:
+        """Worker-side body of a summarization job."""
+        job.on_finish.append(upload.close)
+        job.on_expire.append(lambda: self._remove(output_path))
+        try:
+            output_path, summary_text = self.audio_service.process_audio(
+                audio_path=upload,
+                pdf_name=pdf_name,
+                output_path=output_path,
+                progress=job.set_progress,
+                defer=job.on_finish.append,
+                audio_hash=upload.sha256,
+            )
+        except Exception:
+            self._remove(output_path)
+            raise
+        return {"output_path": output_path, "summary": summary_text, "filename": filename}
+
+    def get_job_status(self, job_id: str) -> dict:
+        """Return the job state, or None if the job is unknown."""
+        job = self.jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    def get_job_result(self, job_id: str):
+        """
+        Return the summarized audio of a finished job.
+        :return: (job, FileResponse or None) – response is None while the job is not done
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.status != Job.DONE:
+            return job, None
+        return job, FileResponse(
+            job.result["output_path"],
+            media_type="audio/mpeg",
+            filename=f"summarized_{job.result['filename']}"
+        )
+
+    def close(self):
+        """Release the service's worker processes (called on app shutdown)."""
+        self.audio_service.close()
+
+    def cache_stats(self) -> dict:
+        """Cache hit / miss counters of the summarization pipeline."""
+        return self.audio_service.cache_stats()
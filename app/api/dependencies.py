@@ -0,0 +1,92 @@
+# api/dependencies.py
+import threading
+from fastapi import HTTPException
+
+# -------------------------------------------------------------
+# 💤 Lazily constructed services
+# -------------------------------------------------------------
+# Services (and the SDK clients they hold) are built on first use instead of
+# at import, so workers start fast and a missing key only fails the routes
+# that need it (503) instead of crashing the import of main.py.
+
+_lock = threading.Lock()
+_services = {}
+_errors = {}
+
+
+def _build_audio_api():
+    from api.audio_api import AudioAPI
+    return AudioAPI()
+
+
+def _build_voice_service():
+    from services.voice_cloner import VoiceClonerService
+    return VoiceClonerService()
+
+
+_FACTORIES = {
+    "audio_api": _build_audio_api,
+    "voice_service": _build_voice_service,
+}
+
+
+def _get_or_create(name: str):
+    service = _services.get(name)
+    if service is not None:
+        return service
+    with _lock:
+        service = _services.get(name)
+        if service is None:
+            try:
+                service = _FACTORIES[name]()
+            except Exception as e:
+                _errors[name] = f"{type(e).__name__}: {e}"
+                raise
+            _services[name] = service
+            _errors.pop(name, None)
+        return service
+
+
+def _dependency(name: str):
+    try:
+        return _get_or_create(name)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Service unavailable: {e}")
+
+
+def get_audio_api():
+    """FastAPI dependency: the shared AudioAPI, built on first request."""
+    return _dependency("audio_api")
+
+
+def get_voice_service():
+    """FastAPI dependency: the shared VoiceClonerService, built on first request."""
+    return _dependency("voice_service")
+
+
+def warm_services():
+    """Build every service now (run off the event loop at startup); failures are kept for /ready."""
+    for name in _FACTORIES:
+        try:
+            _get_or_create(name)
+        except Exception as e:
+            print(f"⚠️ Could not build {name}: {e}")
+
+
+def close_services():
+    """Shut down the worker pools of the services that were built (app shutdown)."""
+    for name, service in list(_services.items()):
+        close = getattr(service, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                print(f"⚠️ Could not close {name}: {e}")
+
+
+def service_status() -> dict:
+    """{name: "ready" | "not_started" | error message} for each service."""
+    return {
+        name: "ready" if name in _services else _errors.get(name, "not_started")
+        for name in _FACTORIES
+    }
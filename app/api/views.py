@@ -1,22 +1,100 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from api.audio_api import AudioAPI
-from services.voice_cloner import VoiceClonerService
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, Depends
+from api.dependencies import get_audio_api, get_voice_service
+from services.job_queue import QueueFullError
+from modules.spooled_upload import UploadTooLargeError
+from modules.audio_analysis import AudioQualityError
 
 api = APIRouter()
-audio_api = AudioAPI()
-voice_service = VoiceClonerService()
 
 @api.post("/summarize_audio/")
-async def summarize_audio(file: UploadFile = File(...), pdf_name: str = Form(...)):
+async def summarize_audio(
+    file: UploadFile = File(...),
+    pdf_name: str = Form(...),
+    stream: bool = Form(False),
+    audio_api=Depends(get_audio_api),
+):
     """
     Complete Endpoint to summarize audio.
+    - stream=true: MP3 chunks are streamed to the client as they are synthesized.
+    """
+    try:
+        if stream:
+            return await audio_api.summarize_audio_stream(file, pdf_name)
+        return await audio_api.summarize_audio(file, pdf_name)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except AudioQualityError as e:
+        raise HTTPException(status_code=422, detail={"error": str(e), "quality": e.report})
+
+@api.post("/summarize_audio/ingest/")
+async def summarize_audio_ingest(
+    request: Request,
+    pdf_name: str,
+    filename: str = "audio.mp3",
+    audio_api=Depends(get_audio_api),
+):
     """
-    return await audio_api.summarize_audio(file, pdf_name)
+    Streaming ingest: send the raw audio as the request body (not multipart).
+    Cloning and transcription start while the upload is still arriving.
+    - Query: pdf_name, filename (optional, used for the download name)
+    """
+    try:
+        return await audio_api.summarize_audio_incremental(request.stream(), filename, pdf_name)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except AudioQualityError as e:
+        raise HTTPException(status_code=422, detail={"error": str(e), "quality": e.report})
+
+@api.post("/summarize_audio/jobs/", status_code=202)
+async def submit_summarize_job(
+    file: UploadFile = File(...),
+    pdf_name: str = Form(...),
+    audio_api=Depends(get_audio_api),
+):
+    """
+    Queue an audio summarization job and return its job_id right away.
+    """
+    try:
+        return await audio_api.submit_summarize_job(file, pdf_name)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@api.get("/summarize_audio/jobs/{job_id}")
+async def get_summarize_job(job_id: str, audio_api=Depends(get_audio_api)):
+    """
+    Get the status and current step of a summarization job.
+    """
+    status = audio_api.get_job_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+@api.get("/summarize_audio/jobs/{job_id}/result")
+async def get_summarize_job_result(job_id: str, audio_api=Depends(get_audio_api)):
+    """
+    Download the summarized audio once the job is done.
+    """
+    job, response = audio_api.get_job_result(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if response is None:
+        raise HTTPException(status_code=409, detail=job.to_dict())
+    return response
+
+@api.get("/cache/stats/")
+async def cache_stats(audio_api=Depends(get_audio_api)):
+    """
+    Hit / miss counters of the pipeline caches.
+    """
+    return audio_api.cache_stats()
 
 @api.post("/voice-clone/")
 async def create_voice_clone(
     voice_name: str = Form(...),
     audio_file: UploadFile = File(...),
+    voice_service=Depends(get_voice_service),
 ):
     """
     API Endpoint:
@@ -24,20 +102,52 @@ async def create_voice_clone(
     - Input: voice_name, audio_file
     """
     try:
-        result = voice_service.create_voice(voice_name, audio_file.file)
+        result = await voice_service.acreate_voice(voice_name, audio_file.file)
         return {"status": "success", **result}
 
+    except AudioQualityError as e:
+        raise HTTPException(status_code=422, detail={"error": str(e), "quality": e.report})
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@api.post("/voice-clone/ingest/")
+async def create_voice_clone_ingest(request: Request, voice_name: str, voice_service=Depends(get_voice_service)):
+    """
+    Streaming ingest: send the raw audio as the request body (not multipart).
+    The voice is cloned as soon as enough audio has been decoded.
+    - Query: voice_name
+    """
+    try:
+        result = await voice_service.acreate_voice_incremental(voice_name, request.stream())
+        return {"status": "success", **result}
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except AudioQualityError as e:
+        raise HTTPException(status_code=422, detail={"error": str(e), "quality": e.report})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @api.delete("/voice-clone/")
-async def delete_voice_clone(voice_name: str = Form(...)):
+async def delete_voice_clone(voice_name: str = Form(...), voice_service=Depends(get_voice_service)):
     """
     Delete a cloned voice by name (locally + ElevenLabs).
     """
     try:
-        result = voice_service.delete_voice(voice_name)
+        result = await voice_service.adelete_voice(voice_name)
+        return {"status": "success", **result}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@api.post("/voice-clone/refresh/")
+async def refresh_voice_index(voice_service=Depends(get_voice_service)):
+    """
+    Reload the cached index of voices in the ElevenLabs account.
+    """
+    try:
+        result = await voice_service.arefresh_remote_voices()
         return {"status": "success", **result}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
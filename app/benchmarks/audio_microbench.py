@@ -0,0 +1,332 @@
+# benchmarks/audio_microbench.py
+"""
+⏱️ Microbenchmarks for the audio-processing modules on synthetic audio.
+
+Inputs are generated once per (duration, sample rate, codec) case. Each
+operation then runs in a fresh worker process, so every measurement starts
+from a clean heap:
+  wall_sec      median wall time over --repeat runs
+  cpu_sec       median CPU time (this process + reaped children such as ffmpeg)
+  peak_rss_mb   peak resident memory of the worker during the runs
+  child_rss_mb  peak resident memory of any child process (ffmpeg, pool workers)
+
+Results can be saved as a baseline and compared on later runs; an operation
+slower or bigger than the baseline by more than --tolerance is a regression
+and makes the script exit with status 1.
+
+Baseline workflow (timings are machine-specific, so no baseline is shipped;
+record one per machine / CI runner and keep it next to that runner's config):
+  1. On the reference commit, from the app directory:
+       python -m benchmarks.audio_microbench --durations 30,300 --repeat 5 --save-baseline bench.json
+  2. After a change, run with the same options against it:
+       python -m benchmarks.audio_microbench --durations 30,300 --repeat 5 --baseline bench.json
+     Regressions are listed and the exit status is 1.
+  3. When a slowdown is intended (or the runner changed), re-record with step 1.
+Cases are matched on operation / codec / sample rate / duration, so a run with
+a subset of the options only checks the cases it shares with the baseline.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from benchmarks.synthetic_audio import speech_like, encode
+
+CODECS = ("wav", "flac", "mp3", "m4a")
+COMPARED = ("wall_sec", "cpu_sec", "peak_rss_mb")
+
+
+# -------------------------------------------------------------
+# 🎛️ Operations
+# -------------------------------------------------------------
+# Each operation takes (input path, scratch dir), does its setup outside the
+# timed region and returns the callable that is measured.
+def _decoded(path):
+    from modules.audio_buffer import AudioBuffer
+    return AudioBuffer.from_file(path, 16000, 1)
+
+
+def op_decode(path, workdir):
+    from modules.audio_buffer import AudioBuffer
+    return lambda: AudioBuffer.from_file(path, 16000, 1)
+
+
+def op_convert_wav(path, workdir):
+    from modules.audio_converter import AudioConverter
+    converter = AudioConverter()
+    return lambda: converter.to_wav(path, os.path.join(workdir, "out.wav"))
+
+
+def op_convert_mp3(path, workdir):
+    from modules.audio_converter import AudioConverter
+    converter = AudioConverter()
+    return lambda: converter.to_mp3(path, os.path.join(workdir, "out.mp3"))
+
+
+def op_convert_to_wav(path, workdir):
+    """VoiceCloner.convert_to_wav (mono 16 kHz); needs no provider access."""
+    os.environ.setdefault("ELEVENLABS_API_KEY", "benchmark")
+    from modules.voice_clone import VoiceCloner
+    cloner = VoiceCloner()
+
+    def run():
+        os.remove(cloner.convert_to_wav(path))
+    return run
+
+
+def op_crop(path, workdir):
+    """AudioCroper.crop_audio on a file: a 20 s window from the middle."""
+    from modules.audio_crop import AudioCroper
+    import soundfile as sf
+    cropper = AudioCroper()
+    try:
+        duration = sf.info(path).duration
+    except RuntimeError:
+        duration = cropper.transcoder.probe(path)["duration"] or 20.0
+    start = max(0.0, duration / 2 - 10)
+    window = (int(start // 60), start % 60), (int((start + 20) // 60), (start + 20) % 60)
+    return lambda: cropper.crop_audio(path, *window)
+
+
+def op_analyze(path, workdir):
+    from modules.audio_analysis import AudioAnalyzer
+    audio, analyzer = _decoded(path), AudioAnalyzer()
+    return lambda: analyzer.analyze(audio)
+
+
+def op_select_speech(path, workdir):
+    from modules.audio_analysis import AudioAnalyzer
+    audio, analyzer = _decoded(path), AudioAnalyzer()
+    return lambda: analyzer.select_speech(audio, 270)
+
+
+def op_split_on_silence(path, workdir):
+    audio = _decoded(path)
+    return lambda: audio.split_on_silence(120)
+
+
+def op_noise_reduce(path, workdir):
+    """NoiseReducer.reduce, forced on; the pool is shut down per run so its CPU time is reaped."""
+    from modules.noise_reduction import NoiseReducer
+    audio = _decoded(path)
+    reducer = NoiseReducer(skip_snr_db=float("inf"))
+    if not reducer.available:
+        return None
+
+    def run():
+        reducer.reduce(audio)
+        pool = reducer._pool
+        reducer.close()
+        if pool is not None:
+            pool.shutdown(wait=True)
+    return run
+
+
+OPERATIONS = {
+    "decode": op_decode,
+    "convert_wav": op_convert_wav,
+    "convert_mp3": op_convert_mp3,
+    "convert_to_wav": op_convert_to_wav,
+    "crop": op_crop,
+    "analyze": op_analyze,
+    "select_speech": op_select_speech,
+    "split_on_silence": op_split_on_silence,
+    "noise_reduce": op_noise_reduce,
+}
+# Operations on decoded samples do not depend on the source codec: run them on WAV only
+CODEC_INDEPENDENT = ("analyze", "select_speech", "split_on_silence", "noise_reduce")
+
+
+# -------------------------------------------------------------
+# 📏 Measurement (runs in the worker process)
+# -------------------------------------------------------------
+def _reset_peak_rss():
+    """Reset VmHWM on Linux so setup allocations are not counted; no-op elsewhere."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def _cpu_seconds() -> float:
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _measure(operation: str, path: str, repeat: int, workdir: str) -> dict:
+    import io
+    import contextlib
+
+    with contextlib.redirect_stdout(io.StringIO()):  # the modules print progress
+        run = OPERATIONS[operation](path, workdir)
+        if run is None:
+            return {"skipped": "dependency not installed"}
+        _reset_peak_rss()
+
+        walls, cpus = [], []
+        for _ in range(repeat):
+            wall, cpu = time.perf_counter(), _cpu_seconds()
+            run()
+            walls.append(time.perf_counter() - wall)
+            cpus.append(_cpu_seconds() - cpu)
+
+    children_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {
+        "wall_sec": round(statistics.median(walls), 4),
+        "cpu_sec": round(statistics.median(cpus), 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "child_rss_mb": round(children_peak / 1024.0, 1),
+    }
+
+
+# -------------------------------------------------------------
+# 🎚️ Inputs
+# -------------------------------------------------------------
+def make_input(workdir: str, duration: float, sample_rate: int, codec: str) -> str:
+    path = os.path.join(workdir, f"in_{int(duration)}s_{sample_rate}.{codec}")
+    samples = speech_like(duration, sample_rate=sample_rate, channels=2)
+    if codec in ("wav", "flac"):
+        with open(path, "wb") as f:
+            f.write(encode(samples, sample_rate, format=codec.upper()))
+    else:
+        from modules.transcoder import Transcoder
+        Transcoder().encode_pcm(samples, sample_rate, path, format="mp4" if codec == "m4a" else codec)
+    return path
+
+
+def run_suite(args) -> list:
+    workdir = tempfile.mkdtemp(prefix="audio-bench-")
+    context = multiprocessing.get_context("spawn")
+    results = []
+    try:
+        for duration in args.durations:
+            for sample_rate in args.sample_rates:
+                for codec in args.codecs:
+                    path = make_input(workdir, duration, sample_rate, codec)
+                    for operation in args.operations:
+                        if codec != "wav" and operation in CODEC_INDEPENDENT:
+                            continue
+                        case = {
+                            "operation": operation,
+                            "duration_sec": duration,
+                            "sample_rate": sample_rate,
+                            "codec": codec,
+                        }
+                        with ProcessPoolExecutor(max_workers=1, mp_context=context) as worker:
+                            try:
+                                case.update(worker.submit(_measure, operation, path, args.repeat, workdir).result())
+                            except Exception as e:
+                                case["error"] = f"{type(e).__name__}: {e}"
+                        results.append(case)
+                        print(_format_row(case), flush=True)
+                    os.remove(path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+# -------------------------------------------------------------
+# 📊 Baseline comparison
+# -------------------------------------------------------------
+def _key(case: dict) -> str:
+    return f"{case['operation']}/{case['codec']}/{case['sample_rate']}/{int(case['duration_sec'])}s"
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """
+    :return: Regressions as (key, metric, baseline value, current value);
+             a metric regresses when it grew by more than `tolerance` (0.2 = 20 %)
+    """
+    previous = {_key(case): case for case in baseline}
+    regressions = []
+    for case in results:
+        before = previous.get(_key(case))
+        if not before:
+            continue
+        for metric in COMPARED:
+            old, new = before.get(metric), case.get(metric)
+            if old is None or new is None:
+                continue
+            # Ignore noise on very fast operations (< 10 ms / 1 MB of headroom)
+            floor = 1.0 if metric == "peak_rss_mb" else 0.01
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append((_key(case), metric, old, new))
+    return regressions
+
+
+def _format_row(case: dict) -> str:
+    label = f"{_key(case):<40}"
+    if "error" in case:
+        return f"{label} ❌ {case['error']}"
+    if "skipped" in case:
+        return f"{label} ⏩ {case['skipped']}"
+    return (
+        f"{label} wall {case['wall_sec']:>8.3f}s  cpu {case['cpu_sec']:>8.3f}s  "
+        f"rss {case['peak_rss_mb']:>7.1f}M  child {case['child_rss_mb']:>7.1f}M"
+    )
+
+
+def _csv(cast):
+    return lambda value: [cast(v) for v in value.split(",") if v]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audio-processing microbenchmarks on synthetic audio")
+    parser.add_argument("--durations", default="30,300", type=_csv(float), help="Input lengths in seconds")
+    parser.add_argument("--sample-rates", default="16000,44100", type=_csv(int))
+    parser.add_argument("--codecs", default=",".join(CODECS), type=_csv(str))
+    parser.add_argument("--operations", default=",".join(OPERATIONS), type=_csv(str))
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per operation (the median is reported)")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed growth before a regression (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", help="Write the results as a new baseline JSON")
+    args = parser.parse_args()
+
+    unknown = set(args.operations) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"Unknown operation(s): {', '.join(sorted(unknown))}")
+    unknown = set(args.codecs) - set(CODECS)
+    if unknown:
+        parser.error(f"Unknown codec(s): {', '.join(sorted(unknown))}")
+
+    results = run_suite(args)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": time.time(),
+                "machine": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+                "results": results,
+            }, f, indent=2)
+        print(f"✅ Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for key, metric, old, new in regressions:
+            growth = f" (+{(new / old - 1) * 100:.0f}%)" if old else ""
+            print(f"⚠️ {key}: {metric} {old} -> {new}{growth}")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No regressions against {args.baseline}")
@@ -0,0 +1,204 @@
+# benchmarks/fake_providers.py
+"""
+🧪 Local stand-in for the ElevenLabs and OpenAI endpoints the app calls.
+
+Routes:
+  POST   /v1/speech-to-text                  -> {"text": ...}
+  POST   /v1/chat/completions                -> OpenAI chat completion
+  POST   /v1/text-to-speech/{voice_id}       -> MP3 bytes
+  POST   /v1/text-to-speech/{voice_id}/stream -> streamed MP3 bytes
+  GET    /v1/voices                          -> {"voices": [...]}
+  POST   /v1/voices/add                      -> {"voice_id": ...}
+  DELETE /v1/voices/{voice_id}               -> {"status": "ok"}
+  GET    /stats                              -> request counters per service
+
+Every service has a latency profile, read from the environment
+(service = STT, CHAT, TTS or VOICES, falling back to the FAKE_* defaults):
+  FAKE_<SERVICE>_LATENCY_MS   base latency (default FAKE_LATENCY_MS, 200)
+  FAKE_<SERVICE>_JITTER_MS    uniform jitter added on top (default FAKE_JITTER_MS, 50)
+  FAKE_<SERVICE>_ERROR_RATE   share of requests answered with 503 / 429 (default FAKE_ERROR_RATE, 0)
+  FAKE_UNIQUE                 "1" adds a random nonce to texts so app caches never hit (default 1)
+
+Point the app at it with:
+  URL_SPEECH_TO_TEXT=http://127.0.0.1:9100/v1/speech-to-text
+  ELEVENLABS_BASE_URL=http://127.0.0.1:9100
+  OPENAI_BASE_URL=http://127.0.0.1:9100/v1
+
+Run:  python -m benchmarks.fake_providers --port 9100
+"""
+import os
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from collections import Counter
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SERVICES = ("STT", "CHAT", "TTS", "VOICES")
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz) ≈ 26 ms of audio
+_MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+class LatencyProfile:
+    """Latency, jitter and error rate of one fake service."""
+
+    def __init__(self, service: str):
+        def setting(name, default):
+            return float(os.getenv(f"FAKE_{service}_{name}", os.getenv(f"FAKE_{name}", default)))
+
+        self.latency_ms = setting("LATENCY_MS", "200")
+        self.jitter_ms = setting("JITTER_MS", "50")
+        self.error_rate = setting("ERROR_RATE", "0")
+
+    async def wait(self):
+        await asyncio.sleep((self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000.0)
+
+    def failure(self):
+        """Return an error response for a share of requests, else None."""
+        if self.error_rate and random.random() < self.error_rate:
+            status = random.choice((429, 503))
+            return JSONResponse({"detail": {"status": "fake_error", "message": "Injected failure"}}, status_code=status)
+        return None
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="Fake providers")
+    profiles = {service: LatencyProfile(service) for service in SERVICES}
+    unique = os.getenv("FAKE_UNIQUE", "1") == "1"
+    counters = Counter()
+    voices = {}
+
+    def nonce() -> str:
+        return f" [{uuid.uuid4().hex[:8]}]" if unique else ""
+
+    async def simulate(service: str):
+        counters[service] += 1
+        profile = profiles[service]
+        await profile.wait()
+        error = profile.failure()
+        if error is not None:
+            counters[f"{service}_errors"] += 1
+        return error
+
+    # -------------------------------------------------------------
+    # 🎙️ Speech-to-Text
+    # -------------------------------------------------------------
+    @app.post("/v1/speech-to-text")
+    async def speech_to_text(request: Request):
+        form = await request.form()
+        upload = form.get("file")
+        size = len(await upload.read()) if upload is not None else 0
+        error = await simulate("STT")
+        if error is not None:
+            return error
+        words = max(5, size // 4000)  # a few words per encoded second
+        text = " ".join(random.choice(("alpha", "bravo", "charlie", "delta", "echo")) for _ in range(words))
+        return {"text": f"This is a benchmark transcript. {text}.{nonce()}", "language_code": "en"}
+
+    # -------------------------------------------------------------
+    # 📝 Chat completions
+    # -------------------------------------------------------------
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        error = await simulate("CHAT")
+        if error is not None:
+            return error
+        prompt = "".join(m.get("content", "") for m in body.get("messages", []))
+        completion_tokens = min(int(body.get("max_tokens") or 256), 200)
+        content = ("The speaker explains the benchmark in detail. " * (completion_tokens // 8)).strip() + nonce()
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4-turbo"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": completion_tokens,
+                "total_tokens": len(prompt) // 4 + completion_tokens,
+            },
+        }
+
+    # -------------------------------------------------------------
+    # 🔊 Text-to-Speech
+    # -------------------------------------------------------------
+    def speech_for(text: str) -> bytes:
+        # ≈ 15 characters per second of speech
+        return _MP3_FRAME * max(1, int(len(text) / 15 / 0.026))
+
+    @app.post("/v1/text-to-speech/{voice_id}")
+    async def text_to_speech(voice_id: str, request: Request):
+        body = await request.json()
+        error = await simulate("TTS")
+        if error is not None:
+            return error
+        return Response(content=speech_for(body.get("text", "")), media_type="audio/mpeg")
+
+    @app.post("/v1/text-to-speech/{voice_id}/stream")
+    async def text_to_speech_stream(voice_id: str, request: Request):
+        body = await request.json()
+        error = await simulate("TTS")
+        if error is not None:
+            return error
+        audio = speech_for(body.get("text", ""))
+
+        async def chunks():
+            for start in range(0, len(audio), 16 * 1024):
+                yield audio[start:start + 16 * 1024]
+
+        return StreamingResponse(chunks(), media_type="audio/mpeg")
+
+    # -------------------------------------------------------------
+    # 🧬 Voice management
+    # -------------------------------------------------------------
+    @app.get("/v1/voices")
+    async def list_voices():
+        error = await simulate("VOICES")
+        if error is not None:
+            return error
+        return {"voices": [{"voice_id": voice_id, "name": name, "category": "cloned"} for voice_id, name in voices.items()]}
+
+    @app.post("/v1/voices/add")
+    async def add_voice(request: Request):
+        form = await request.form()
+        error = await simulate("VOICES")
+        if error is not None:
+            return error
+        voice_id = uuid.uuid4().hex[:20]
+        voices[voice_id] = form.get("name", "voice")
+        return {"voice_id": voice_id, "requires_verification": False}
+
+    @app.delete("/v1/voices/{voice_id}")
+    async def delete_voice(voice_id: str):
+        error = await simulate("VOICES")
+        if error is not None:
+            return error
+        voices.pop(voice_id, None)
+        return {"status": "ok"}
+
+    @app.get("/stats")
+    async def stats():
+        return dict(counters)
+
+    return app
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake ElevenLabs / OpenAI servers for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
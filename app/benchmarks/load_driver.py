@@ -0,0 +1,334 @@
+# benchmarks/load_driver.py
+"""
+🚚 Load driver for the FastAPI app (main.py) against the fake providers.
+
+For each endpoint and concurrency level it sends `--requests` requests with
+`concurrency` in flight and reports requests/sec, p50/p95/p99 latency, error
+count and the app's resident memory (peak and after the level).
+
+Every request carries a slightly different synthetic recording, so the
+transcript / summary / speech caches never turn the run into a cache benchmark.
+
+Run (spawns the fake providers and the app in a scratch directory):
+  python -m benchmarks.load_driver --spawn --concurrency 1,4,16 --requests 32
+
+Or against an already running app (memory is sampled if --app-pid is given):
+  python -m benchmarks.load_driver --base-url http://127.0.0.1:8080 --app-pid 1234
+
+Regression check: save a run as the baseline, then compare later runs with
+the same options against it. p50 / p95 latency or peak RSS growing, or
+throughput dropping, by more than --tolerance (or new errors) exits with status 1:
+  python -m benchmarks.load_driver --spawn --save-baseline load.json
+  python -m benchmarks.load_driver --spawn --baseline load.json --tolerance 0.25
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+import httpx
+from benchmarks.synthetic_audio import speech_like, dithered, encode
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ("summarize", "voice-clone")
+# Compared against the baseline: metric -> True if a higher value is worse
+COMPARED = {"p50_ms": True, "p95_ms": True, "rss_peak_mb": True, "rps": False}
+
+
+# -------------------------------------------------------------
+# 📏 Measurements
+# -------------------------------------------------------------
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def read_rss_mb(pid: int) -> float:
+    """Resident set size of a process in MiB (Linux /proc, psutil elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except FileNotFoundError:
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / (1024.0 * 1024.0)
+    except Exception:
+        return 0.0
+
+
+class MemorySampler:
+    """Background thread recording the peak RSS of a process."""
+
+    def __init__(self, pid: int, interval: float = 0.2):
+        self.pid = pid
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, read_rss_mb(self.pid))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if self.pid:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+
+# -------------------------------------------------------------
+# 🚀 Process management
+# -------------------------------------------------------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 60.0, require_ok: bool = False):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=2.0).status_code == 200 or not require_ok:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"Server did not come up: {url}")
+
+
+def spawn_stack(workdir: str, app_workers: int = 1):
+    """Start the fake providers and the app; returns (processes, app base URL, app pid)."""
+    fake_port, app_port = free_port(), free_port()
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    env = dict(
+        os.environ,
+        PYTHONPATH=APP_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""),
+        ELEVENLABS_API_KEY="benchmark",
+        OPENAI_API_KEY="benchmark",
+        TRANSCRIPTION_MODEL="scribe_v1",
+        URL_SPEECH_TO_TEXT=f"{fake_url}/v1/speech-to-text",
+        ELEVENLABS_BASE_URL=fake_url,
+        OPENAI_BASE_URL=f"{fake_url}/v1",
+        HTTP2="0",
+    )
+
+    fake = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_providers", "--port", str(fake_port)],
+        cwd=APP_DIR, env=env,
+    )
+    wait_until_up(f"{fake_url}/stats")
+
+    # Scratch cwd: the app's file/ caches and voice registry start empty
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(app_port),
+         "--workers", str(app_workers), "--log-level", "warning"],
+        cwd=workdir, env=env,
+    )
+    app_url = f"http://127.0.0.1:{app_port}"
+    wait_until_up(f"{app_url}/ready", require_ok=True)  # services built, first request is not a cold start
+    return [app, fake], app_url, app.pid
+
+
+def stop_stack(processes: list):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# -------------------------------------------------------------
+# 🔁 Load generation
+# -------------------------------------------------------------
+def build_payloads(count: int, audio_sec: float, seed: int) -> list:
+    base = speech_like(audio_sec, seed=seed)
+    return [encode(dithered(base, seed + i + 1)) for i in range(count)]
+
+
+async def send(client: httpx.AsyncClient, endpoint: str, payload: bytes, index: int, run_id: str):
+    name = f"bench-{run_id}-{index}"
+    if endpoint == "summarize":
+        response = await client.post(
+            "/summarize_audio/",
+            data={"pdf_name": name},
+            files={"file": (f"{name}.wav", payload, "audio/wav")},
+        )
+    else:
+        response = await client.post(
+            "/voice-clone/",
+            data={"voice_name": name},
+            files={"audio_file": (f"{name}.wav", payload, "audio/wav")},
+        )
+    await response.aread()
+    response.raise_for_status()
+
+
+async def run_level(base_url: str, endpoint: str, concurrency: int, payloads: list, app_pid: int, run_id: str) -> dict:
+    latencies, errors = [], []
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=600.0, limits=limits) as client:
+        async def one(index, payload):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    await send(client, endpoint, payload, index, run_id)
+                    latencies.append(time.perf_counter() - started)
+                except Exception as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+
+        with MemorySampler(app_pid) as memory:
+            started = time.perf_counter()
+            await asyncio.gather(*(one(i, p) for i, p in enumerate(payloads)))
+            elapsed = time.perf_counter() - started
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(payloads),
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "elapsed_sec": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "rss_peak_mb": round(memory.peak_mb, 1),
+        "rss_end_mb": round(read_rss_mb(app_pid), 1) if app_pid else 0.0,
+    }
+
+
+# -------------------------------------------------------------
+# 📊 Baseline comparison
+# -------------------------------------------------------------
+def _key(result: dict) -> str:
+    return f"{result['endpoint']}@{result['concurrency']}"
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """
+    :return: Regressions as (key, metric, baseline value, current value). A metric
+             regresses when it got worse by more than `tolerance` (0.2 = 20 %);
+             any errors where the baseline had none also count.
+    """
+    previous = {_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(_key(result))
+        if not before:
+            continue
+        if result["errors"] and not before.get("errors"):
+            regressions.append((_key(result), "errors", before.get("errors", 0), result["errors"]))
+        for metric, higher_is_worse in COMPARED.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            # Ignore noise below 5 ms / 1 MB of absolute change
+            floor = {"p50_ms": 5.0, "p95_ms": 5.0, "rss_peak_mb": 1.0}.get(metric, 0.0)
+            if higher_is_worse:
+                worse = new > old * (1 + tolerance) and new - old > floor
+            else:
+                worse = new < old * (1 - tolerance)
+            if worse:
+                regressions.append((_key(result), metric, old, new))
+    return regressions
+
+
+def print_table(results: list):
+    header = f"{'endpoint':<12} {'conc':>4} {'req':>5} {'err':>4} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rss peak':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['endpoint']:<12} {r['concurrency']:>4} {r['requests']:>5} {r['errors']:>4} {r['rps']:>8.2f} "
+            f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['rss_peak_mb']:>8.1f}M"
+        )
+
+
+async def main_async(args) -> list:
+    processes, workdir = [], None
+    base_url, app_pid = args.base_url, args.app_pid
+    if args.spawn:
+        workdir = tempfile.mkdtemp(prefix="voice-bench-")
+        processes, base_url, app_pid = spawn_stack(workdir, args.app_workers)
+        if args.app_workers > 1:
+            app_pid = None  # RSS of the supervisor alone would be misleading
+
+    results = []
+    run_id = str(int(time.time()))
+    try:
+        for endpoint in args.endpoints:
+            for level in args.concurrency:
+                payloads = build_payloads(max(args.requests, level), args.audio_sec, seed=level)
+                print(f"▶️ {endpoint}: {len(payloads)} request(s) at concurrency {level}...")
+                result = await run_level(base_url, endpoint, level, payloads, app_pid, f"{run_id}-{level}")
+                results.append(result)
+                for sample in result["error_samples"]:
+                    print(f"   ⚠️ {sample}")
+    finally:
+        stop_stack(processes)
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load benchmark for /summarize_audio/ and /voice-clone/")
+    parser.add_argument("--spawn", action="store_true", help="Start the fake providers and the app locally")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8080", help="App URL when not spawning")
+    parser.add_argument("--app-pid", type=int, default=None, help="App PID for memory sampling when not spawning")
+    parser.add_argument("--app-workers", type=int, default=1)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), type=lambda v: [e for e in v.split(",") if e])
+    parser.add_argument("--concurrency", default="1,4,16", type=lambda v: [int(c) for c in v.split(",")])
+    parser.add_argument("--requests", type=int, default=16, help="Requests per concurrency level")
+    parser.add_argument("--audio-sec", type=float, default=120.0, help="Length of each synthetic upload")
+    parser.add_argument("--output", "--save-baseline", dest="output", help="Write the results as JSON (usable as a baseline)")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed change before a regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"Unknown endpoint(s): {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(main_async(args))
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"created_at": time.time(), "options": {
+                "requests": args.requests, "audio_sec": args.audio_sec, "app_workers": args.app_workers,
+            }, "results": results}, f, indent=2)
+        print(f"✅ Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for key, metric, old, new in regressions:
+            change = f" ({(new / old - 1) * 100:+.0f}%)" if old else ""
+            print(f"⚠️ {key}: {metric} {old} -> {new}{change}")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No regressions against {args.baseline}")
@@ -0,0 +1,145 @@
+# benchmarks/startup_time.py
+"""
+🚦 Startup-time budget for the app.
+
+Measured in fresh processes, median over --runs:
+  import_sec   `import main` (what every worker pays before it can listen)
+  listen_sec   process start -> first HTTP answer from /ready
+  ready_sec    process start -> /ready returns 200 (services built, warm)
+
+Each measurement is compared against its budget; the script exits with
+status 1 when one is exceeded. Budgets come from the arguments or from
+STARTUP_BUDGET_IMPORT_SEC / STARTUP_BUDGET_LISTEN_SEC / STARTUP_BUDGET_READY_SEC.
+
+Provider keys are set to placeholders if missing: no request leaves the machine.
+
+Run:  python -m benchmarks.startup_time --runs 5 --importtime
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import httpx
+from benchmarks.load_driver import APP_DIR, free_port
+
+_IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def _env() -> dict:
+    env = dict(os.environ, PYTHONPATH=APP_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    env.setdefault("ELEVENLABS_API_KEY", "benchmark")
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    env.setdefault("WARM_SERVICES", "1")
+    return env
+
+
+def measure_import(workdir: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET],
+        cwd=workdir, env=_env(), capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure_server(workdir: str, timeout: float) -> dict:
+    """Start uvicorn and poll /ready; returns listen_sec and ready_sec (None if never ready)."""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    listen_sec = ready_sec = None
+    detail = None
+    try:
+        while time.perf_counter() - started < timeout and process.poll() is None:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/ready", timeout=2.0)
+                if listen_sec is None:
+                    listen_sec = time.perf_counter() - started
+                detail = response.json()
+                if response.status_code == 200:
+                    ready_sec = time.perf_counter() - started
+                    break
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {"listen_sec": listen_sec, "ready_sec": ready_sec, "detail": detail}
+
+
+def slowest_imports(workdir: str, top: int = 10) -> list:
+    """(cumulative seconds, module) of the slowest top-level imports of `main`, from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=workdir, env=_env(), capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <two spaces per nesting level><module>"
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2][1:]
+        if not name.startswith(" "):  # top level only
+            rows.append((int(parts[1]) / 1e6, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def _median(values: list):
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure app startup time against a budget")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Give up waiting for /ready after this many seconds")
+    parser.add_argument("--budget-import-sec", type=float, default=float(os.getenv("STARTUP_BUDGET_IMPORT_SEC", "1.5")))
+    parser.add_argument("--budget-listen-sec", type=float, default=float(os.getenv("STARTUP_BUDGET_LISTEN_SEC", "3")))
+    parser.add_argument("--budget-ready-sec", type=float, default=float(os.getenv("STARTUP_BUDGET_READY_SEC", "15")))
+    parser.add_argument("--importtime", action="store_true", help="Also list the slowest imports")
+    args = parser.parse_args()
+
+    # Scratch cwd: no .env file and no file/ caches are picked up
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    try:
+        imports, listens, readies, detail = [], [], [], None
+        for _ in range(args.runs):
+            imports.append(measure_import(workdir))
+            server = measure_server(workdir, args.timeout)
+            listens.append(server["listen_sec"])
+            readies.append(server["ready_sec"])
+            detail = server["detail"]
+
+        measured = {
+            "import_sec": (_median(imports), args.budget_import_sec),
+            "listen_sec": (_median(listens), args.budget_listen_sec),
+            "ready_sec": (_median(readies), args.budget_ready_sec),
+        }
+        over = []
+        for name, (value, budget) in measured.items():
+            if value is None or value > budget:
+                over.append(name)
+            shown = "never" if value is None else f"{value:.3f}s"
+            print(f"{'❌' if name in over else '✅'} {name:<11} {shown:>8}  (budget {budget:.1f}s)")
+        if readies[-1] is None and detail:
+            print(f"   /ready: {detail}")
+
+        if args.importtime:
+            print("Slowest imports (cumulative):")
+            for seconds, module in slowest_imports(workdir):
+                print(f"  {seconds:>7.3f}s  {module}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    sys.exit(1 if over else 0)
@@ -1,14 +1,68 @@
-from fastapi import FastAPI
+import os
+import sys
+import shutil
+import asyncio
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 from fastapi.staticfiles import StaticFiles
 from api.views import api
+from api.dependencies import warm_services, service_status, close_services
+from modules.config import load_config, missing_settings
+from modules.metrics import render_latest
+
+load_config()
 
 
 app = FastAPI(title="Voice mate", description="Lets play with voice")
 
 app.include_router(api)
 
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics: pipeline stages, provider calls and caches."""
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/ready", include_in_schema=False)
+def ready():
+    """
+    Readiness probe: 200 once the required settings are present, ffmpeg is
+    found and the services are built (when warmed at startup), otherwise 503.
+    """
+    missing = missing_settings()
+    ffmpeg = shutil.which(os.getenv("FFMPEG_PATH") or "ffmpeg") is not None
+    services = service_status()
+    warming = os.getenv("WARM_SERVICES", "1") == "1"
+    is_ready = not missing and ffmpeg and (not warming or all(s == "ready" for s in services.values()))
+    return JSONResponse(
+        {"ready": is_ready, "missing_settings": missing, "ffmpeg": ffmpeg, "services": services},
+        status_code=200 if is_ready else 503,
+    )
+
+
+@app.on_event("startup")
+async def start_warming():
+    """
+    Build the services in a worker thread after the server is listening
+    (WARM_SERVICES, default 1), so startup itself is not delayed and /ready
+    turns green once the first request would be fast.
+    """
+    if os.getenv("WARM_SERVICES", "1") == "1":
+        asyncio.get_running_loop().run_in_executor(None, warm_services)
+
+
+@app.on_event("shutdown")
+async def shutdown_clients():
+    """Stop the services' worker processes and close the shared provider HTTP connection pools."""
+    close_services()
+    clients = sys.modules.get("modules.clients")  # only loaded once a service was built
+    if clients is not None:
+        await clients.aclose_clients()
+
 # Allow frontend to communicate with backend (adjust origin if needed)
 origins = ["*"]
 # Set up CORS middleware
@@ -1,15 +1,38 @@
 # modules/__init__.py
 
-from .audio_converter import AudioConverter
-from .stt import SpeechToText
-from .summarizer import Summarizer
-from .tts import TextToSpeech
-from .voice_clone import VoiceCloner
-
-__all__ = [
-    "AudioConverter",
-    "SpeechToText",
-    "Summarizer",
-    "TextToSpeech",
-    "VoiceCloner",
-]
+import importlib
+
+# Public name -> submodule. Submodules are imported on first attribute access,
+# so `from modules.spooled_upload import ...` does not pull in the provider SDKs.
+_EXPORTS = {
+    "AudioBuffer": "audio_buffer",
+    "AudioConverter": "audio_converter",
+    "AudioAnalyzer": "audio_analysis",
+    "AudioQualityError": "audio_analysis",
+    "NoiseReducer": "noise_reduction",
+    "SpooledUpload": "spooled_upload",
+    "UploadTooLargeError": "spooled_upload",
+    "SpeechToText": "stt",
+    "Summarizer": "summarizer",
+    "TextToSpeech": "tts",
+    "VoiceCloner": "voice_clone",
+    "AsyncSpeechToText": "stt",
+    "AsyncSummarizer": "summarizer",
+    "AsyncTextToSpeech": "tts",
+    "AsyncVoiceCloner": "voice_clone",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,175 @@
+# module/audio_analysis.py
+import os
+import numpy as np
+from .config import load_config
+from .audio_buffer import AudioBuffer
+
+# Load environment variables
+load_config()
+
+
+class AudioQualityError(ValueError):
+    """Raised when audio is not usable for cloning or transcription."""
+
+    def __init__(self, message: str, report: dict = None):
+        super().__init__(message)
+        self.report = report or {}
+
+
+class AudioAnalyzer:
+    """
+    🔬 Vectorized quality analysis of an AudioBuffer, run before any API call.
+    - Energy-based voice activity detection (adaptive to the noise floor).
+    - Clipping ratio and SNR estimate.
+    - Selection of the most speech-dense segments up to a target duration.
+
+    Env:
+      VAD_MARGIN_DB            speech threshold above the noise floor (default 10)
+      QUALITY_MIN_SPEECH_SEC   minimum detected speech (default 10)
+      QUALITY_MAX_CLIPPING     maximum ratio of clipped samples (default 0.01)
+      QUALITY_MIN_SNR_DB       minimum estimated SNR (default 5)
+    """
+
+    def __init__(
+        self,
+        frame_sec: float = 0.02,
+        margin_db: float = None,
+        min_speech_sec: float = None,
+        max_clipping_ratio: float = None,
+        min_snr_db: float = None,
+        hangover_sec: float = 0.2,
+    ):
+        """
+        :param frame_sec: Analysis frame length in seconds
+        :param margin_db: Energy above the noise floor that counts as speech
+        :param min_speech_sec: Less detected speech than this is rejected
+        :param max_clipping_ratio: More clipped samples than this ratio is rejected
+        :param min_snr_db: A lower SNR estimate is rejected
+        :param hangover_sec: Speech frames are extended by this much to bridge short pauses
+        """
+        self.frame_sec = frame_sec
+        self.margin_db = margin_db if margin_db is not None else float(os.getenv("VAD_MARGIN_DB", "10"))
+        self.min_speech_sec = min_speech_sec if min_speech_sec is not None else float(os.getenv("QUALITY_MIN_SPEECH_SEC", "10"))
+        self.max_clipping_ratio = max_clipping_ratio if max_clipping_ratio is not None else float(os.getenv("QUALITY_MAX_CLIPPING", "0.01"))
+        self.min_snr_db = min_snr_db if min_snr_db is not None else float(os.getenv("QUALITY_MIN_SNR_DB", "5"))
+        self.hangover_sec = hangover_sec
+        # Frames quieter than this (dBFS) are never speech, however quiet the recording is
+        self.absolute_floor_db = -55.0
+
+    # -------------------------------------------------------------
+    # 🗣️ Voice activity detection
+    # -------------------------------------------------------------
+    def _energy_db(self, audio: AudioBuffer) -> np.ndarray:
+        return 20.0 * np.log10(audio.frame_energy(self.frame_sec) + 1e-10)
+
+    def speech_mask(self, audio: AudioBuffer, energy_db: np.ndarray = None) -> np.ndarray:
+        """
+        Boolean speech / non-speech decision per frame.
+        :return: bool array of length audio.frames // frame_size
+        """
+        energy_db = self._energy_db(audio) if energy_db is None else energy_db
+        if not len(energy_db):
+            return np.zeros(0, dtype=bool)
+
+        noise_floor = np.percentile(energy_db, 10)
+        mask = energy_db > max(noise_floor + self.margin_db, self.absolute_floor_db)
+
+        hangover = int(self.hangover_sec / self.frame_sec)
+        if hangover > 0:
+            mask = np.convolve(mask, np.ones(2 * hangover + 1), mode="same") > 0
+        return mask
+
+    # -------------------------------------------------------------
+    # 📊 Quality report
+    # -------------------------------------------------------------
+    @staticmethod
+    def clipping_ratio(audio: AudioBuffer) -> float:
+        """Fraction of samples at (or beyond) full scale."""
+        if not audio.frames:
+            return 0.0
+        samples = audio.samples
+        if audio.dtype == np.int16:
+            clipped = np.count_nonzero(samples >= 32767) + np.count_nonzero(samples <= -32768)
+        else:
+            clipped = np.count_nonzero(np.abs(samples) >= 0.999)
+        return clipped / samples.size
+
+    def analyze(self, audio: AudioBuffer) -> dict:
+        """
+        :return: {"duration", "speech_sec", "speech_ratio", "clipping_ratio",
+                  "snr_db", "usable", "reasons"}
+        """
+        energy_db = self._energy_db(audio)
+        mask = self.speech_mask(audio, energy_db)
+
+        speech_sec = float(np.count_nonzero(mask)) * self.frame_sec
+        power = 10.0 ** (energy_db / 10.0)
+        if mask.any() and (~mask).any():
+            snr_db = 10.0 * np.log10(power[mask].mean() / (power[~mask].mean() + 1e-20))
+        elif mask.any():
+            snr_db = 10.0 * np.log10(power.mean() / (np.percentile(power, 10) + 1e-20))
+        else:
+            snr_db = 0.0
+
+        report = {
+            "duration": round(audio.duration, 3),
+            "speech_sec": round(speech_sec, 3),
+            "speech_ratio": round(speech_sec / audio.duration, 4) if audio.duration else 0.0,
+            "clipping_ratio": round(self.clipping_ratio(audio), 6),
+            "snr_db": round(float(snr_db), 2),
+        }
+
+        reasons = []
+        if report["speech_sec"] < min(self.min_speech_sec, audio.duration * 0.5) or not report["speech_sec"]:
+            reasons.append(f"too little speech detected ({report['speech_sec']:.1f}s)")
+        if report["clipping_ratio"] > self.max_clipping_ratio:
+            reasons.append(f"audio is clipped ({report['clipping_ratio']:.2%} of samples)")
+        if report["snr_db"] < self.min_snr_db:
+            reasons.append(f"signal-to-noise ratio too low ({report['snr_db']:.1f} dB)")
+        report["usable"] = not reasons
+        report["reasons"] = reasons
+        return report
+
+    def check(self, audio: AudioBuffer) -> dict:
+        """Return the quality report, raising AudioQualityError if the audio is unusable."""
+        report = self.analyze(audio)
+        if not report["usable"]:
+            raise AudioQualityError("❌ Unusable audio: " + "; ".join(report["reasons"]), report)
+        print(
+            f"🔬 Audio quality OK: {report['speech_sec']:.1f}s speech, "
+            f"SNR {report['snr_db']:.1f} dB, clipping {report['clipping_ratio']:.2%}"
+        )
+        return report
+
+    # -------------------------------------------------------------
+    # ✂️ Speech-dense segment selection
+    # -------------------------------------------------------------
+    def select_speech(self, audio: AudioBuffer, target_sec: float, segment_sec: float = 5.0) -> AudioBuffer:
+        """
+        Pick the most speech-dense `segment_sec` windows until `target_sec` is
+        reached and join them in their original order. Windows that are
+        mostly silence or music are only used if nothing better is left.
+        :return: AudioBuffer of at most target_sec seconds
+        """
+        if audio.duration <= target_sec:
+            return audio
+
+        mask = self.speech_mask(audio)
+        per_segment = max(1, int(segment_sec / self.frame_sec))
+        n_segments = len(mask) // per_segment
+        if n_segments == 0:
+            return audio.crop(0, target_sec)
+
+        density = mask[:n_segments * per_segment].reshape(n_segments, per_segment).mean(axis=1)
+        wanted = min(n_segments, int(np.ceil(target_sec / segment_sec)))
+        # Stable sort: among equally dense windows the earlier one wins
+        chosen = np.sort(np.argsort(-density, kind="stable")[:wanted])
+
+        frame_size = int(self.frame_sec * audio.sample_rate) * per_segment
+        pieces = [audio.samples[i * frame_size:(i + 1) * frame_size] for i in chosen]
+        samples = np.concatenate(pieces)[:int(target_sec * audio.sample_rate)]
+        print(
+            f"🎯 Selected {len(chosen)} speech-dense segment(s), "
+            f"mean speech density {density[chosen].mean():.0%}"
+        )
+        return AudioBuffer(samples, audio.sample_rate)
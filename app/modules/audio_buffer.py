@@ -0,0 +1,234 @@
+# module/audio_buffer.py
+import os
+from io import BytesIO
+import numpy as np
+import soundfile as sf
+from pydub import AudioSegment
+from .spooled_upload import SpooledUpload
+from .transcoder import Transcoder
+
+
+class AudioBuffer:
+    """
+    🎚️ Decoded PCM audio held in a NumPy array of shape (frames, channels).
+    Decode a job's audio once with `from_file`, then pass the buffer between
+    modules. Crops are zero-copy views over the same samples.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int):
+        """
+        :param samples: int16 or float32 array, shape (frames,) or (frames, channels)
+        :param sample_rate: Sample rate in Hz
+        """
+        if samples.dtype not in (np.int16, np.float32):
+            raise TypeError(f"Unsupported sample dtype: {samples.dtype}. Use int16 or float32.")
+        if samples.ndim == 1:
+            samples = samples.reshape(-1, 1)
+        self.samples = samples
+        self.sample_rate = int(sample_rate)
+
+    # -------------------------------------------------------------
+    # 📥 Constructors
+    # -------------------------------------------------------------
+    @classmethod
+    def from_file(cls, src, sample_rate: int = None, channels: int = None) -> "AudioBuffer":
+        """
+        Decode an audio file (any ffmpeg-supported format) into a buffer.
+        ffmpeg streams fixed-size blocks already downmixed and resampled, so
+        only the output samples are ever held in memory.
+        :param src: Path, file-like object, bytes-like object or SpooledUpload
+        :param sample_rate: Optional target sample rate (resampled during decode)
+        :param channels: Optional target channel count (downmixed during decode)
+        """
+        if isinstance(src, SpooledUpload):
+            src = src.source()
+
+        if isinstance(src, (str, os.PathLike)):
+            if not os.path.exists(src):
+                raise FileNotFoundError(f"Audio file not found: {src}")
+        elif isinstance(src, (bytes, bytearray, memoryview)):
+            pass
+        elif hasattr(src, "read"):
+            if hasattr(src, "seek"):
+                src.seek(0)
+        else:
+            raise TypeError("src must be a file path or file-like object")
+
+        transcoder = Transcoder()
+        if not (sample_rate and channels):
+            if not isinstance(src, (str, os.PathLike)):
+                # Native format of a stream is unknown up front: let pydub decode it
+                if not hasattr(src, "read"):
+                    src = BytesIO(src)
+                audio = AudioSegment.from_file(src)
+                return cls.from_audio_segment(audio, sample_rate=sample_rate, channels=channels)
+            info = transcoder.probe(src)
+            sample_rate = sample_rate or info["sample_rate"]
+            channels = channels or info["channels"]
+
+        return cls(transcoder.decode(src, sample_rate, channels), sample_rate)
+
+    @classmethod
+    def from_audio_segment(cls, audio: AudioSegment, sample_rate: int = None, channels: int = None) -> "AudioBuffer":
+        """Wrap an AudioSegment's raw PCM as int16 samples."""
+        # WAV inputs skip ffmpeg in pydub, so apply any remaining conversion here
+        if channels and audio.channels != channels:
+            audio = audio.set_channels(channels)
+        if sample_rate and audio.frame_rate != sample_rate:
+            audio = audio.set_frame_rate(sample_rate)
+        if audio.sample_width != 2:
+            audio = audio.set_sample_width(2)
+
+        samples = np.frombuffer(audio.raw_data, dtype=np.int16).reshape(-1, audio.channels)
+        return cls(samples, audio.frame_rate)
+
+    # -------------------------------------------------------------
+    # 📏 Metadata
+    # -------------------------------------------------------------
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def frames(self) -> int:
+        return self.samples.shape[0]
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        return self.frames / self.sample_rate
+
+    @property
+    def dtype(self):
+        return self.samples.dtype
+
+    def __len__(self) -> int:
+        """Length in milliseconds, matching AudioSegment."""
+        return int(self.duration * 1000)
+
+    def __repr__(self) -> str:
+        return (
+            f"AudioBuffer({self.duration:.2f}s, {self.sample_rate} Hz, "
+            f"{self.channels} ch, {self.dtype})"
+        )
+
+    # -------------------------------------------------------------
+    # ✂️ Views and conversions
+    # -------------------------------------------------------------
+    def crop(self, start_sec: float = 0.0, end_sec: float = None) -> "AudioBuffer":
+        """Return a zero-copy view of [start_sec, end_sec)."""
+        start = max(0, int(round(start_sec * self.sample_rate)))
+        end = self.frames if end_sec is None else min(self.frames, int(round(end_sec * self.sample_rate)))
+        if start > self.frames:
+            raise ValueError("Audio is shorter than the crop start time")
+        return AudioBuffer(self.samples[start:end], self.sample_rate)
+
+    def to_mono(self) -> "AudioBuffer":
+        """Downmix to one channel (returns self if already mono)."""
+        if self.channels == 1:
+            return self
+        mixed = self.samples.mean(axis=1, dtype=np.float32)
+        if self.dtype == np.int16:
+            mixed = mixed.astype(np.int16)
+        return AudioBuffer(mixed, self.sample_rate)
+
+    def as_float32(self) -> np.ndarray:
+        """Samples as float32 in [-1, 1] (no copy if already float32)."""
+        if self.dtype == np.float32:
+            return self.samples
+        return self.samples.astype(np.float32) / 32768.0
+
+    def as_int16(self) -> np.ndarray:
+        """Samples as int16 (no copy if already int16)."""
+        if self.dtype == np.int16:
+            return self.samples
+        return (np.clip(self.samples, -1.0, 1.0) * 32767.0).astype(np.int16)
+
+    def to_audio_segment(self) -> AudioSegment:
+        """Build a pydub AudioSegment (copies the samples once)."""
+        return AudioSegment(
+            data=np.ascontiguousarray(self.as_int16()).tobytes(),
+            sample_width=2,
+            frame_rate=self.sample_rate,
+            channels=self.channels,
+        )
+
+    # -------------------------------------------------------------
+    # 🔇 Energy analysis
+    # -------------------------------------------------------------
+    def frame_energy(self, frame_sec: float = 0.02, block_frames: int = 10000) -> np.ndarray:
+        """
+        RMS energy per frame (mono mix, normalized to [0, 1]).
+        Computed block-wise so memory stays bounded for long recordings.
+        :param frame_sec: Frame length in seconds
+        :param block_frames: Frames processed per NumPy block
+        :return: float32 array of length frames // frame_size
+        """
+        frame_size = max(1, int(frame_sec * self.sample_rate))
+        n_frames = self.frames // frame_size
+        scale = 32768.0 if self.dtype == np.int16 else 1.0
+        energy = np.empty(n_frames, dtype=np.float32)
+
+        for first in range(0, n_frames, block_frames):
+            last = min(n_frames, first + block_frames)
+            block = self.samples[first * frame_size:last * frame_size].astype(np.float32)
+            block = block.mean(axis=1) / scale
+            block = block.reshape(last - first, frame_size)
+            energy[first:last] = np.sqrt(np.mean(block * block, axis=1))
+        return energy
+
+    def split_on_silence(self, max_chunk_sec: float, search_sec: float = None, frame_sec: float = 0.02) -> list:
+        """
+        Split into chunks no longer than `max_chunk_sec`, cutting at the
+        quietest frame within the last `search_sec` seconds of each chunk.
+        :return: List of (start_sec, end_sec) tuples covering the whole buffer
+        """
+        if max_chunk_sec <= 0:
+            raise ValueError("max_chunk_sec must be positive")
+        search_sec = search_sec or min(30.0, max_chunk_sec / 4)
+        energy = self.frame_energy(frame_sec)
+
+        bounds = []
+        start = 0.0
+        while self.duration - start > max_chunk_sec:
+            lo = int((start + max_chunk_sec - search_sec) / frame_sec)
+            hi = int((start + max_chunk_sec) / frame_sec)
+            window = energy[lo:hi]
+            cut = (lo + int(np.argmin(window))) * frame_sec if len(window) else start + max_chunk_sec
+            if cut <= start:
+                cut = start + max_chunk_sec
+            bounds.append((start, cut))
+            start = cut
+        bounds.append((start, self.duration))
+        return bounds
+
+    # -------------------------------------------------------------
+    # 💾 Encoding
+    # -------------------------------------------------------------
+    def to_file_like(self, format: str = "WAV", name: str = None) -> BytesIO:
+        """
+        Encode into an in-memory file (WAV / FLAC / OGG via soundfile).
+        :param format: soundfile container format
+        :param name: Optional filename attribute, used by upload clients
+        :return: BytesIO positioned at the start
+        """
+        out = BytesIO()
+        subtype = "PCM_16" if format.upper() in ("WAV", "FLAC") else None
+        sf.write(out, self.as_int16(), self.sample_rate, format=format, subtype=subtype)
+        out.seek(0)
+        out.name = name or f"audio.{format.lower()}"
+        return out
+
+    def export(self, dst, format: str = "wav"):
+        """
+        Write the buffer to a path or file-like object.
+        WAV/FLAC/OGG are written directly; other formats are streamed through ffmpeg.
+        """
+        if format.lower() in ("wav", "flac", "ogg"):
+            sf.write(dst, self.as_int16(), self.sample_rate, format=format.upper())
+        elif format.lower() in ("mp4", "ipod", "m4a") and not isinstance(dst, (str, os.PathLike)):
+            # MP4 muxing needs a seekable output; pydub goes through a temp file
+            self.to_audio_segment().export(dst, format=format)
+        else:
+            Transcoder().encode_pcm(self.as_int16(), self.sample_rate, dst, format)
+        return dst
@@ -1,12 +1,70 @@
 # module/audio_converter.py
-from pydub import AudioSegment
 import os
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import BytesIO
+from .audio_buffer import AudioBuffer
+from .transcoder import Transcoder
+
+# ffmpeg encoder settings per export format
+FFMPEG_CODECS = {
+    "wav": ["-c:a", "pcm_s16le"],
+    "mp3": ["-c:a", "libmp3lame", "-q:a", "2"],
+    "mp4": ["-c:a", "aac", "-b:a", "160k"],
+    "ipod": ["-c:a", "aac", "-b:a", "160k"],
+    "ogg": ["-c:a", "libvorbis", "-q:a", "5"],
+    "flac": ["-c:a", "flac"],
+}
+
+
+def _run_ffmpeg(ffmpeg: str, src, dst_path: str, format: str, extra_args: list, timeout: float) -> dict:
+    """
+    Convert one file with a single ffmpeg process (decode and encode stay
+    inside ffmpeg; bytes sources are piped through stdin).
+    :return: Per-job result dict, never raises
+    """
+    started = time.perf_counter()
+    result = {"src": src if isinstance(src, str) else "<bytes>", "dst": dst_path, "format": format}
+    command = [ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin", "-y"]
+    stdin_data = None
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        command.remove("-nostdin")
+        command += ["-i", "pipe:0"]
+        stdin_data = bytes(src)
+    else:
+        command += ["-i", src]
+    command += ["-vn", *FFMPEG_CODECS.get(format, []), *(extra_args or []), "-f", format, dst_path]
+
+    try:
+        completed = subprocess.run(command, input=stdin_data, capture_output=True, timeout=timeout)
+        if completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", "replace").strip().splitlines()
+            raise RuntimeError(message[-1] if message else f"ffmpeg exit code {completed.returncode}")
+        result.update(ok=True, error=None, bytes=os.path.getsize(dst_path))
+    except subprocess.TimeoutExpired:
+        result.update(ok=False, error=f"timed out after {timeout:.0f}s", bytes=0)
+    except Exception as e:
+        result.update(ok=False, error=str(e), bytes=0)
+
+    if not result["ok"] and os.path.exists(dst_path):
+        os.remove(dst_path)  # drop partial output
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
 
 class AudioConverter:
-    """A reusable audio conversion utility using PyDub."""
+    """A reusable audio conversion utility built on streaming ffmpeg processes."""
 
-    def __init__(self):
+    def __init__(self, max_workers: int = None, timeout_sec: float = None):
+        """
+        :param max_workers: Concurrent ffmpeg processes for convert_batch (falls back to CONVERT_MAX_WORKERS, default CPU count)
+        :param timeout_sec: Per-job timeout for convert_batch (falls back to CONVERT_TIMEOUT_SEC, default 600)
+        """
+        self.ffmpeg = os.getenv("FFMPEG_PATH") or "ffmpeg"
+        self.max_workers = max_workers or int(os.getenv("CONVERT_MAX_WORKERS", str(os.cpu_count() or 1)))
+        self.timeout_sec = timeout_sec or float(os.getenv("CONVERT_TIMEOUT_SEC", "600"))
+        self.transcoder = Transcoder()
         print("🎵 AudioConverter initialized successfully.")
 
     def to_wav(self, src, dst_path: str):
@@ -24,25 +82,75 @@ class AudioConverter:
     def _convert(self, src, dst_path: str, format: str):
         """
         Internal helper for conversion.
-        :param src: Path to file or file-like object (BytesIO)
+        :param src: Path to file, file-like object (BytesIO) or AudioBuffer
         :param dst_path: Output file path
         :param format: Format string for export
         """
         try:
+            if isinstance(src, AudioBuffer):
+                # Already decoded: encode straight from the shared samples
+                src.export(dst_path, format=format)
+                print(f"✅ Conversion successful! File saved as: {dst_path}")
+                return
             if isinstance(src, (str, os.PathLike)):
                 if not os.path.exists(src):
                     raise FileNotFoundError(f"Input file not found: {src}")
-                audio = AudioSegment.from_file(src)
-            elif isinstance(src, BytesIO):
-                src.seek(0)
-                audio = AudioSegment.from_file(src)
-            else:
-                raise TypeError("Input must be a file path or BytesIO object")
-
-            # Export to desired format
-            audio.export(dst_path, format=format)
+            elif not isinstance(src, BytesIO):
+                raise TypeError("Input must be a file path, BytesIO or AudioBuffer object")
+
+            # Decode and encode inside ffmpeg (constant memory)
+            self.transcoder.transcode(src, dst_path, format=format)
             print(f"✅ Conversion successful! File saved as: {dst_path}")
 
         except Exception as e:
             print(f"❌ Error converting to {format.upper()}: {e}")
             raise e
+
+    # -------------------------------------------------------------
+    # 📦 Batch conversion
+    # -------------------------------------------------------------
+    def convert_batch(self, jobs, max_workers: int = None, on_result=None) -> list:
+        """
+        Convert many files concurrently, one ffmpeg process per job.
+        A failing job is reported in its result and does not stop the batch.
+        :param jobs: Iterable of (src, dst_path, format) or (src, dst_path, format, extra_ffmpeg_args);
+                     src is a file path or raw bytes
+        :param max_workers: Concurrent ffmpeg processes (defaults to self.max_workers)
+        :param on_result: Optional callback receiving each result dict as it completes
+        :return: Result dicts in job order:
+                 {"src", "dst", "format", "ok", "error", "bytes", "seconds"}
+        """
+        jobs = [tuple(job) for job in jobs]
+        if not jobs:
+            return []
+        for job in jobs:
+            if job[0] is None or isinstance(job[0], AudioBuffer):
+                raise TypeError("convert_batch sources must be file paths or bytes; use _convert for AudioBuffers")
+
+        started = time.perf_counter()
+        results = [None] * len(jobs)
+        # Threads only dispatch: each conversion runs in its own ffmpeg process
+        with ThreadPoolExecutor(max_workers=min(max_workers or self.max_workers, len(jobs))) as pool:
+            futures = {
+                pool.submit(
+                    _run_ffmpeg,
+                    self.ffmpeg,
+                    os.fspath(job[0]) if isinstance(job[0], os.PathLike) else job[0],
+                    job[1],
+                    job[2],
+                    job[3] if len(job) > 3 else None,
+                    self.timeout_sec,
+                ): index
+                for index, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if not result["ok"]:
+                    print(f"❌ {result['src']} -> {result['dst']}: {result['error']}")
+                if on_result:
+                    on_result(result)
+
+        ok = sum(1 for r in results if r["ok"])
+        print(f"✅ Batch conversion: {ok}/{len(jobs)} succeeded in {time.perf_counter() - started:.1f}s")
+        return results
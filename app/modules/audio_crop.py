@@ -1,5 +1,12 @@
 from pydub import AudioSegment
 import os
+import numpy as np
+import soundfile as sf
+from .audio_buffer import AudioBuffer
+from .transcoder import Transcoder
+
+# Containers soundfile can read at a frame offset without decoding what precedes it
+SEEKABLE_EXTENSIONS = (".wav", ".flac")
 
 # -------------------------------------------------------------
 # 🎧 Audio Croper
@@ -10,6 +17,7 @@ class AudioCroper:
     """
 
     def __init__(self):
+        self.transcoder = Transcoder()
         print("🎵 AudioCroper initialized successfully.")
 
     # ---------------------------------------------------------
@@ -23,12 +31,10 @@ class AudioCroper:
         :return: Path to WAV file
         """
         try:
-            audio = AudioSegment.from_file(input_path)
             if not output_path:
                 name, _ = os.path.splitext(input_path)
                 output_path = f"{name}.wav"
-            audio.export(output_path, format="wav")
-            return output_path
+            return self.transcoder.transcode(input_path, output_path, format="wav")
         except Exception as e:
             raise RuntimeError(f"Error converting to WAV: {e}")
 
@@ -38,22 +44,33 @@ class AudioCroper:
     def crop_audio(self, input_audio, start_time=(0, 10), end_time=(4, 30), output_path=None) -> AudioSegment:
         """
         Crop an audio clip.
-        :param input_audio: AudioSegment object or path to audio file
+        :param input_audio: AudioBuffer, AudioSegment object or path to audio file
         :param start_time: Tuple (minutes, seconds)
         :param end_time: Tuple (minutes, seconds)
         :param output_path: Optional path to save cropped audio
-        :return: Cropped AudioSegment object or saved file path
+        :return: Cropped AudioBuffer view (for AudioBuffer input), AudioSegment, or saved file path
         """
-        # Step 1️⃣ Convert to WAV if input is a file path and not WAV
+        # AudioBuffer input: zero-copy view, no decode or disk round trip
+        if isinstance(input_audio, AudioBuffer):
+            start_sec = start_time[0] * 60 + start_time[1]
+            end_sec = end_time[0] * 60 + end_time[1]
+            cropped = input_audio.crop(start_sec, end_sec)
+            if output_path:
+                cropped.export(output_path, format="wav")
+                return output_path
+            return cropped
+
+        # Step 1️⃣ File path: decode only the requested window (seek, no full decode)
         if isinstance(input_audio, str):
-            ext = os.path.splitext(input_audio)[1].lower()
-            if ext != ".wav":
-                input_audio = self.to_wav(input_audio)
-            audio = AudioSegment.from_wav(input_audio)
+            cropped = self._crop_file(input_audio, start_time, end_time)
+            if output_path:
+                cropped.export(output_path, format="wav")
+                return output_path
+            return cropped
         elif isinstance(input_audio, AudioSegment):
             audio = input_audio
         else:
-            raise TypeError("input_audio must be a file path or AudioSegment object")
+            raise TypeError("input_audio must be a file path, AudioSegment or AudioBuffer object")
 
         # Step 2️⃣ Calculate crop milliseconds
         start_ms = (start_time[0] * 60 + start_time[1]) * 1000
@@ -70,4 +87,58 @@ class AudioCroper:
             cropped.export(output_path, format="wav")
             return output_path
 
-        return cropped
\ No newline at end of file
+        return cropped
+
+    def _crop_file(self, input_path: str, start_time, end_time) -> AudioSegment:
+        """
+        Decode only the requested window of a file, in its native format:
+        - WAV / FLAC: frame-offset read through soundfile.
+        - Other formats: ffmpeg input seek (-ss) limited to the window length (-t).
+        Cost is proportional to the crop length, not the file length.
+        """
+        start_sec = start_time[0] * 60 + start_time[1]
+        end_sec = end_time[0] * 60 + end_time[1]
+
+        if os.path.splitext(input_path)[1].lower() in SEEKABLE_EXTENSIONS:
+            return self._read_window(input_path, start_sec, end_sec)
+
+        info = self.transcoder.probe(input_path)
+        rate, channels = info["sample_rate"], info["channels"]
+        if info["duration"] is not None and info["duration"] < start_sec:
+            raise ValueError("Audio is shorter than the crop start time")
+
+        blocks = list(self.transcoder.stream_pcm(
+            input_path, rate, channels,
+            start_sec=start_sec,
+            duration_sec=max(0.0, end_sec - start_sec),
+        ))
+        samples = np.concatenate(blocks) if blocks else np.zeros((0, channels), dtype=np.int16)
+        return AudioBuffer(samples[:int((end_sec - start_sec) * rate)], rate).to_audio_segment()
+
+    @staticmethod
+    def _read_window(input_path: str, start_sec: float, end_sec: float) -> AudioSegment:
+        """Read [start_sec, end_sec) of a WAV / FLAC file without touching the rest."""
+        info = sf.info(input_path)
+        start = int(start_sec * info.samplerate)
+        if info.frames < start:
+            raise ValueError("Audio is shorter than the crop start time")
+        stop = min(info.frames, int(end_sec * info.samplerate))
+
+        # Keep the file's sample width (pydub stores 24-bit audio as 32-bit)
+        sample_width = {"PCM_S8": 1, "PCM_U8": 1, "PCM_16": 2}.get(info.subtype, 4)
+        samples, rate = sf.read(
+            input_path,
+            start=start,
+            stop=stop,
+            dtype="int32" if sample_width == 4 else "int16",
+            always_2d=True,
+        )
+        if sample_width == 1:
+            # soundfile has no 8-bit dtype; pydub holds 8-bit audio as signed bytes
+            samples = (samples >> 8).astype(np.int8)
+        return AudioSegment(
+            data=np.ascontiguousarray(samples).tobytes(),
+            sample_width=sample_width,
+            frame_rate=rate,
+            channels=samples.shape[1],
+        )
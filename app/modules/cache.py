@@ -0,0 +1,265 @@
+# module/cache.py
+import os
+import json
+import asyncio
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from .metrics import record_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction is only serialized within the process
+    fcntl = None
+
+
+class DiskCache:
+    """
+    🗄️ Size-bounded, on-disk LRU cache.
+    - One file per entry, named by the SHA-256 of the key.
+    - Least recently used entries are evicted once `max_bytes` is exceeded.
+      The budget covers the whole directory, shared by every worker process:
+      a running total kept in a sidecar file is updated under an exclusive
+      file lock on every write and removal, and only once it exceeds the
+      budget are the sizes and recency order read back from the files
+      (st_size / st_atime, which a hit refreshes).
+    - Entries older than `ttl_sec` (if set) are treated as misses and removed.
+    - Hit / miss / eviction counters are available through stats().
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl_sec: float = None):
+        """
+        :param directory: Folder holding the cache entries (created if missing)
+        :param max_bytes: Total size budget for all entries
+        :param ttl_sec: Optional maximum age of an entry, measured from when it was written
+        """
+        self.directory = directory
+        self.name = os.path.basename(os.path.normpath(directory))
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # file name -> size, least recently used first
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_index()
+
+    # -------------------------------------------------------------
+    # 🔑 Keys and index
+    # -------------------------------------------------------------
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build a stable key from any number of string-able parts."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _file_name(self, key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load_index(self):
+        """Rebuild the LRU order and total size from the files on disk (lock held)."""
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # removed by another process meanwhile
+                files.append((stat.st_atime, entry.name, stat.st_size))
+        self._entries = OrderedDict((name, size) for _atime, name, size in sorted(files))
+        self._bytes = sum(self._entries.values())
+
+    def _read_total(self):
+        """Running size of the whole directory, or None if unknown (directory lock held)."""
+        try:
+            with open(self._path(".size")) as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_total(self, total: int):
+        with open(self._path(".size"), "w") as f:
+            f.write(str(max(0, total)))
+
+    def _update_total(self, delta: int):
+        """
+        Apply a size change to the shared total and evict if it is over
+        budget (directory lock held). A missing or unreadable total is
+        rebuilt from the files.
+        """
+        total = self._read_total()
+        if total is None:
+            self._load_index()
+            total = self._bytes
+        else:
+            total += delta
+        if total > self.max_bytes:
+            total = self._evict()
+        self._write_total(total)
+
+    @contextmanager
+    def _directory_lock(self):
+        """Exclusive lock on the cache directory, shared with other processes."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._path(".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # -------------------------------------------------------------
+    # 📦 Bytes API
+    # -------------------------------------------------------------
+    def get(self, key: str):
+        """Return the cached bytes for `key`, or None on a miss (or expired entry)."""
+        name = self._file_name(key)
+        path = self._path(name)
+        try:
+            mtime = os.path.getmtime(path)
+            if self.ttl_sec is not None and time.time() - mtime > self.ttl_sec:
+                self._remove(name)
+                raise FileNotFoundError(path)
+            with open(path, "rb") as f:
+                value = f.read()
+            # Recency for LRU lives in the access time (set explicitly: noatime mounts),
+            # the write time is kept for the TTL
+            os.utime(path, (time.time(), mtime))
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                if name in self._entries:
+                    self._bytes -= self._entries.pop(name)
+            record_cache(self.name, hit=False)
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if name in self._entries:
+                self._entries.move_to_end(name)
+        record_cache(self.name, hit=True)
+        return value
+
+    def set(self, key: str, value: bytes):
+        """Store bytes under `key`, evicting least recently used entries as needed."""
+        if len(value) > self.max_bytes:
+            return
+        name = self._file_name(key)
+
+        # Write atomically so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            with self._lock, self._directory_lock():
+                previous = self._file_size(name)
+                os.replace(tmp_path, self._path(name))
+                if name in self._entries:
+                    self._bytes -= self._entries.pop(name)
+                self._entries[name] = len(value)
+                self._bytes += len(value)
+                self._update_total(len(value) - previous)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def delete(self, key: str):
+        """Remove an entry if present."""
+        self._remove(self._file_name(key))
+
+    def _file_size(self, name: str) -> int:
+        try:
+            return os.path.getsize(self._path(name))
+        except FileNotFoundError:
+            return 0
+
+    def _remove(self, name: str):
+        with self._lock, self._directory_lock():
+            if name in self._entries:
+                self._bytes -= self._entries.pop(name)
+            size = self._file_size(name)
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                return
+            self._update_total(-size)
+
+    def _evict(self) -> int:
+        """
+        Drop least recently used entries until the directory is under budget
+        (both locks held). Other processes write to the same directory, so
+        the size and order are re-read from disk first; this also corrects
+        any drift of the running total.
+        :return: Size of the directory after eviction
+        """
+        self._load_index()
+        while self._bytes > self.max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+        return self._bytes
+
+    # -------------------------------------------------------------
+    # 🧾 JSON helpers
+    # -------------------------------------------------------------
+    def get_json(self, key: str):
+        """Return the cached JSON value for `key`, or None on a miss."""
+        value = self.get(key)
+        return None if value is None else json.loads(value.decode("utf-8"))
+
+    def set_json(self, key: str, value):
+        """Store a JSON-serializable value under `key`."""
+        self.set(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    # -------------------------------------------------------------
+    # ⚡ Async helpers (file I/O runs in a worker thread)
+    # -------------------------------------------------------------
+    async def aget(self, key: str):
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: bytes):
+        await asyncio.to_thread(self.set, key, value)
+
+    async def aget_json(self, key: str):
+        return await asyncio.to_thread(self.get_json, key)
+
+    async def aset_json(self, key: str, value):
+        await asyncio.to_thread(self.set_json, key, value)
+
+    def stats(self) -> dict:
+        """Hit / miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_sec": self.ttl_sec,
+            }
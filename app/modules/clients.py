@@ -0,0 +1,185 @@
+# module/clients.py
+import os
+import threading
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from .config import load_config
+from elevenlabs.client import ElevenLabs, AsyncElevenLabs
+from openai import OpenAI, AsyncOpenAI
+
+# Load environment variables
+load_config()
+
+# -------------------------------------------------------------
+# 🌐 Process-wide pooled HTTP clients
+# -------------------------------------------------------------
+# Every module shares these clients so connections (and TLS sessions) are
+# kept alive and reused instead of being re-established per request.
+#
+#   HTTP_POOL_SIZE            max connections per client (default 32)
+#   HTTP_KEEPALIVE_SEC        idle keep-alive expiry (default 30)
+#   HTTP_TIMEOUT_SEC          read/write timeout (default 300)
+#   HTTP_CONNECT_TIMEOUT_SEC  connect timeout (default 10)
+#   HTTP2                     "1" to negotiate HTTP/2 when the `h2` package is installed (default 1)
+#   ELEVENLABS_BASE_URL       optional ElevenLabs API base URL override
+
+_lock = threading.Lock()
+_clients = {}
+_http_clients = []  # underlying httpx clients, closed by close_clients()
+_async_http_clients = []  # underlying httpx async clients, closed by aclose_clients()
+
+
+def _pool_size() -> int:
+    return int(os.getenv("HTTP_POOL_SIZE", "32"))
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("HTTP2", "1") != "1":
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _get_or_create(key, factory):
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = factory()
+            _clients[key] = client
+        return client
+
+
+def _httpx_options() -> dict:
+    pool_size = _pool_size()
+    return {
+        "http2": _http2_enabled(),
+        "limits": httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_SEC", "30")),
+        ),
+        "timeout": httpx.Timeout(
+            float(os.getenv("HTTP_TIMEOUT_SEC", "300")),
+            connect=float(os.getenv("HTTP_CONNECT_TIMEOUT_SEC", "10")),
+        ),
+    }
+
+
+def build_httpx_client() -> httpx.Client:
+    """New httpx client with the configured pool limits, keep-alive and timeouts."""
+    client = httpx.Client(**_httpx_options())
+    _http_clients.append(client)
+    return client
+
+
+def build_async_httpx_client() -> httpx.AsyncClient:
+    """New httpx async client with the configured pool limits, keep-alive and timeouts."""
+    client = httpx.AsyncClient(**_httpx_options())
+    _async_http_clients.append(client)
+    return client
+
+
+def get_http_session() -> requests.Session:
+    """Shared requests.Session with a connection pool sized by HTTP_POOL_SIZE."""
+    def factory():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=_pool_size(), pool_maxsize=_pool_size())
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    return _get_or_create("requests", factory)
+
+
+def get_http_timeout() -> tuple:
+    """(connect, read) timeout for requests-based calls."""
+    return (
+        float(os.getenv("HTTP_CONNECT_TIMEOUT_SEC", "10")),
+        float(os.getenv("HTTP_TIMEOUT_SEC", "300")),
+    )
+
+
+def get_elevenlabs_client(api_key: str = None) -> ElevenLabs:
+    """Shared ElevenLabs client (one per API key) on a pooled httpx client."""
+    api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
+
+    def factory():
+        kwargs = {"api_key": api_key, "httpx_client": build_httpx_client()}
+        base_url = os.getenv("ELEVENLABS_BASE_URL")
+        if base_url:
+            kwargs["base_url"] = base_url
+        return ElevenLabs(**kwargs)
+
+    return _get_or_create(("elevenlabs", api_key), factory)
+
+
+def get_openai_client(api_key: str = None) -> OpenAI:
+    """Shared OpenAI client (one per API key) on a pooled httpx client."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    return _get_or_create(
+        ("openai", api_key),
+        lambda: OpenAI(api_key=api_key, http_client=build_httpx_client()),
+    )
+
+
+# -------------------------------------------------------------
+# ⚡ Async clients (share the event loop of the application)
+# -------------------------------------------------------------
+def get_async_http_client() -> httpx.AsyncClient:
+    """Shared httpx.AsyncClient for plain HTTP calls (e.g. Speech-to-Text)."""
+    return _get_or_create("httpx_async", build_async_httpx_client)
+
+
+def get_async_elevenlabs_client(api_key: str = None) -> AsyncElevenLabs:
+    """Shared AsyncElevenLabs client (one per API key) on a pooled httpx async client."""
+    api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
+
+    def factory():
+        kwargs = {"api_key": api_key, "httpx_client": build_async_httpx_client()}
+        base_url = os.getenv("ELEVENLABS_BASE_URL")
+        if base_url:
+            kwargs["base_url"] = base_url
+        return AsyncElevenLabs(**kwargs)
+
+    return _get_or_create(("elevenlabs_async", api_key), factory)
+
+
+def get_async_openai_client(api_key: str = None) -> AsyncOpenAI:
+    """Shared AsyncOpenAI client (one per API key) on a pooled httpx async client."""
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    return _get_or_create(
+        ("openai_async", api_key),
+        lambda: AsyncOpenAI(api_key=api_key, http_client=build_async_httpx_client()),
+    )
+
+
+def close_clients():
+    """Close every pooled client (e.g. on application shutdown)."""
+    with _lock:
+        clients = [c for c in _clients.values() if isinstance(c, requests.Session)] + _http_clients[:]
+        _clients.clear()
+        _http_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"⚠️ Failed to close client: {e}")
+
+
+async def aclose_clients():
+    """Close the pooled async clients, then the sync ones."""
+    with _lock:
+        clients = _async_http_clients[:]
+        _async_http_clients.clear()
+        for key in [k for k in _clients if "async" in (k if isinstance(k, str) else k[0])]:
+            del _clients[key]
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            print(f"⚠️ Failed to close client: {e}")
+    close_clients()
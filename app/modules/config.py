@@ -0,0 +1,31 @@
+# module/config.py
+import os
+import threading
+from dotenv import load_dotenv
+
+# Settings without which the provider clients cannot be built
+REQUIRED_SETTINGS = ("ELEVENLABS_API_KEY", "OPENAI_API_KEY")
+
+_lock = threading.Lock()
+_loaded = False
+
+
+def load_config():
+    """
+    Load the .env file into the environment, once per process.
+    Every module calls this at import; only the first call reads the file.
+    Variables already set in the environment take precedence.
+    """
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            load_dotenv()
+            _loaded = True
+
+
+def missing_settings() -> list:
+    """Names of the required settings that are not set."""
+    load_config()
+    return [name for name in REQUIRED_SETTINGS if not os.getenv(name)]
@@ -0,0 +1,146 @@
+# module/metrics.py
+import time
+import asyncio
+from contextlib import contextmanager
+
+try:
+    from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+except ImportError:  # optional dependency: metrics become no-ops
+    Counter = Histogram = generate_latest = None
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _NoopMetric:
+    """Stand-in used when prometheus_client is not installed."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+
+def _histogram(name, documentation, labels, buckets):
+    if Histogram is None:
+        return _NoopMetric()
+    return Histogram(name, documentation, labels, buckets=buckets)
+
+
+def _counter(name, documentation, labels):
+    if Counter is None:
+        return _NoopMetric()
+    return Counter(name, documentation, labels)
+
+
+# -------------------------------------------------------------
+# 📈 Metric definitions
+# -------------------------------------------------------------
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+STAGE_SECONDS = _histogram(
+    "voice_pipeline_stage_seconds", "Duration of pipeline stages.",
+    ["pipeline", "stage", "status"], _LATENCY_BUCKETS,
+)
+PROVIDER_SECONDS = _histogram(
+    "voice_provider_request_seconds", "Duration of outbound provider calls.",
+    ["provider", "operation", "status"], _LATENCY_BUCKETS,
+)
+PROVIDER_ERRORS = _counter(
+    "voice_provider_errors_total", "Failed outbound provider calls.",
+    ["provider", "operation", "error"],
+)
+PROVIDER_BYTES = _counter(
+    "voice_provider_bytes_total", "Payload bytes exchanged with providers.",
+    ["provider", "operation", "direction"],
+)
+AUDIO_SECONDS = _counter(
+    "voice_provider_audio_seconds_total", "Seconds of audio sent to providers.",
+    ["provider", "operation"],
+)
+CHARACTERS = _counter(
+    "voice_provider_characters_total", "Text characters sent to or received from providers.",
+    ["provider", "operation", "direction"],
+)
+TOKENS = _counter(
+    "voice_provider_tokens_total", "LLM tokens reported by the provider.",
+    ["provider", "operation", "kind"],
+)
+CACHE_REQUESTS = _counter(
+    "voice_cache_requests_total", "Cache lookups by result.",
+    ["cache", "result"],
+)
+
+
+# -------------------------------------------------------------
+# 🧰 Helpers
+# -------------------------------------------------------------
+@contextmanager
+def stage_timer(pipeline: str, stage: str):
+    """Time a pipeline stage; works around both sync calls and awaits."""
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except asyncio.CancelledError:  # a BaseException: stopped because another stage failed
+        status = "cancelled"
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        STAGE_SECONDS.labels(pipeline, stage, status).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def provider_call(provider: str, operation: str):
+    """Time one outbound provider request and count it as an error if it raises."""
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except Exception as e:
+        status = "error"
+        PROVIDER_ERRORS.labels(provider, operation, type(e).__name__).inc()
+        raise
+    finally:
+        PROVIDER_SECONDS.labels(provider, operation, status).observe(time.perf_counter() - started)
+
+
+def record_bytes(provider: str, operation: str, direction: str, amount: int):
+    """:param direction: "sent" or "received" """
+    if amount:
+        PROVIDER_BYTES.labels(provider, operation, direction).inc(amount)
+
+
+def record_audio_seconds(provider: str, operation: str, seconds: float):
+    if seconds:
+        AUDIO_SECONDS.labels(provider, operation).inc(seconds)
+
+
+def record_characters(provider: str, operation: str, direction: str, amount: int):
+    if amount:
+        CHARACTERS.labels(provider, operation, direction).inc(amount)
+
+
+def record_tokens(provider: str, operation: str, usage):
+    """Count prompt / completion tokens from an OpenAI `usage` object."""
+    if usage is None:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        amount = getattr(usage, kind, None)
+        if amount:
+            TOKENS.labels(provider, operation, kind.replace("_tokens", "")).inc(amount)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def render_latest():
+    """:return: (body bytes, content type) for the /metrics endpoint"""
+    if generate_latest is None:
+        return b"# prometheus_client is not installed\n", CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
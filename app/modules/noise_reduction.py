@@ -0,0 +1,143 @@
+# module/noise_reduction.py
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .config import load_config
+from .audio_buffer import AudioBuffer
+from .audio_analysis import AudioAnalyzer
+
+try:
+    import noisereduce as nr
+except ImportError:  # optional dependency
+    nr = None
+
+# Load environment variables
+load_config()
+
+
+def _reduce_block(samples: np.ndarray, sample_rate: int, stationary: bool) -> np.ndarray:
+    """Process-pool worker: denoise one (frames, channels) float32 block."""
+    reduced = nr.reduce_noise(y=samples.T, sr=sample_rate, stationary=stationary, n_jobs=1)
+    return np.asarray(reduced, dtype=np.float32).reshape(samples.shape[1], -1).T
+
+
+class NoiseReducer:
+    """
+    🔇 Spectral-gating noise reduction (noisereduce) for long recordings.
+    - Audio is cut into blocks with `overlap_sec` of context on each side;
+      only the centre of each denoised block is kept, so there are no seams.
+    - Blocks are spread across a process pool, with a bounded number in
+      flight so memory stays flat however long the audio is.
+    - Skipped when the estimated SNR is already good, or when noisereduce
+      is not installed.
+
+    Env:
+      NOISE_BLOCK_SEC      block length (default 30)
+      NOISE_OVERLAP_SEC    context on each side of a block (default 1)
+      NOISE_MAX_WORKERS    worker processes (default: CPU count)
+      NOISE_SKIP_SNR_DB    skip when the SNR estimate is at least this (default 20)
+    """
+
+    def __init__(
+        self,
+        block_sec: float = None,
+        overlap_sec: float = None,
+        max_workers: int = None,
+        skip_snr_db: float = None,
+        stationary: bool = False,
+        analyzer: AudioAnalyzer = None,
+    ):
+        """
+        :param block_sec: Seconds of output produced per block
+        :param overlap_sec: Extra context given to each block on both sides
+        :param max_workers: Size of the process pool
+        :param skip_snr_db: Audio at or above this SNR is returned unchanged
+        :param stationary: Use stationary noise estimation (faster, suits hum and hiss;
+                           default False, as in noisereduce.reduce_noise)
+        :param analyzer: AudioAnalyzer used to estimate the SNR when none is given
+        """
+        self.block_sec = block_sec or float(os.getenv("NOISE_BLOCK_SEC", "30"))
+        self.overlap_sec = overlap_sec if overlap_sec is not None else float(os.getenv("NOISE_OVERLAP_SEC", "1"))
+        self.max_workers = max_workers or int(os.getenv("NOISE_MAX_WORKERS", str(os.cpu_count() or 1)))
+        self.skip_snr_db = skip_snr_db if skip_snr_db is not None else float(os.getenv("NOISE_SKIP_SNR_DB", "20"))
+        self.stationary = stationary
+        self.analyzer = analyzer or AudioAnalyzer()
+        self._pool = None
+
+        if nr is None:
+            print("⚠️ noisereduce is not installed; noise reduction is disabled.")
+
+    @property
+    def available(self) -> bool:
+        return nr is not None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned, not forked: forking a threaded server can deadlock on inherited locks
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # -------------------------------------------------------------
+    # 🔇 Noise reduction
+    # -------------------------------------------------------------
+    def should_reduce(self, audio: AudioBuffer, snr_db: float = None) -> bool:
+        """True if noisereduce is available and the SNR is below the skip threshold."""
+        if not self.available or not audio.frames:
+            return False
+        if snr_db is None:
+            snr_db = self.analyzer.analyze(audio)["snr_db"]
+        if snr_db >= self.skip_snr_db:
+            print(f"⏩ Skipping noise reduction (SNR {snr_db:.1f} dB).")
+            return False
+        return True
+
+    def reduce(self, audio: AudioBuffer, snr_db: float = None) -> AudioBuffer:
+        """
+        Denoise an AudioBuffer block by block on the process pool.
+        :param snr_db: SNR estimate if already known (e.g. from AudioAnalyzer.check)
+        :return: A new int16 AudioBuffer, or `audio` itself when skipped
+        """
+        if not self.should_reduce(audio, snr_db):
+            return audio
+
+        rate = audio.sample_rate
+        block = max(1, int(self.block_sec * rate))
+        overlap = int(self.overlap_sec * rate)
+        starts = range(0, audio.frames, block)
+        print(f"🔇 Reducing background noise in {len(starts)} block(s) on {self.max_workers} process(es)...")
+
+        output = np.empty((audio.frames, audio.channels), dtype=np.int16)
+        pool = self._get_pool()
+        in_flight = {}
+
+        def collect(start):
+            lo = max(0, start - overlap)
+            reduced = in_flight.pop(start).result()
+            end = min(audio.frames, start + block)
+            centre = reduced[start - lo:start - lo + (end - start)]
+            output[start:end] = (np.clip(centre, -1.0, 1.0) * 32767.0).astype(np.int16)
+
+        for start in starts:
+            lo = max(0, start - overlap)
+            hi = min(audio.frames, start + block + overlap)
+            samples = AudioBuffer(audio.samples[lo:hi], rate).as_float32()
+            in_flight[start] = pool.submit(_reduce_block, np.ascontiguousarray(samples), rate, self.stationary)
+            # Bound memory: at most two blocks per worker are queued at a time
+            if len(in_flight) >= 2 * self.max_workers:
+                collect(min(in_flight))
+
+        for start in sorted(in_flight):
+            collect(start)
+
+        print("✅ Noise reduction complete")
+        return AudioBuffer(output, rate)
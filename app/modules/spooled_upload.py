@@ -0,0 +1,201 @@
+# module/spooled_upload.py
+import io
+import os
+import mmap
+import stat
+import hashlib
+import tempfile
+from io import BytesIO
+from .config import load_config
+
+# Load environment variables
+load_config()
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+class SpooledUpload:
+    """
+    📦 One handle for an uploaded file, shared by every pipeline stage.
+    - Small uploads stay in memory.
+    - Once `max_memory_bytes` is exceeded the data spills to a single temp
+      file, which decoders read by path.
+    - A spooled file that is already on disk (Starlette's UploadFile) is
+      adopted as is instead of being written a second time; without a path
+      of its own it is handed to decoders as a memory-mapped view.
+    - The SHA-256 of the content is computed while writing.
+    - Uploads larger than `max_bytes` are rejected, bounding the disk footprint.
+
+    Env:
+      UPLOAD_MEMORY_MAX_MB  in-memory threshold (default 16)
+      UPLOAD_MAX_MB         hard size limit (default 1024)
+    """
+
+    def __init__(self, filename: str = None, max_memory_bytes: int = None, max_bytes: int = None):
+        """
+        :param filename: Original file name (used for its extension)
+        :param max_memory_bytes: Size above which the data spills to disk
+        :param max_bytes: Maximum accepted upload size
+        """
+        self.filename = filename or "upload"
+        self.suffix = os.path.splitext(self.filename)[1]
+        self.max_memory_bytes = max_memory_bytes or int(float(os.getenv("UPLOAD_MEMORY_MAX_MB", "16")) * 1024 * 1024)
+        self.max_bytes = max_bytes or int(float(os.getenv("UPLOAD_MAX_MB", "1024")) * 1024 * 1024)
+
+        self.size = 0
+        self.path = None  # set once the data has spilled to disk
+        self._owns_path = True  # False when the file belongs to an adopted spool
+        self._memory = BytesIO()
+        self._file = None
+        self._mmap = None
+        self._digest = hashlib.sha256()
+        self._sha256 = None
+
+    # -------------------------------------------------------------
+    # 📥 Writing
+    # -------------------------------------------------------------
+    @classmethod
+    def from_file(cls, src, filename: str = None, chunk_size: int = 1024 * 1024, **kwargs) -> "SpooledUpload":
+        """Copy a file-like object (e.g. UploadFile.file) into a finished upload."""
+        upload = cls(filename=filename, **kwargs)
+        try:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                upload.write(chunk)
+            return upload.finish()
+        except Exception:
+            upload.close()
+            raise
+
+    @classmethod
+    def from_spooled(cls, src, filename: str = None, **kwargs) -> "SpooledUpload":
+        """
+        Adopt a spooled temp file (e.g. UploadFile.file) without copying it.
+        When the content is larger than the in-memory threshold and already
+        lives in a regular file, that file is read once for the SHA-256 and
+        then memory-mapped (or read by path, when it has one), so the upload
+        is written to disk only once. Anything else (small uploads, in-memory
+        or non-file streams) is copied as in `from_file`.
+        """
+        upload = cls(filename=filename, **kwargs)
+        try:
+            src.seek(0, os.SEEK_END)
+            size = src.tell()
+            src.seek(0)
+            # fileno() rolls an in-memory spool over, as from_file would spill it
+            info = os.fstat(src.fileno()) if size > upload.max_memory_bytes else None
+        except (AttributeError, io.UnsupportedOperation, OSError):
+            info = None
+        if info is None or not stat.S_ISREG(info.st_mode):
+            return cls.from_file(src, filename=filename, **kwargs)
+
+        upload.size = info.st_size
+        if upload.size > upload.max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the {upload.max_bytes // (1024 * 1024)} MB limit.")
+        # Our own descriptor keeps the file alive after the framework closes its copy
+        upload._file = os.fdopen(os.dup(src.fileno()), "rb")
+        upload._memory = None
+        try:
+            with mmap.mmap(upload._file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                upload._digest.update(view)
+        except Exception:
+            upload.close()
+            raise
+        # Named temp files can also be read by path (ffmpeg seeks them directly)
+        name = getattr(src, "name", None)
+        if isinstance(name, str) and os.path.exists(name) and os.path.samestat(os.stat(name), info):
+            upload.path = name
+            upload._owns_path = False
+        return upload.finish()
+
+    def write(self, data: bytes):
+        if self._sha256 is not None:
+            raise ValueError("Upload is already finished.")
+        if self.size + len(data) > self.max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the {self.max_bytes // (1024 * 1024)} MB limit.")
+
+        self._digest.update(data)
+        self.size += len(data)
+        if self._file is None and self.size > self.max_memory_bytes:
+            self._spill()
+        (self._file or self._memory).write(data)
+
+    def _spill(self):
+        """Move the in-memory data to the upload's single temp file."""
+        fd, self.path = tempfile.mkstemp(suffix=self.suffix)
+        self._file = os.fdopen(fd, "w+b")
+        self._file.write(self._memory.getbuffer())
+        self._memory = None
+
+    def finish(self) -> "SpooledUpload":
+        """Stop accepting data and fix the SHA-256."""
+        if self._sha256 is None:
+            self._sha256 = self._digest.hexdigest()
+            if self._file is not None:
+                self._file.flush()
+        return self
+
+    # -------------------------------------------------------------
+    # 📤 Reading
+    # -------------------------------------------------------------
+    @property
+    def sha256(self) -> str:
+        return self.finish()._sha256
+
+    @property
+    def in_memory(self) -> bool:
+        return self._file is None
+
+    def open(self) -> memoryview:
+        """
+        Zero-copy, read-only view of the whole content. Spilled uploads are
+        memory-mapped on first use.
+        """
+        self.finish()
+        if self._file is not None:
+            if not self.size:
+                return memoryview(b"")
+            if self._mmap is None:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._mmap)
+        return self._memory.getbuffer().toreadonly()
+
+    def source(self):
+        """
+        What decoders should read: the file's path when it has one (ffmpeg can
+        seek it directly), otherwise a view of the bytes.
+        """
+        self.finish()
+        return self.path if self.path else self.open()
+
+    # -------------------------------------------------------------
+    # 🧹 Cleanup
+    # -------------------------------------------------------------
+    def close(self):
+        """Release the memory and delete the spilled file, if any."""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # a view is still held by a reader; unmapped once it is released
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._owns_path and self.path and os.path.exists(self.path):
+            os.remove(self.path)
+        self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self):
+        where = "memory" if self.in_memory else self.path or "adopted file"
+        return f"SpooledUpload({self.filename!r}, {self.size} bytes, {where})"
@@ -0,0 +1,192 @@
+# module/stream_decoder.py
+import os
+import asyncio
+import hashlib
+import numpy as np
+from .config import load_config
+from .audio_buffer import AudioBuffer
+from .spooled_upload import UploadTooLargeError
+from .transcoder import keep_stderr_tail, stderr_error
+
+# Load environment variables
+load_config()
+
+
+class StreamingDecoder:
+    """
+    🌊 Incremental decoder: encoded bytes go in while they arrive, PCM comes out
+    as soon as ffmpeg produces it.
+    - `feed()` pipes bytes into ffmpeg (with backpressure) and hashes them.
+    - `wait_for(seconds)` lets consumers start once enough audio is decoded.
+    - `snapshot()` returns the audio decoded so far as a zero-copy AudioBuffer.
+    Formats that keep their index at the end of the file (e.g. some .m4a)
+    only decode once the upload is complete; streamable ones (mp3, wav, ogg,
+    flac, webm) decode progressively.
+    """
+
+    def __init__(self, sample_rate: int = 16000, channels: int = 1, max_bytes: int = None, read_size: int = 64 * 1024):
+        """
+        :param sample_rate: Output sample rate in Hz
+        :param channels: Output channel count
+        :param max_bytes: Maximum accepted input size (falls back to UPLOAD_MAX_MB, default 1024)
+        :param read_size: Bytes read from ffmpeg's output per step
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.max_bytes = max_bytes or int(float(os.getenv("UPLOAD_MAX_MB", "1024")) * 1024 * 1024)
+        self.read_size = read_size
+        self.ffmpeg = os.getenv("FFMPEG_PATH") or "ffmpeg"
+
+        self.bytes_in = 0
+        self.finished = False
+        self.error = None
+        self._digest = hashlib.sha256()
+        self._frame_bytes = 2 * channels  # s16le
+        self._samples = np.empty((sample_rate * 60, channels), dtype=np.int16)  # grows by doubling
+        self._frames = 0
+        self._remainder = b""
+        self._process = None
+        self._reader = None
+        self._stderr_reader = None
+        self._stderr_tail = bytearray()
+        self._changed = asyncio.Condition()
+
+    # -------------------------------------------------------------
+    # ▶️ Lifecycle
+    # -------------------------------------------------------------
+    async def start(self) -> "StreamingDecoder":
+        self._process = await asyncio.create_subprocess_exec(
+            self.ffmpeg, "-hide_banner", "-loglevel", "error",
+            "-i", "pipe:0",
+            "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ac", str(self.channels), "-ar", str(self.sample_rate),
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        # stderr is drained concurrently: a full pipe would block ffmpeg (and stdout) otherwise
+        self._stderr_reader = asyncio.ensure_future(self._drain_stderr())
+        self._reader = asyncio.ensure_future(self._read_output())
+        return self
+
+    async def feed(self, data: bytes):
+        """Pipe a chunk of encoded audio into the decoder."""
+        if self.error is not None:
+            raise self.error
+        self.bytes_in += len(data)
+        if self.bytes_in > self.max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds the {self.max_bytes // (1024 * 1024)} MB limit.")
+        self._digest.update(data)
+        try:
+            self._process.stdin.write(data)
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg exited; the reader reports why
+            await self._reader
+            raise self.error or RuntimeError("ffmpeg stopped reading input.")
+
+    async def close_input(self) -> AudioBuffer:
+        """Signal end of input and wait until everything is decoded."""
+        if not self._process.stdin.is_closing():
+            self._process.stdin.close()
+        await self._reader
+        if self.error is not None:
+            raise self.error
+        return self.snapshot()
+
+    async def ingest(self, chunks) -> AudioBuffer:
+        """Feed an async iterable of byte chunks (e.g. request.stream()) to the end."""
+        try:
+            async for chunk in chunks:
+                if chunk:
+                    await self.feed(chunk)
+        except Exception as e:
+            await self.abort(e)
+            raise
+        return await self.close_input()
+
+    async def abort(self, error: Exception = None):
+        """Stop ffmpeg and wake every waiter with `error`."""
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, self._stderr_reader, return_exceptions=True)
+        await self._finish(error or RuntimeError("Decoding aborted."))
+
+    # -------------------------------------------------------------
+    # 📤 Output
+    # -------------------------------------------------------------
+    async def _read_output(self):
+        error = None
+        try:
+            while True:
+                data = await self._process.stdout.read(self.read_size)
+                if not data:
+                    break
+                self._append(data)
+                async with self._changed:
+                    self._changed.notify_all()
+            code = await self._process.wait()
+            await self._stderr_reader
+            if code != 0:
+                error = RuntimeError(f"ffmpeg failed to decode the upload: {stderr_error(self._stderr_tail, code)}")
+        except Exception as e:
+            error = e
+        await self._finish(error)
+
+    async def _drain_stderr(self):
+        """Keep the last STDERR_TAIL_BYTES of ffmpeg's diagnostics."""
+        while True:
+            chunk = await self._process.stderr.read(64 * 1024)
+            if not chunk:
+                break
+            keep_stderr_tail(self._stderr_tail, chunk)
+
+    def _append(self, data: bytes):
+        data = self._remainder + data
+        usable = len(data) - len(data) % self._frame_bytes
+        self._remainder = data[usable:]
+        new = np.frombuffer(data[:usable], dtype=np.int16).reshape(-1, self.channels)
+
+        needed = self._frames + len(new)
+        if needed > len(self._samples):
+            # Earlier snapshots keep viewing the old array, so they stay valid
+            grown = np.empty((max(needed, 2 * len(self._samples)), self.channels), dtype=np.int16)
+            grown[:self._frames] = self._samples[:self._frames]
+            self._samples = grown
+        self._samples[self._frames:needed] = new
+        self._frames = needed
+
+    async def _finish(self, error: Exception = None):
+        if self.finished:
+            return
+        self.error = error
+        self.finished = True
+        async with self._changed:
+            self._changed.notify_all()
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio decoded so far."""
+        return self._frames / self.sample_rate
+
+    @property
+    def sha256(self) -> str:
+        """SHA-256 of the bytes fed so far (of the whole upload once finished)."""
+        return self._digest.hexdigest()
+
+    async def wait_for(self, seconds: float) -> float:
+        """
+        Wait until `seconds` of audio are decoded or the input has ended.
+        :return: Seconds decoded so far
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.finished or self.duration >= seconds)
+        if self.error is not None:
+            raise self.error
+        return self.duration
+
+    def snapshot(self) -> AudioBuffer:
+        """Audio decoded so far, as a zero-copy view."""
+        return AudioBuffer(self._samples[:self._frames], self.sample_rate)
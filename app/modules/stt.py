@@ -1,38 +1,83 @@
 # module/elevenlabs_transcriber.py
 import os
+import time
+import asyncio
+import httpx
 import requests
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from .config import load_config
 from io import BytesIO
+from .audio_buffer import AudioBuffer
+from .cache import DiskCache
+from .clients import get_http_session, get_http_timeout, get_async_http_client
+from .metrics import provider_call, record_bytes, record_audio_seconds, record_characters
 
 # Load environment variables
-load_dotenv()
+load_config()
 
 
 class SpeechToText:
     """Transcribe audio files using ElevenLabs Speech-to-Text API."""
 
-    def __init__(self, api_key: str = None, model_id: str = None, base_url: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        model_id: str = None,
+        base_url: str = None,
+        chunk_sec: float = None,
+        max_workers: int = None,
+        retries: int = None,
+        cache: DiskCache = None,
+    ):
         """
         Initialize the transcriber.
         :param api_key: ElevenLabs API key (falls back to .env if not provided)
         :param model_id: Transcription model ID
         :param base_url: ElevenLabs Speech-to-Text API URL
+        :param chunk_sec: Max chunk length for chunked mode (falls back to STT_CHUNK_SEC, default 600)
+        :param max_workers: Concurrent chunk uploads (falls back to STT_MAX_WORKERS, default 4)
+        :param retries: Attempts per chunk (falls back to STT_RETRIES, default 3)
+        :param cache: Transcript cache (falls back to TRANSCRIPT_CACHE_DIR / TRANSCRIPT_CACHE_MAX_MB)
         """
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         self.model_id = model_id or os.getenv("TRANSCRIPTION_MODEL")
         self.base_url = base_url or os.getenv("URL_SPEECH_TO_TEXT")
+        self.chunk_sec = chunk_sec or float(os.getenv("STT_CHUNK_SEC", "600"))
+        self.max_workers = max_workers or int(os.getenv("STT_MAX_WORKERS", "4"))
+        self.retries = retries or int(os.getenv("STT_RETRIES", "3"))
+        self.cache = cache or DiskCache(
+            os.getenv("TRANSCRIPT_CACHE_DIR", "file/cache/transcripts"),
+            max_bytes=int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "256")) * 1024 * 1024,
+        )
+        self.session = get_http_session()
 
         if not all([self.api_key, self.model_id, self.base_url]):
             raise ValueError("❌ Missing ElevenLabs API configuration.")
 
-    def transcribe(self, file) -> str:
+    def _cache_key(self, audio_hash: str, mode: str) -> str:
+        return DiskCache.make_key("transcript", audio_hash, self.model_id, mode)
+
+    def transcribe(self, file, audio_hash: str = None) -> str:
         """
         Transcribe an audio file and return the text.
-        :param file: Either a file path (str) or a file-like object (BytesIO, UploadFile, etc.)
+        :param file: A file path (str), a file-like object (BytesIO, UploadFile, etc.) or an AudioBuffer
+        :param audio_hash: Optional content hash of the original upload; enables the transcript cache
         :return: Transcribed text
         """
+        if audio_hash:
+            cached = self.cache.get_json(self._cache_key(audio_hash, "full"))
+            if cached is not None:
+                print("✅ Transcript cache hit.")
+                return cached["text"]
+
         # Determine if the input is a path or file-like object
-        if isinstance(file, str):
+        if isinstance(file, AudioBuffer):
+            # Encode the decoded samples in memory (FLAC keeps the upload small)
+            record_audio_seconds("elevenlabs", "speech_to_text", file.duration)
+            file_data = file.to_file_like("FLAC")
+            file_name = file_data.name
+            close_file = True
+        elif isinstance(file, str):
             if not os.path.exists(file):
                 raise FileNotFoundError(f"Audio file not found: {file}")
             file_name = os.path.basename(file)
@@ -43,23 +88,280 @@ class SpeechToText:
             file_data = file
             close_file = False
         else:
-            raise TypeError("File must be a path string or a file-like object.")
+            raise TypeError("File must be a path string, a file-like object or an AudioBuffer.")
 
         try:
-            response = requests.post(
+            text = self._request(file_name, file_data)
+        finally:
+            if close_file:
+                file_data.close()
+
+        if audio_hash:
+            self.cache.set_json(self._cache_key(audio_hash, "full"), {"text": text})
+        return text
+
+    def _request(self, file_name: str, file_data) -> str:
+        """Send one file to the Speech-to-Text API and return the text."""
+        with provider_call("elevenlabs", "speech_to_text"):
+            response = self.session.post(
                 self.base_url,
+                timeout=get_http_timeout(),
                 headers={"xi-api-key": self.api_key},
                 data={"model_id": self.model_id, "file_format": "other"},
                 files={"file": (file_name, file_data)},
             )
             response.raise_for_status()
             result = response.json()
+        return self._record_response(response, result)
 
-            if "text" in result:
-                return result["text"]
-            else:
-                raise Exception(f"Transcription failed: {result}")
+    @staticmethod
+    def _record_response(response, result: dict) -> str:
+        """Record payload sizes of a Speech-to-Text response and return its text."""
+        record_bytes("elevenlabs", "speech_to_text", "sent", int(response.request.headers.get("content-length") or 0))
+        record_bytes("elevenlabs", "speech_to_text", "received", len(response.content))
 
-        finally:
-            if close_file:
-                file_data.close()
+        if "text" in result:
+            record_characters("elevenlabs", "speech_to_text", "received", len(result["text"]))
+            return result["text"]
+        else:
+            raise Exception(f"Transcription failed: {result}")
+
+    # -------------------------------------------------------------
+    # 🧩 Chunked mode
+    # -------------------------------------------------------------
+    def transcribe_chunked(self, audio, chunk_sec: float = None, max_workers: int = None, audio_hash: str = None) -> dict:
+        """
+        Split audio at low-energy points, transcribe the chunks concurrently
+        and stitch the text back together in order.
+        :param audio: AudioBuffer, file path or file-like object
+        :param chunk_sec: Max chunk length in seconds (defaults to self.chunk_sec)
+        :param max_workers: Concurrent uploads (defaults to self.max_workers)
+        :param audio_hash: Optional content hash of the original upload; enables the transcript cache
+        :return: {"text": str, "segments": [{"start": s, "end": s, "text": str}, ...]}
+        """
+        if audio_hash:
+            cached = self.cache.get_json(self._cache_key(audio_hash, "chunked"))
+            if cached is not None:
+                print("✅ Transcript cache hit.")
+                return cached
+
+        if not isinstance(audio, AudioBuffer):
+            audio = AudioBuffer.from_file(audio, sample_rate=16000, channels=1)
+
+        bounds = audio.split_on_silence(chunk_sec or self.chunk_sec)
+        print(f"🧩 Transcribing {len(bounds)} chunk(s) of {audio.duration:.1f}s audio...")
+
+        def work(item):
+            index, (start, end) = item
+            return self._transcribe_chunk(audio.crop(start, end), index)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers or self.max_workers, len(bounds))) as pool:
+            texts = list(pool.map(work, enumerate(bounds)))
+
+        segments = [
+            {"start": round(start, 3), "end": round(end, 3), "text": text.strip()}
+            for (start, end), text in zip(bounds, texts)
+        ]
+        transcript = {
+            "text": " ".join(seg["text"] for seg in segments if seg["text"]),
+            "segments": segments,
+        }
+        if audio_hash:
+            self.cache.set_json(self._cache_key(audio_hash, "chunked"), transcript)
+        return transcript
+
+    def _transcribe_chunk(self, chunk: AudioBuffer, index: int) -> str:
+        """Transcribe one chunk, retrying with exponential backoff."""
+        record_audio_seconds("elevenlabs", "speech_to_text", chunk.duration)
+        for attempt in range(1, self.retries + 1):
+            try:
+                return self._request(f"chunk_{index}.flac", chunk.to_file_like("FLAC"))
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                # Client errors other than rate limiting will not succeed on retry
+                if status is not None and 400 <= status < 500 and status != 429:
+                    raise
+                error = e
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            if attempt < self.retries:
+                delay = 2 ** (attempt - 1)
+                print(f"⚠️ Chunk {index} failed (attempt {attempt}/{self.retries}): {error}. Retrying in {delay}s...")
+                time.sleep(delay)
+
+        raise Exception(f"Transcription of chunk {index} failed after {self.retries} attempts: {error}")
+
+
+class AsyncSpeechToText(SpeechToText):
+    """Async counterpart of SpeechToText built on a shared httpx.AsyncClient."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.http = get_async_http_client()
+
+    async def transcribe(self, file, audio_hash: str = None) -> str:
+        """
+        Transcribe an audio file and return the text.
+        :param file: A file path (str), a file-like object or an AudioBuffer
+        :param audio_hash: Optional content hash of the original upload; enables the transcript cache
+        :return: Transcribed text
+        """
+        if audio_hash:
+            cached = await self.cache.aget_json(self._cache_key(audio_hash, "full"))
+            if cached is not None:
+                print("✅ Transcript cache hit.")
+                return cached["text"]
+
+        if isinstance(file, AudioBuffer):
+            record_audio_seconds("elevenlabs", "speech_to_text", file.duration)
+            data = await asyncio.to_thread(lambda: file.to_file_like("FLAC").read())
+            file_name = "audio.flac"
+        elif isinstance(file, str):
+            if not os.path.exists(file):
+                raise FileNotFoundError(f"Audio file not found: {file}")
+            file_name = os.path.basename(file)
+            data = await asyncio.to_thread(self._read_file, file)
+        elif hasattr(file, "read"):
+            file_name = getattr(file, "name", "uploaded_audio")
+            data = await asyncio.to_thread(file.read)
+        else:
+            raise TypeError("File must be a path string, a file-like object or an AudioBuffer.")
+
+        text = await self._request(file_name, data)
+        if audio_hash:
+            await self.cache.aset_json(self._cache_key(audio_hash, "full"), {"text": text})
+        return text
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    async def _request(self, file_name: str, file_data: bytes) -> str:
+        """Send one file to the Speech-to-Text API and return the text."""
+        with provider_call("elevenlabs", "speech_to_text"):
+            response = await self.http.post(
+                self.base_url,
+                headers={"xi-api-key": self.api_key},
+                data={"model_id": self.model_id, "file_format": "other"},
+                files={"file": (file_name, file_data)},
+            )
+            response.raise_for_status()
+            result = response.json()
+        return self._record_response(response, result)
+
+    async def transcribe_chunked(self, audio, chunk_sec: float = None, max_workers: int = None, audio_hash: str = None) -> dict:
+        """
+        Async chunked transcription: same splitting and stitching as
+        SpeechToText.transcribe_chunked, with chunk uploads bounded by a semaphore.
+        :return: {"text": str, "segments": [{"start": s, "end": s, "text": str}, ...]}
+        """
+        if audio_hash:
+            cached = await self.cache.aget_json(self._cache_key(audio_hash, "chunked"))
+            if cached is not None:
+                print("✅ Transcript cache hit.")
+                return cached
+
+        if not isinstance(audio, AudioBuffer):
+            audio = await asyncio.to_thread(AudioBuffer.from_file, audio, 16000, 1)
+
+        bounds = await asyncio.to_thread(audio.split_on_silence, chunk_sec or self.chunk_sec)
+        print(f"🧩 Transcribing {len(bounds)} chunk(s) of {audio.duration:.1f}s audio...")
+
+        semaphore = asyncio.Semaphore(max_workers or self.max_workers)
+
+        async def work(index, start, end):
+            async with semaphore:
+                return await self._transcribe_chunk(audio.crop(start, end), index)
+
+        texts = await asyncio.gather(*(work(i, start, end) for i, (start, end) in enumerate(bounds)))
+
+        segments = [
+            {"start": round(start, 3), "end": round(end, 3), "text": text.strip()}
+            for (start, end), text in zip(bounds, texts)
+        ]
+        transcript = {
+            "text": " ".join(seg["text"] for seg in segments if seg["text"]),
+            "segments": segments,
+        }
+        if audio_hash:
+            await self.cache.aset_json(self._cache_key(audio_hash, "chunked"), transcript)
+        return transcript
+
+    async def _transcribe_chunk(self, chunk: AudioBuffer, index: int) -> str:
+        """Transcribe one chunk, retrying with exponential backoff."""
+        record_audio_seconds("elevenlabs", "speech_to_text", chunk.duration)
+        data = await asyncio.to_thread(lambda: chunk.to_file_like("FLAC").read())
+        for attempt in range(1, self.retries + 1):
+            try:
+                return await self._request(f"chunk_{index}.flac", data)
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                # Client errors other than rate limiting will not succeed on retry
+                if 400 <= status < 500 and status != 429:
+                    raise
+                error = e
+            except httpx.TransportError as e:
+                error = e
+
+            if attempt < self.retries:
+                delay = 2 ** (attempt - 1)
+                print(f"⚠️ Chunk {index} failed (attempt {attempt}/{self.retries}): {error}. Retrying in {delay}s...")
+                await asyncio.sleep(delay)
+
+        raise Exception(f"Transcription of chunk {index} failed after {self.retries} attempts: {error}")
+
+    async def transcribe_incremental(self, decoder, chunk_sec: float = None, max_workers: int = None) -> dict:
+        """
+        Transcribe audio while it is still being decoded.
+        Each silence-aligned chunk is uploaded as soon as the audio after it is
+        available, so the cut matches what `transcribe_chunked` would pick.
+        :param decoder: StreamingDecoder being fed with the upload
+        :return: {"text": str, "segments": [{"start": s, "end": s, "text": str}, ...]}
+        """
+        chunk_sec = chunk_sec or self.chunk_sec
+        semaphore = asyncio.Semaphore(max_workers or self.max_workers)
+
+        async def work(index, chunk):
+            async with semaphore:
+                return await self._transcribe_chunk(chunk, index)
+
+        bounds, tasks = [], []
+        start = 0.0
+        try:
+            while True:
+                available = await decoder.wait_for(start + chunk_sec + 1.0)
+                # Read together with the snapshot: decoding may end during the
+                # split below, and audio after `available` must not be dropped
+                finished = decoder.finished
+                pending = decoder.snapshot().crop(start, available)
+                cuts = await asyncio.to_thread(pending.split_on_silence, chunk_sec)
+                # While decoding continues the last cut is provisional
+                ready = cuts if finished else cuts[:-1]
+                for lo, hi in ready:
+                    if hi - lo <= 0:
+                        continue
+                    bounds.append((start + lo, start + hi))
+                    tasks.append(asyncio.ensure_future(work(len(tasks), pending.crop(lo, hi))))
+                    print(f"🧩 Chunk {len(tasks) - 1} ({start + lo:.1f}s-{start + hi:.1f}s) queued for transcription.")
+                if finished:
+                    break
+                start += ready[-1][1] if ready else 0.0
+            texts = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        segments = [
+            {"start": round(lo, 3), "end": round(hi, 3), "text": text.strip()}
+            for (lo, hi), text in zip(bounds, texts)
+        ]
+        transcript = {
+            "text": " ".join(seg["text"] for seg in segments if seg["text"]),
+            "segments": segments,
+        }
+        # Repeat uploads through the buffered endpoints reuse this transcript
+        await self.cache.aset_json(self._cache_key(decoder.sha256, "chunked"), transcript)
+        return transcript
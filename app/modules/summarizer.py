@@ -1,25 +1,102 @@
 # module/text_summarizer.py
 import os
-from dotenv import load_dotenv
-from openai import OpenAI
+import re
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from .config import load_config
+from .cache import DiskCache
+from .clients import get_openai_client, get_async_openai_client
+from .metrics import provider_call, record_characters, record_tokens
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to a character-based estimate
+    tiktoken = None
 
 # Load environment variables
-load_dotenv()
+load_config()
+
+NARRATIVE_PROMPT = """
+            You are given a full transcript generated from a podcast speaker’s voice. 
+            Your task is to transform this transcript into a shorter 5–10 minute narrative script while preserving the speaker’s natural tone, intent, and style.
+
+            Follow these rules:
+
+            1. Treat the input as the speaker’s own words. Keep the speaker’s original sentences and phrasing wherever possible.
+            2. Remove unnecessary parts: filler words, repetition, long pauses, unrelated tangents, and any low-value conversations.
+            3. Maintain the speaker’s flow and personality. It should feel like the speaker is still talking.
+            4. When presenting important statements or ideas, introduce them naturally with:
+            “The speaker said…” or “The speaker explained…”
+            5. You may create short connecting lines between sections to ensure smooth flow, but they must sound natural and should never mention that they are added or generated.
+            6. Do NOT produce a high-level summary. Instead, create a shorter narrative version of the actual content, preserving real wording and real meaning.
+            7. Do NOT add new ideas, interpretations, or commentary that were not in the transcript.
+            8. The final result should be a clean, continuous script suitable for text-to-speech voice generation.
+
+            Here is the transcript to refine:
+
+            {input_text}
+
+            Now produce the refined narrative script.
+
+        """
+
+REDUCE_PROMPT = """
+            You are given consecutive parts of a narrative script, each refined from one section of the same podcast transcript.
+            Join them into one continuous 5–10 minute narrative script.
+
+            Follow these rules:
+
+            1. Keep the parts in their original order and keep the speaker’s wording wherever possible.
+            2. Remove repetition between parts and smooth the transitions so it reads as one script.
+            3. Keep introducing important statements naturally with “The speaker said…” or “The speaker explained…”.
+            4. Do NOT add new ideas, interpretations, or commentary.
+            5. The final result should be a clean, continuous script suitable for text-to-speech voice generation.
+
+            Here are the script parts:
+
+            {input_text}
+
+            Now produce the final narrative script.
+
+        """
+
+# Changes whenever a prompt template is edited, invalidating cached summaries
+PROMPT_VERSION = hashlib.sha256((NARRATIVE_PROMPT + REDUCE_PROMPT).encode("utf-8")).hexdigest()[:12]
+
 
 class Summarizer:
     """Summarize input text using OpenAI GPT models."""
 
-    def __init__(self, api_key: str = None, model: str = "gpt-4-turbo"):
+    def __init__(
+        self,
+        api_key: str = None,
+        model: str = "gpt-4-turbo",
+        chunk_tokens: int = None,
+        max_workers: int = None,
+        cache: DiskCache = None,
+    ):
         """
         Initialize the summarizer.
         :param api_key: OpenAI API key (optional, falls back to .env)
         :param model: OpenAI model to use
+        :param chunk_tokens: Transcript tokens per map chunk (falls back to SUMMARY_CHUNK_TOKENS, default 6000)
+        :param max_workers: Concurrent map requests (falls back to SUMMARY_MAX_WORKERS, default 4)
+        :param cache: Summary cache (falls back to SUMMARY_CACHE_DIR / SUMMARY_CACHE_MAX_MB / SUMMARY_CACHE_TTL_SEC)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("❌ OpenAI API key not found in environment or provided.")
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_openai_client(self.api_key)
         self.model = model
+        self.chunk_tokens = chunk_tokens or int(os.getenv("SUMMARY_CHUNK_TOKENS", "6000"))
+        self.max_workers = max_workers or int(os.getenv("SUMMARY_MAX_WORKERS", "4"))
+        self._encoding = self._load_encoding(model)
+        self.cache = cache or DiskCache(
+            os.getenv("SUMMARY_CACHE_DIR", "file/cache/summaries"),
+            max_bytes=int(os.getenv("SUMMARY_CACHE_MAX_MB", "64")) * 1024 * 1024,
+            ttl_sec=float(os.getenv("SUMMARY_CACHE_TTL_SEC", str(7 * 24 * 3600))),
+        )
 
     def summarize(self, input_text: str, max_tokens: int = 500, temperature: float = 1.0) -> str:
         """
@@ -29,37 +106,218 @@ class Summarizer:
         :param temperature: Creativity level for the summary.
         :return: Summarized text
         """
-        prompt = (
-            f"""
-            You are given a full transcript generated from a podcast speaker’s voice. 
-            Your task is to transform this transcript into a shorter 5–10 minute narrative script while preserving the speaker’s natural tone, intent, and style.
+        key = self._cache_key("single", input_text, max_tokens, temperature)
+        cached = self.cache.get_json(key)
+        if cached is not None:
+            print("✅ Summary cache hit.")
+            return cached["summary"]
 
-            Follow these rules:
+        prompt = NARRATIVE_PROMPT.format(input_text=input_text)
+        summary = self._complete(prompt, max_tokens, temperature)
+        self.cache.set_json(key, {"summary": summary})
+        return summary
 
-            1. Treat the input as the speaker’s own words. Keep the speaker’s original sentences and phrasing wherever possible.
-            2. Remove unnecessary parts: filler words, repetition, long pauses, unrelated tangents, and any low-value conversations.
-            3. Maintain the speaker’s flow and personality. It should feel like the speaker is still talking.
-            4. When presenting important statements or ideas, introduce them naturally with:
-            “The speaker said…” or “The speaker explained…”
-            5. You may create short connecting lines between sections to ensure smooth flow, but they must sound natural and should never mention that they are added or generated.
-            6. Do NOT produce a high-level summary. Instead, create a shorter narrative version of the actual content, preserving real wording and real meaning.
-            7. Do NOT add new ideas, interpretations, or commentary that were not in the transcript.
-            8. The final result should be a clean, continuous script suitable for text-to-speech voice generation.
+    def _cache_key(self, mode: str, input_text: str, max_tokens: int, temperature: float, *extra) -> str:
+        """Key on transcript hash, model, prompt version and generation parameters."""
+        text_hash = hashlib.sha256(input_text.encode("utf-8")).hexdigest()
+        return DiskCache.make_key(
+            "summary", mode, text_hash, self.model, PROMPT_VERSION, max_tokens, temperature, *extra
+        )
 
-            Here is the transcript to refine:
+    def _complete(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        """Run one chat completion and return the stripped text."""
+        with provider_call("openai", "chat_completion"):
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        return self._record_completion(prompt, response)
 
-            {input_text}
+    @staticmethod
+    def _record_completion(prompt: str, response) -> str:
+        """Record characters and token usage of a completion and return its stripped text."""
+        text = response.choices[0].message.content.strip()
+        record_characters("openai", "chat_completion", "sent", len(prompt))
+        record_characters("openai", "chat_completion", "received", len(text))
+        record_tokens("openai", "chat_completion", getattr(response, "usage", None))
+        return text
 
-            Now produce the refined narrative script.
+    # -------------------------------------------------------------
+    # 🧮 Token helpers
+    # -------------------------------------------------------------
+    @staticmethod
+    def _load_encoding(model: str):
+        if tiktoken is None:
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(self, text: str) -> int:
+        """Token count for the configured model (≈4 chars/token without tiktoken)."""
+        if self._encoding is None:
+            return (len(text) + 3) // 4
+        return len(self._encoding.encode(text))
 
+    def split_by_tokens(self, text: str, chunk_tokens: int = None) -> list:
         """
-        )
+        Split text into chunks of at most `chunk_tokens` tokens,
+        breaking at paragraph / sentence boundaries.
+        """
+        limit = chunk_tokens or self.chunk_tokens
+        sentences = [s for s in re.split(r"(?<=[.!?])\s+|\n{2,}", text) if s.strip()]
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens,
-            temperature=temperature,
-        )
+        chunks, current, current_tokens = [], [], 0
+        for sentence in sentences:
+            tokens = self.count_tokens(sentence)
+            if current and current_tokens + tokens > limit:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(sentence.strip())
+            current_tokens += tokens
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    # -------------------------------------------------------------
+    # 🧩 Map-reduce mode
+    # -------------------------------------------------------------
+    def summarize_map_reduce(
+        self,
+        input_text: str,
+        max_tokens: int = 500,
+        temperature: float = 1.0,
+        chunk_tokens: int = None,
+        map_max_tokens: int = None,
+        max_workers: int = None,
+    ) -> str:
+        """
+        Summarize long transcripts: refine token-bounded chunks in parallel
+        with the narrative prompt, then join them in a final reduce pass.
+        Short transcripts fall back to a single `summarize` call.
+        :param max_tokens: Output token budget of the final script
+        :param chunk_tokens: Transcript tokens per chunk (defaults to self.chunk_tokens)
+        :param map_max_tokens: Output tokens per chunk (defaults to max_tokens)
+        :param max_workers: Concurrent map requests (defaults to self.max_workers)
+        :return: Summarized text
+        """
+        chunk_tokens = chunk_tokens or self.chunk_tokens
+        if self.count_tokens(input_text) <= chunk_tokens:
+            return self.summarize(input_text, max_tokens=max_tokens, temperature=temperature)
+
+        key = self._cache_key("map_reduce", input_text, max_tokens, temperature, chunk_tokens, map_max_tokens)
+        cached = self.cache.get_json(key)
+        if cached is not None:
+            print("✅ Summary cache hit.")
+            return cached["summary"]
+
+        parts = self.split_by_tokens(input_text, chunk_tokens)
+        print(f"🧩 Summarizing {len(parts)} transcript chunk(s) in parallel...")
+
+        def refine(chunk):
+            return self.summarize(chunk, max_tokens=map_max_tokens or max_tokens, temperature=temperature)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers or self.max_workers, len(parts))) as pool:
+            partials = list(pool.map(refine, parts))
+
+        # Collapse again if the partial scripts are still too long for one reduce prompt
+        combined = "\n\n".join(partials)
+        combined_tokens = self.count_tokens(combined)
+
+        if combined_tokens > chunk_tokens and len(partials) > 1 and combined_tokens < self.count_tokens(input_text):
+            summary = self.summarize_map_reduce(
+                combined, max_tokens, temperature, chunk_tokens, map_max_tokens, max_workers
+            )
+        else:
+            prompt = REDUCE_PROMPT.format(input_text=combined)
+            summary = self._complete(prompt, max_tokens, temperature)
+
+        self.cache.set_json(key, {"summary": summary})
+        return summary
+
+
+class AsyncSummarizer(Summarizer):
+    """Async counterpart of Summarizer built on the shared AsyncOpenAI client."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = get_async_openai_client(self.api_key)
+
+    async def summarize(self, input_text: str, max_tokens: int = 500, temperature: float = 1.0) -> str:
+        """
+        Summarize input text.
+        :return: Summarized text
+        """
+        key = self._cache_key("single", input_text, max_tokens, temperature)
+        cached = await self.cache.aget_json(key)
+        if cached is not None:
+            print("✅ Summary cache hit.")
+            return cached["summary"]
+
+        prompt = NARRATIVE_PROMPT.format(input_text=input_text)
+        summary = await self._complete(prompt, max_tokens, temperature)
+        await self.cache.aset_json(key, {"summary": summary})
+        return summary
+
+    async def _complete(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        """Run one chat completion and return the stripped text."""
+        with provider_call("openai", "chat_completion"):
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        return self._record_completion(prompt, response)
+
+    async def summarize_map_reduce(
+        self,
+        input_text: str,
+        max_tokens: int = 500,
+        temperature: float = 1.0,
+        chunk_tokens: int = None,
+        map_max_tokens: int = None,
+        max_workers: int = None,
+    ) -> str:
+        """
+        Async map-reduce summarization; see Summarizer.summarize_map_reduce.
+        :return: Summarized text
+        """
+        chunk_tokens = chunk_tokens or self.chunk_tokens
+        if self.count_tokens(input_text) <= chunk_tokens:
+            return await self.summarize(input_text, max_tokens=max_tokens, temperature=temperature)
+
+        key = self._cache_key("map_reduce", input_text, max_tokens, temperature, chunk_tokens, map_max_tokens)
+        cached = await self.cache.aget_json(key)
+        if cached is not None:
+            print("✅ Summary cache hit.")
+            return cached["summary"]
+
+        parts = self.split_by_tokens(input_text, chunk_tokens)
+        print(f"🧩 Summarizing {len(parts)} transcript chunk(s) in parallel...")
+
+        semaphore = asyncio.Semaphore(max_workers or self.max_workers)
+
+        async def refine(chunk):
+            async with semaphore:
+                return await self.summarize(chunk, max_tokens=map_max_tokens or max_tokens, temperature=temperature)
+
+        partials = await asyncio.gather(*(refine(chunk) for chunk in parts))
+
+        # Collapse again if the partial scripts are still too long for one reduce prompt
+        combined = "\n\n".join(partials)
+        combined_tokens = self.count_tokens(combined)
+
+        if combined_tokens > chunk_tokens and len(partials) > 1 and combined_tokens < self.count_tokens(input_text):
+            summary = await self.summarize_map_reduce(
+                combined, max_tokens, temperature, chunk_tokens, map_max_tokens, max_workers
+            )
+        else:
+            prompt = REDUCE_PROMPT.format(input_text=combined)
+            summary = await self._complete(prompt, max_tokens, temperature)
 
-        return response.choices[0].message.content.strip()
+        await self.cache.aset_json(key, {"summary": summary})
+        return summary
@@ -0,0 +1,312 @@
+# module/transcoder.py
+import os
+import json
+import shutil
+import threading
+import subprocess
+import numpy as np
+from .config import load_config
+
+# Load environment variables
+load_config()
+
+# ffmpeg diagnostics kept for error messages
+STDERR_TAIL_BYTES = 16 * 1024
+
+
+def keep_stderr_tail(tail: bytearray, chunk: bytes):
+    """Append a chunk of ffmpeg's stderr, keeping only its last STDERR_TAIL_BYTES."""
+    tail += chunk
+    del tail[:-STDERR_TAIL_BYTES]
+
+
+def stderr_error(tail: bytearray, code: int) -> str:
+    """The line of ffmpeg's diagnostics that explains a failure (its last one)."""
+    lines = bytes(tail).decode("utf-8", "replace").strip().splitlines()
+    return lines[-1] if lines else f"exit code {code}"
+
+
+class Transcoder:
+    """
+    🔁 Streaming transcode / resample layer on top of an ffmpeg subprocess.
+    - `stream_pcm` yields fixed-size int16 PCM blocks, already downmixed and
+      resampled by ffmpeg, so memory stays constant whatever the input length.
+    - `transcode` converts file to file without any PCM passing through Python.
+    - `encode_pcm` pipes samples held in memory into an encoder.
+    File-like and bytes-like inputs are fed to ffmpeg's stdin from a background thread.
+
+    Env:
+      FFMPEG_PATH / FFPROBE_PATH   binaries (default: from PATH)
+      TRANSCODE_BLOCK_FRAMES       frames per yielded block (default 65536)
+    """
+
+    def __init__(self, block_frames: int = None, feed_chunk: int = 1024 * 1024):
+        """
+        :param block_frames: Frames per PCM block yielded by stream_pcm
+        :param feed_chunk: Bytes written to ffmpeg's stdin per step for file-like input
+        """
+        self.ffmpeg = os.getenv("FFMPEG_PATH") or "ffmpeg"
+        self.ffprobe = os.getenv("FFPROBE_PATH") or shutil.which("ffprobe") or "ffprobe"
+        self.block_frames = block_frames or int(os.getenv("TRANSCODE_BLOCK_FRAMES", "65536"))
+        self.feed_chunk = feed_chunk
+
+    # -------------------------------------------------------------
+    # 🔧 Process helpers
+    # -------------------------------------------------------------
+    @staticmethod
+    def _input(src):
+        """Return (ffmpeg input argument, file-like or memoryview to feed, or None)."""
+        if isinstance(src, (str, os.PathLike)):
+            src = os.fspath(src)
+            if not os.path.exists(src):
+                raise FileNotFoundError(f"Audio file not found: {src}")
+            return src, None
+        if isinstance(src, (bytes, bytearray, memoryview)):
+            return "pipe:0", memoryview(src)
+        if hasattr(src, "read"):
+            if hasattr(src, "seek"):
+                src.seek(0)
+            return "pipe:0", src
+        raise TypeError("src must be a file path or file-like object")
+
+    def _start(self, command: list, feed):
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE if feed is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._watch_stderr(process)
+        feeder = None
+        if feed is not None:
+            feeder = threading.Thread(target=self._feed, args=(feed, process.stdin), daemon=True)
+            feeder.start()
+        return process, feeder
+
+    def _feed(self, src, stdin):
+        try:
+            if isinstance(src, memoryview):
+                for start in range(0, src.nbytes, self.feed_chunk):
+                    stdin.write(src[start:start + self.feed_chunk])
+                return
+            while True:
+                chunk = src.read(self.feed_chunk)
+                if not chunk:
+                    break
+                stdin.write(chunk)
+        except (BrokenPipeError, ValueError, OSError):
+            pass  # ffmpeg stopped reading (finished early, killed or failed)
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _watch_stderr(process):
+        """
+        Drain stderr on a background thread, keeping only its last STDERR_TAIL_BYTES.
+        Reading it only after stdout ends would deadlock once ffmpeg fills the pipe.
+        """
+        process.stderr_tail = bytearray()
+
+        def drain():
+            try:
+                while True:
+                    chunk = process.stderr.read1(64 * 1024)
+                    if not chunk:
+                        break
+                    keep_stderr_tail(process.stderr_tail, chunk)
+            except (ValueError, OSError):
+                pass  # pipe closed by _stop
+
+        process.stderr_drain = threading.Thread(target=drain, daemon=True)
+        process.stderr_drain.start()
+
+    @staticmethod
+    def _finish(process, feeder):
+        if feeder is not None:
+            feeder.join()
+        code = process.wait()
+        process.stderr_drain.join()
+        if code != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr_error(process.stderr_tail, code)}")
+
+    @staticmethod
+    def _stop(process, feeder):
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        process.stderr_drain.join()
+        for pipe in (process.stdout, process.stderr):
+            if pipe:
+                pipe.close()
+        if feeder is not None:
+            feeder.join()
+
+    # -------------------------------------------------------------
+    # 🔎 Probe
+    # -------------------------------------------------------------
+    def probe(self, src) -> dict:
+        """
+        Sample rate, channel count and duration of the first audio stream.
+        :param src: File path
+        :return: {"sample_rate": int, "channels": int, "duration": float or None}
+        """
+        result = subprocess.run(
+            [
+                self.ffprobe, "-v", "error", "-select_streams", "a:0",
+                "-show_entries", "stream=sample_rate,channels:format=duration",
+                "-of", "json", os.fspath(src),
+            ],
+            capture_output=True,
+            check=True,
+        )
+        info = json.loads(result.stdout or b"{}")
+        stream = (info.get("streams") or [{}])[0]
+        duration = info.get("format", {}).get("duration")
+        return {
+            "sample_rate": int(stream.get("sample_rate", 44100)),
+            "channels": int(stream.get("channels", 2)),
+            "duration": float(duration) if duration else None,
+        }
+
+    # -------------------------------------------------------------
+    # 🌊 Streaming decode
+    # -------------------------------------------------------------
+    def stream_pcm(
+        self,
+        src,
+        sample_rate: int,
+        channels: int,
+        block_frames: int = None,
+        start_sec: float = None,
+        duration_sec: float = None,
+    ):
+        """
+        Decode, downmix and resample in ffmpeg and yield int16 blocks.
+        Closing the generator early stops ffmpeg.
+        :param src: File path or file-like object
+        :param sample_rate: Output sample rate in Hz
+        :param channels: Output channel count
+        :param block_frames: Frames per block (the last block may be shorter)
+        :param start_sec: Optional input seek; for files ffmpeg jumps there instead of decoding up to it
+        :param duration_sec: Optional length limit of the decoded audio
+        :return: Generator of int16 arrays of shape (frames, channels)
+        """
+        input_arg, feed = self._input(src)
+        command = [self.ffmpeg, "-hide_banner", "-loglevel", "error"]
+        if start_sec:
+            command += ["-ss", f"{start_sec:.6f}"]
+        command += ["-i", input_arg]
+        if duration_sec is not None:
+            command += ["-t", f"{duration_sec:.6f}"]
+        command += [
+            "-vn", "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ac", str(channels), "-ar", str(sample_rate),
+            "pipe:1",
+        ]
+        block_bytes = (block_frames or self.block_frames) * channels * 2
+        process, feeder = self._start(command, feed)
+        try:
+            while True:
+                data = process.stdout.read(block_bytes)
+                if not data:
+                    break
+                usable = len(data) - len(data) % (channels * 2)
+                if usable:
+                    yield np.frombuffer(data[:usable], dtype=np.int16).reshape(-1, channels)
+            self._finish(process, feeder)
+        finally:
+            self._stop(process, feeder)
+
+    def decode(self, src, sample_rate: int, channels: int) -> np.ndarray:
+        """
+        Decode a whole input at the target format. Only the output array is
+        held in memory (no full-rate intermediate copy).
+        :return: int16 array of shape (frames, channels)
+        """
+        samples = np.empty((sample_rate * 60, channels), dtype=np.int16)  # grows by doubling
+        frames = 0
+        for block in self.stream_pcm(src, sample_rate, channels):
+            needed = frames + len(block)
+            if needed > len(samples):
+                grown = np.empty((max(needed, 2 * len(samples)), channels), dtype=np.int16)
+                grown[:frames] = samples[:frames]
+                samples = grown
+            samples[frames:needed] = block
+            frames = needed
+        return samples[:frames]
+
+    # -------------------------------------------------------------
+    # 💾 Encoding
+    # -------------------------------------------------------------
+    def transcode(self, src, dst_path: str, format: str, sample_rate: int = None, channels: int = None, extra_args: list = None) -> str:
+        """
+        Convert an input straight to an output file inside ffmpeg.
+        :param format: ffmpeg output format (wav, mp3, mp4, ogg, flac, ...)
+        :return: dst_path
+        """
+        input_arg, feed = self._input(src)
+        command = [self.ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-i", input_arg, "-vn"]
+        if channels:
+            command += ["-ac", str(channels)]
+        if sample_rate:
+            command += ["-ar", str(sample_rate)]
+        if format == "wav":
+            command += ["-acodec", "pcm_s16le"]
+        command += [*(extra_args or []), "-f", format, dst_path]
+
+        process, feeder = self._start(command, feed)
+        try:
+            self._finish(process, feeder)
+        finally:
+            self._stop(process, feeder)
+        return dst_path
+
+    def encode_pcm(self, samples: np.ndarray, sample_rate: int, dst, format: str, extra_args: list = None):
+        """
+        Encode int16 (frames, channels) samples with ffmpeg, streaming them
+        through stdin block by block.
+        :param dst: Output path or writable file-like object
+        """
+        channels = samples.shape[1] if samples.ndim > 1 else 1
+        to_file = isinstance(dst, (str, os.PathLike))
+        command = [
+            self.ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+            *(extra_args or []), "-f", format, os.fspath(dst) if to_file else "pipe:1",
+        ]
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL if to_file else subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._watch_stderr(process)
+
+        def write():
+            try:
+                for first in range(0, len(samples), self.block_frames):
+                    process.stdin.write(np.ascontiguousarray(samples[first:first + self.block_frames]).tobytes())
+            except (BrokenPipeError, OSError):
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+
+        writer = threading.Thread(target=write, daemon=True)
+        writer.start()
+        try:
+            if not to_file:
+                while True:
+                    data = process.stdout.read(self.feed_chunk)
+                    if not data:
+                        break
+                    dst.write(data)
+            self._finish(process, writer)
+        finally:
+            self._stop(process, writer)
+        return dst
@@ -61,27 +61,68 @@
 
 # module/text_to_speech.py
 import os
-from dotenv import load_dotenv
-from elevenlabs import ElevenLabs
+import re
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .config import load_config
 from elevenlabs.core import ApiError
+from .cache import DiskCache
+from .clients import get_elevenlabs_client, get_async_elevenlabs_client
+from .metrics import provider_call, record_bytes, record_characters
+from .voice_clone import VOICE_INDEX
 
 # Load environment variables
-load_dotenv()
+load_config()
 
 class TextToSpeech:
     """Generate speech from text using ElevenLabs API and optionally delete the voice afterwards."""
 
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        segment_chars: int = None,
+        max_workers: int = None,
+        retries: int = None,
+        cache: DiskCache = None,
+    ):
         """
         Initialize the ElevenLabs client.
         :param api_key: ElevenLabs API key (optional, falls back to .env)
+        :param segment_chars: Max characters per batched segment (falls back to TTS_SEGMENT_CHARS, default 2500)
+        :param max_workers: Concurrent segment requests (falls back to TTS_MAX_WORKERS, default 4)
+        :param retries: Attempts per segment (falls back to TTS_RETRIES, default 3)
+        :param cache: Segment audio cache (falls back to TTS_CACHE_DIR / TTS_CACHE_MAX_MB)
         """
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         if not self.api_key:
             raise ValueError("ELEVENLABS_API_KEY not found in environment or provided.")
         
-        # Correct client initialization (official SDK uses `api_key` directly)
-        self.client = ElevenLabs(api_key=self.api_key)
+        # Shared, pooled client (official SDK uses `api_key` directly)
+        self.client = get_elevenlabs_client(self.api_key)
+        self.segment_chars = min(
+            segment_chars or int(os.getenv("TTS_SEGMENT_CHARS", "2500")),
+            self.MODEL_CHAR_LIMIT,
+        )
+        self.max_workers = max_workers or int(os.getenv("TTS_MAX_WORKERS", "4"))
+        self.retries = retries or int(os.getenv("TTS_RETRIES", "3"))
+        self.cache = cache or DiskCache(
+            os.getenv("TTS_CACHE_DIR", "file/cache/speech"),
+            max_bytes=int(os.getenv("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024,
+        )
+
+    # Fixed synthesis settings: same text + voice always gives equivalent audio
+    MODEL_ID = "eleven_multilingual_v2"
+    OUTPUT_FORMAT = "mp3_44100_128"
+    MODEL_CHAR_LIMIT = 10000
+    VOICE_SETTINGS = {
+        "stability": 0.5,
+        "similarity_boost": 0.9,
+        "style": 1.0,
+        "speed": 0.75,
+        "use_speaker_boost": True
+    }
 
     def text_to_speech(
         self,
@@ -98,39 +139,338 @@ class TextToSpeech:
         :param delete_after_use: If True, deletes the voice from ElevenLabs after generating audio
         :return: Audio bytes (MP3 format)
         """
+        # Combine streamed chunks
+        audio_bytes = b"".join(self.stream(text, voice_id))
+        print(f"Speech generation complete. Audio length: {len(audio_bytes)} bytes")
+
+        # Optionally delete the voice right after use
+        if delete_after_use:
+            self.delete_voice(voice_id)
+            print(f"Voice {voice_id} deleted successfully.")
+
+        return audio_bytes
+
+    def stream(self, text: str, voice_id: str):
+        """
+        Convert text to speech and yield MP3 chunks as they arrive from ElevenLabs.
+
+        :param text: Text to convert
+        :param voice_id: Voice ID to use
+        :return: Generator of audio byte chunks (MP3 format)
+        """
         if not voice_id:
             raise ValueError("voice_id must be provided.")
         if not text:
             raise ValueError("text cannot be empty.")
 
         print(f"Generating speech using voice: {voice_id}...")
+        return self._stream(text, voice_id)
 
+    def _stream(self, text: str, voice_id: str, previous_text: str = None, next_text: str = None):
         try:
-            # Generate speech
-            response_stream = self.client.text_to_speech.convert(
+            # Streaming endpoint: audio is returned while it is being generated
+            record_characters("elevenlabs", "text_to_speech_stream", "sent", len(text))
+            response_stream = self.client.text_to_speech.stream(
                 voice_id=voice_id,
-                model_id="eleven_multilingual_v2",
+                model_id=self.MODEL_ID,
                 text=text,
-                output_format="mp3_44100_128",
-                voice_settings={
-                    "stability": 0.5,
-                    "similarity_boost": 0.9,
-                    "style": 1.0,
-                    "speed": 0.75,
-                    "use_speaker_boost": True
-                }
+                output_format=self.OUTPUT_FORMAT,
+                voice_settings=self.VOICE_SETTINGS,
+                previous_text=previous_text,
+                next_text=next_text,
             )
+            with provider_call("elevenlabs", "text_to_speech_stream"):
+                for chunk in response_stream:
+                    if chunk:
+                        record_bytes("elevenlabs", "text_to_speech_stream", "received", len(chunk))
+                        yield chunk
+
+        except ApiError as e:
+            if e.status_code == 403 and "detected_captcha_voice" in str(e):
+                print("Voice is blocked by ElevenLabs (captcha/protected voice). Cannot generate or delete.")
+            else:
+                print(f"ElevenLabs API Error: {e}")
+            raise
+
+    # -------------------------------------------------------------
+    # 🧩 Sentence-batched parallel synthesis
+    # -------------------------------------------------------------
+    @staticmethod
+    def split_text(text: str, max_chars: int) -> list:
+        """
+        Split text into segments of at most `max_chars`, packing whole sentences
+        and keeping paragraph breaks (words are split only as a last resort).
+        """
+        segments, current = [], ""
+        for paragraph in re.split(r"\n\s*\n", text.strip()):
+            sentences = []
+            for sentence in re.split(r"(?<=[.!?…])\s+", paragraph.strip()):
+                while len(sentence) > max_chars:
+                    cut = sentence.rfind(" ", 0, max_chars)
+                    cut = cut if cut > 0 else max_chars
+                    sentences.append(sentence[:cut].strip())
+                    sentence = sentence[cut:].strip()
+                if sentence:
+                    sentences.append(sentence)
+
+            for i, sentence in enumerate(sentences):
+                separator = ("\n\n" if i == 0 else " ") if current else ""
+                if current and len(current) + len(separator) + len(sentence) > max_chars:
+                    segments.append(current)
+                    current = sentence
+                else:
+                    current += separator + sentence
+        if current:
+            segments.append(current)
+        return segments
+
+    def synthesize_segment(self, text: str, voice_id: str, previous_text: str = None, next_text: str = None) -> bytes:
+        """
+        Synthesize one segment with the shared voice settings, retrying on failure.
+        Neighbouring text is passed along so prosody stays continuous across segments.
+        Segments already in the cache are returned without an API call.
+        """
+        key = self._cache_key(text, voice_id, previous_text, next_text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        audio_bytes = self._synthesize_with_retry(text, voice_id, previous_text, next_text)
+        self.cache.set(key, audio_bytes)
+        return audio_bytes
+
+    def _cache_key(self, text: str, voice_id: str, previous_text: str = None, next_text: str = None) -> str:
+        """
+        Key on normalized text, voice, every fixed synthesis setting and the
+        neighbouring text (it conditions the prosody of the generated audio;
+        segments sent without neighbours get a text-only key, see `_neighbours`).
+        """
+        def normalize(value):
+            return " ".join(value.split()) if value else ""
+
+        return DiskCache.make_key(
+            "tts",
+            normalize(text),
+            normalize(previous_text),
+            normalize(next_text),
+            voice_id,
+            self.MODEL_ID,
+            self.OUTPUT_FORMAT,
+            json.dumps(self.VOICE_SETTINGS, sort_keys=True),
+        )
+
+    def _synthesize_with_retry(self, text: str, voice_id: str, previous_text: str, next_text: str) -> bytes:
+        for attempt in range(1, self.retries + 1):
+            try:
+                with provider_call("elevenlabs", "text_to_speech"):
+                    response_stream = self.client.text_to_speech.convert(
+                        voice_id=voice_id,
+                        model_id=self.MODEL_ID,
+                        text=text,
+                        output_format=self.OUTPUT_FORMAT,
+                        voice_settings=self.VOICE_SETTINGS,
+                        previous_text=previous_text,
+                        next_text=next_text,
+                    )
+                    audio_bytes = b"".join(chunk for chunk in response_stream if chunk)
+                record_characters("elevenlabs", "text_to_speech", "sent", len(text))
+                record_bytes("elevenlabs", "text_to_speech", "received", len(audio_bytes))
+                return audio_bytes
+            except ApiError as e:
+                # Client errors (bad voice, captcha, quota) will not succeed on retry
+                if e.status_code is not None and 400 <= e.status_code < 500 and e.status_code != 429:
+                    print(f"ElevenLabs API Error: {e}")
+                    raise
+                error = e
+            except Exception as e:
+                error = e
+
+            if attempt < self.retries:
+                delay = 2 ** (attempt - 1)
+                print(f"⚠️ TTS segment failed (attempt {attempt}/{self.retries}): {error}. Retrying in {delay}s...")
+                time.sleep(delay)
+
+        raise Exception(f"TTS segment failed after {self.retries} attempts: {error}")
+
+    def stream_batched(self, text: str, voice_id: str, max_workers: int = None):
+        """
+        Split text into segments, synthesize them concurrently and yield each
+        segment's MP3 bytes in order. MP3 frames concatenate cleanly, so the
+        joined output is one playable file.
+        :return: Generator of audio byte chunks (MP3 format)
+        """
+        if not voice_id:
+            raise ValueError("voice_id must be provided.")
+        if not text:
+            raise ValueError("text cannot be empty.")
+
+        segments = self.split_text(text, self.segment_chars)
+        print(f"Generating speech for {len(segments)} segment(s) using voice: {voice_id}...")
+        return self._stream_batched(segments, voice_id, max_workers or self.max_workers)
+
+    @staticmethod
+    def _neighbours(segments: list, index: int) -> dict:
+        """
+        previous_text / next_text of a segment, for prosody across segment boundaries.
+        The neighbours are part of the cache key, so a conditioned segment only
+        hits the cache when its neighbours repeat too (retries of the same text).
+        The first and last segments (intro / outro lines that recur across
+        summaries) are therefore sent without context: their key depends on
+        their own text only, at the cost of a less smooth join at that one boundary.
+        """
+        if index == 0 or index == len(segments) - 1:
+            return {"previous_text": None, "next_text": None}
+        return {"previous_text": segments[index - 1], "next_text": segments[index + 1]}
+
+    def _stream_batched(self, segments: list, voice_id: str, max_workers: int):
+        def work(index):
+            return self.synthesize_segment(segments[index], voice_id, **self._neighbours(segments, index))
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(segments))) as pool:
+            futures = [pool.submit(work, i) for i in range(len(segments))]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def stream_progressive(self, text: str, voice_id: str, max_workers: int = None):
+        """
+        Lowest time-to-first-audio for long text: the first segment is streamed
+        chunk by chunk as ElevenLabs generates it, while the remaining segments
+        are synthesized concurrently and yielded in order after it.
+        :return: Generator of audio byte chunks (MP3 format)
+        """
+        if not voice_id:
+            raise ValueError("voice_id must be provided.")
+        if not text:
+            raise ValueError("text cannot be empty.")
+
+        segments = self.split_text(text, self.segment_chars)
+        print(f"Streaming speech for {len(segments)} segment(s) using voice: {voice_id}...")
+        return self._stream_progressive(segments, voice_id, max_workers or self.max_workers)
+
+    def _stream_progressive(self, segments: list, voice_id: str, max_workers: int):
+        def work(index):
+            return self.synthesize_segment(segments[index], voice_id, **self._neighbours(segments, index))
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(segments) - 1)))
+        futures = [pool.submit(work, i) for i in range(1, len(segments))]
+        try:
+            yield from self._stream_first_segment(segments, voice_id)
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def _stream_first_segment(self, segments: list, voice_id: str):
+        """Yield the first segment from the cache, or stream it and cache it once complete."""
+        context = self._neighbours(segments, 0)
+        key = self._cache_key(segments[0], voice_id, **context)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self._stream(segments[0], voice_id, **context):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.set(key, b"".join(chunks))
+
+    def text_to_speech_batched(self, text: str, voice_id: str, max_workers: int = None) -> bytes:
+        """
+        Convert long text to speech with bounded-parallel segment synthesis.
+        :return: Audio bytes (MP3 format), segments reassembled in order
+        """
+        audio_bytes = b"".join(self.stream_batched(text, voice_id, max_workers))
+        print(f"Speech generation complete. Audio length: {len(audio_bytes)} bytes")
+        return audio_bytes
+
+    def delete_voice(self, voice_id: str) -> bool:
+        """
+        Permanently delete a voice from your ElevenLabs account.
+        :param voice_id: The voice ID to delete
+        :return: True if deleted, False if already gone or error
+        """
+        if not voice_id:
+            raise ValueError("voice_id is required to delete a voice.")
+
+        try:
+            print(f"Attempting to delete voice ID: {voice_id}...")
+            with provider_call("elevenlabs", "voice_delete"):
+                self.client.voices.delete(voice_id=voice_id)
+            print(f"Successfully deleted voice {voice_id}")
+            VOICE_INDEX.remove(voice_id)
+            return True
+        except ApiError as e:
+            if e.status_code == 404:
+                VOICE_INDEX.remove(voice_id)
+                print(f"Voice {voice_id} not found (already deleted or never existed).")
+            elif e.status_code == 403:
+                print(f"Forbidden: You don't have permission to delete voice {voice_id} (might be protected).")
+            else:
+                print(f"Failed to delete voice {voice_id}: {e}")
+            return False
+        except Exception as e:
+            print(f"Unexpected error while deleting voice {voice_id}: {e}")
+            return False
+
+
+class AsyncTextToSpeech(TextToSpeech):
+    """Async counterpart of TextToSpeech built on the shared AsyncElevenLabs client."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = get_async_elevenlabs_client(self.api_key)
 
-            # Combine streamed chunks
-            audio_bytes = b"".join(chunk for chunk in response_stream if chunk)
-            print(f"Speech generation complete. Audio length: {len(audio_bytes)} bytes")
+    async def text_to_speech(self, text: str, voice_id: str, delete_after_use: bool = False) -> bytes:
+        """
+        Convert text to speech and return as bytes.
+        :return: Audio bytes (MP3 format)
+        """
+        audio_bytes = b"".join([chunk async for chunk in self.stream(text, voice_id)])
+        print(f"Speech generation complete. Audio length: {len(audio_bytes)} bytes")
+
+        if delete_after_use:
+            await self.delete_voice(voice_id)
+            print(f"Voice {voice_id} deleted successfully.")
+
+        return audio_bytes
+
+    def stream(self, text: str, voice_id: str):
+        """
+        Convert text to speech and yield MP3 chunks as they arrive.
+        :return: Async generator of audio byte chunks (MP3 format)
+        """
+        if not voice_id:
+            raise ValueError("voice_id must be provided.")
+        if not text:
+            raise ValueError("text cannot be empty.")
 
-            # Optionally delete the voice right after use
-            if delete_after_use:
-                self.delete_voice(voice_id)
-                print(f"Voice {voice_id} deleted successfully.")
+        print(f"Generating speech using voice: {voice_id}...")
+        return self._stream(text, voice_id)
 
-            return audio_bytes
+    async def _stream(self, text: str, voice_id: str, previous_text: str = None, next_text: str = None):
+        try:
+            record_characters("elevenlabs", "text_to_speech_stream", "sent", len(text))
+            response_stream = self.client.text_to_speech.stream(
+                voice_id=voice_id,
+                model_id=self.MODEL_ID,
+                text=text,
+                output_format=self.OUTPUT_FORMAT,
+                voice_settings=self.VOICE_SETTINGS,
+                previous_text=previous_text,
+                next_text=next_text,
+            )
+            with provider_call("elevenlabs", "text_to_speech_stream"):
+                async for chunk in response_stream:
+                    if chunk:
+                        record_bytes("elevenlabs", "text_to_speech_stream", "received", len(chunk))
+                        yield chunk
 
         except ApiError as e:
             if e.status_code == 403 and "detected_captcha_voice" in str(e):
@@ -139,10 +479,137 @@ class TextToSpeech:
                 print(f"ElevenLabs API Error: {e}")
             raise
 
-    def delete_voice(self, voice_id: str) -> bool:
+    async def synthesize_segment(self, text: str, voice_id: str, previous_text: str = None, next_text: str = None) -> bytes:
+        """Synthesize one segment (served from the cache when possible), retrying on failure."""
+        key = self._cache_key(text, voice_id, previous_text, next_text)
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return cached
+
+        audio_bytes = await self._synthesize_with_retry(text, voice_id, previous_text, next_text)
+        await self.cache.aset(key, audio_bytes)
+        return audio_bytes
+
+    async def _synthesize_with_retry(self, text: str, voice_id: str, previous_text: str, next_text: str) -> bytes:
+        for attempt in range(1, self.retries + 1):
+            try:
+                with provider_call("elevenlabs", "text_to_speech"):
+                    response_stream = self.client.text_to_speech.convert(
+                        voice_id=voice_id,
+                        model_id=self.MODEL_ID,
+                        text=text,
+                        output_format=self.OUTPUT_FORMAT,
+                        voice_settings=self.VOICE_SETTINGS,
+                        previous_text=previous_text,
+                        next_text=next_text,
+                    )
+                    audio_bytes = b"".join([chunk async for chunk in response_stream if chunk])
+                record_characters("elevenlabs", "text_to_speech", "sent", len(text))
+                record_bytes("elevenlabs", "text_to_speech", "received", len(audio_bytes))
+                return audio_bytes
+            except ApiError as e:
+                # Client errors (bad voice, captcha, quota) will not succeed on retry
+                if e.status_code is not None and 400 <= e.status_code < 500 and e.status_code != 429:
+                    print(f"ElevenLabs API Error: {e}")
+                    raise
+                error = e
+            except Exception as e:
+                error = e
+
+            if attempt < self.retries:
+                delay = 2 ** (attempt - 1)
+                print(f"⚠️ TTS segment failed (attempt {attempt}/{self.retries}): {error}. Retrying in {delay}s...")
+                await asyncio.sleep(delay)
+
+        raise Exception(f"TTS segment failed after {self.retries} attempts: {error}")
+
+    def stream_batched(self, text: str, voice_id: str, max_workers: int = None):
+        """
+        Synthesize sentence batches concurrently and yield them in order.
+        :return: Async generator of audio byte chunks (MP3 format)
+        """
+        if not voice_id:
+            raise ValueError("voice_id must be provided.")
+        if not text:
+            raise ValueError("text cannot be empty.")
+
+        segments = self.split_text(text, self.segment_chars)
+        print(f"Generating speech for {len(segments)} segment(s) using voice: {voice_id}...")
+        return self._stream_batched(segments, voice_id, max_workers or self.max_workers)
+
+    async def _stream_batched(self, segments: list, voice_id: str, max_workers: int):
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def work(index):
+            async with semaphore:
+                return await self.synthesize_segment(segments[index], voice_id, **self._neighbours(segments, index))
+
+        tasks = [asyncio.ensure_future(work(i)) for i in range(len(segments))]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stream_progressive(self, text: str, voice_id: str, max_workers: int = None):
+        """
+        Stream the first segment chunk by chunk while the remaining segments
+        are synthesized concurrently, then yield those in order.
+        :return: Async generator of audio byte chunks (MP3 format)
+        """
+        if not voice_id:
+            raise ValueError("voice_id must be provided.")
+        if not text:
+            raise ValueError("text cannot be empty.")
+
+        segments = self.split_text(text, self.segment_chars)
+        print(f"Streaming speech for {len(segments)} segment(s) using voice: {voice_id}...")
+        return self._stream_progressive(segments, voice_id, max_workers or self.max_workers)
+
+    async def _stream_progressive(self, segments: list, voice_id: str, max_workers: int):
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def work(index):
+            async with semaphore:
+                return await self.synthesize_segment(segments[index], voice_id, **self._neighbours(segments, index))
+
+        tasks = [asyncio.ensure_future(work(i)) for i in range(1, len(segments))]
+        try:
+            async for chunk in self._stream_first_segment(segments, voice_id):
+                yield chunk
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _stream_first_segment(self, segments: list, voice_id: str):
+        context = self._neighbours(segments, 0)
+        key = self._cache_key(segments[0], voice_id, **context)
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        async for chunk in self._stream(segments[0], voice_id, **context):
+            chunks.append(chunk)
+            yield chunk
+        await self.cache.aset(key, b"".join(chunks))
+
+    async def text_to_speech_batched(self, text: str, voice_id: str, max_workers: int = None) -> bytes:
+        """
+        Convert long text to speech with bounded-parallel segment synthesis.
+        :return: Audio bytes (MP3 format), segments reassembled in order
+        """
+        audio_bytes = b"".join([chunk async for chunk in self.stream_batched(text, voice_id, max_workers)])
+        print(f"Speech generation complete. Audio length: {len(audio_bytes)} bytes")
+        return audio_bytes
+
+    async def delete_voice(self, voice_id: str) -> bool:
         """
         Permanently delete a voice from your ElevenLabs account.
-        :param voice_id: The voice ID to delete
         :return: True if deleted, False if already gone or error
         """
         if not voice_id:
@@ -150,11 +617,14 @@ class TextToSpeech:
 
         try:
             print(f"Attempting to delete voice ID: {voice_id}...")
-            self.client.voices.delete(voice_id=voice_id)
+            with provider_call("elevenlabs", "voice_delete"):
+                await self.client.voices.delete(voice_id=voice_id)
             print(f"Successfully deleted voice {voice_id}")
+            VOICE_INDEX.remove(voice_id)
             return True
         except ApiError as e:
             if e.status_code == 404:
+                VOICE_INDEX.remove(voice_id)
                 print(f"Voice {voice_id} not found (already deleted or never existed).")
             elif e.status_code == 403:
                 print(f"Forbidden: You don't have permission to delete voice {voice_id} (might be protected).")
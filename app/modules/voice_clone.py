@@ -1,10 +1,61 @@
 import os
+import time
+import asyncio
 import tempfile
-from io import BytesIO
-from dotenv import load_dotenv
-from elevenlabs.client import ElevenLabs
+import threading
+from .config import load_config
 from pydub import AudioSegment
 import soundfile as sf
+from .audio_buffer import AudioBuffer
+from .transcoder import Transcoder
+from .audio_analysis import AudioAnalyzer
+from .spooled_upload import SpooledUpload
+from .clients import get_elevenlabs_client, get_async_elevenlabs_client
+from .metrics import provider_call, record_bytes, record_audio_seconds
+
+class _VoiceIndex:
+    """
+    Lowercase voice name -> voice_id of the ElevenLabs account.
+    One instance is shared by every (a)sync VoiceCloner in the process, so a
+    create, delete or refresh through one of them is seen by all the others.
+    """
+
+    def __init__(self):
+        self._voices = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def replace(self, voices: dict):
+        with self._lock:
+            self._voices = dict(voices)
+            self._loaded_at = time.monotonic()
+
+    def is_stale(self, ttl: float) -> bool:
+        with self._lock:
+            return self._loaded_at is None or time.monotonic() - self._loaded_at > ttl
+
+    def get(self, name: str):
+        with self._lock:
+            return self._voices.get(name.lower())
+
+    def add(self, name: str, voice_id: str):
+        with self._lock:
+            self._voices[name.lower()] = voice_id
+
+    def remove(self, voice_id: str):
+        with self._lock:
+            for name, indexed_id in list(self._voices.items()):
+                if indexed_id == voice_id:
+                    del self._voices[name]
+
+    def invalidate(self):
+        """Force a reload from the account on the next lookup."""
+        with self._lock:
+            self._loaded_at = None
+
+
+VOICE_INDEX = _VoiceIndex()
+
 
 class VoiceCloner:
     """🎙️ Voice cloning utility using ElevenLabs API with auto-cropping."""
@@ -13,7 +64,7 @@ class VoiceCloner:
         """
         :param crop_duration_sec: Duration of the audio clip to use for cloning (default 30s)
         """
-        load_dotenv()
+        load_config()
 
         self.api_key = os.getenv("ELEVENLABS_API_KEY")
         if not self.api_key:
@@ -27,85 +78,186 @@ class VoiceCloner:
         if ffprobe_path:
             AudioSegment.ffprobe = ffprobe_path
 
-        # Initialize ElevenLabs client
-        self.client = ElevenLabs(api_key=self.api_key)
+        # Shared, pooled ElevenLabs client
+        self.client = get_elevenlabs_client(self.api_key)
         self.crop_duration_sec = crop_duration_sec
+        self.analyzer = AudioAnalyzer()
+
+        # Remote voice index, shared by every cloner in the process
+        self.voice_index_ttl = float(os.getenv("VOICE_INDEX_TTL_SEC", "300"))
+        self._voice_index = VOICE_INDEX
         print("🧬 VoiceCloner initialized successfully.")
 
     # -------------------------------------------------------------
     # 🔄 Convert to WAV (mono, 16kHz, PCM 16-bit)
     # -------------------------------------------------------------
     def convert_to_wav(self, input_path: str) -> str:
-        """Convert any audio format to .wav (mono, 16kHz, PCM 16-bit)."""
+        """Convert any audio format to .wav (mono, 16kHz, PCM 16-bit) inside ffmpeg."""
         output_path = tempfile.mktemp(suffix=".wav")
-        audio = AudioSegment.from_file(input_path)
-        audio = audio.set_channels(1).set_frame_rate(16000)
-        audio.export(output_path, format="wav", parameters=["-acodec", "pcm_s16le"])
-        return output_path
+        return Transcoder().transcode(input_path, output_path, format="wav", sample_rate=16000, channels=1)
 
     # -------------------------------------------------------------
     # 🧬 Process and clone voice (auto-crop)
     # -------------------------------------------------------------
-    def process_and_clone_voice(self, input_audio, clone_name: str) -> str:
+    def process_and_clone_voice(self, input_audio, clone_name: str, quality: dict = None) -> str:
         """
         Accepts:
         - Path string ("./file/audio.m4a")
         - File-like object (BytesIO, FastAPI UploadFile.file)
-        Crops the first `crop_duration_sec` seconds, converts to WAV, and clones the voice.
+        - SpooledUpload
+        - AudioBuffer (already decoded)
+        Decodes once in memory (mono, 16kHz, PCM 16-bit), rejects unusable
+        audio, picks the most speech-dense `crop_duration_sec` seconds,
+        encodes them as WAV and clones the voice. No temporary files are written.
+        :param quality: Report of an earlier AudioAnalyzer.check of this audio (skips the check)
         Returns: voice_id
         """
+        # ✅ Check existing voices first (skips decoding entirely)
+        existing_id = self._find_existing_voice(clone_name)
+        if existing_id:
+            return existing_id
+
+        return self._create_voice(clone_name, self._prepare_sample(input_audio, clone_name, quality))
+
+    def _prepare_sample(self, input_audio, clone_name: str, quality: dict = None):
+        """Decode, quality-check (unless already checked) and select the clone sample; raises AudioQualityError."""
+        audio = self._load_input(input_audio)
+        if quality is None:
+            self.analyzer.check(audio)
+        clip = self.analyzer.select_speech(audio, self.crop_duration_sec)
+        record_audio_seconds("elevenlabs", "voice_clone", clip.duration)
+        sample = clip.to_file_like("WAV", name=f"{clone_name}.wav")
+        record_bytes("elevenlabs", "voice_clone", "sent", sample.getbuffer().nbytes)
+        return sample
+
+    @staticmethod
+    def _load_input(input_audio) -> AudioBuffer:
+        """Decode any supported input into an AudioBuffer (mono, 16kHz)."""
+        if isinstance(input_audio, AudioBuffer):
+            return input_audio
+        if not isinstance(input_audio, (str, SpooledUpload)) and not hasattr(input_audio, "read"):
+            raise Exception("❌ Unsupported input type. Must be path string, file-like object, SpooledUpload or AudioBuffer.")
+        return AudioBuffer.from_file(input_audio, sample_rate=16000, channels=1)
 
-        # ✅ Prepare input file
-        if isinstance(input_audio, (BytesIO,)):
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-                tmp.write(input_audio.read())
-                input_audio_path = tmp.name
-        elif hasattr(input_audio, "read"):  # FastAPI UploadFile.file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-                tmp.write(input_audio.read())
-                input_audio_path = tmp.name
-        elif isinstance(input_audio, str):
-            input_audio_path = input_audio
-        else:
-            raise Exception("❌ Unsupported input type. Must be path string or file-like object.")
-
-        # ✅ Convert to WAV if not already
-        if not input_audio_path.lower().endswith(".wav"):
-            input_audio_path = self.convert_to_wav(input_audio_path)
-
-        # ✅ Load audio and crop
-        audio = AudioSegment.from_wav(input_audio_path)
-        crop_ms = min(len(audio), self.crop_duration_sec * 1000)
-        cropped_audio = audio[:crop_ms]
-
-        # ✅ Save cropped audio as WAV
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-            cropped_audio.export(tmp_file.name, format="wav")
-            final_path = tmp_file.name
-            print(f"✅ Cropped audio saved for cloning: {final_path}")
-
-        # ✅ Check existing voices
-        voices_response = self.client.voices.get_all()
+    # -------------------------------------------------------------
+    # 🔍 ElevenLabs helpers
+    # -------------------------------------------------------------
+    def _set_index(self, voices_response) -> dict:
+        """Replace the index with the voices of a get_all() response."""
         voice_list = getattr(voices_response, "voices", voices_response)
+        index = {
+            voice.name.lower(): voice.voice_id
+            for voice in voice_list
+            if getattr(voice, "name", None)
+        }
+        self._voice_index.replace(index)
+        print(f"🔄 Remote voice index refreshed: {len(index)} voice(s).")
+        return dict(index)
+
+    def _index_is_stale(self) -> bool:
+        return self._voice_index.is_stale(self.voice_index_ttl)
+
+    def _lookup(self, clone_name: str):
+        voice_id = self._voice_index.get(clone_name)
+        if voice_id:
+            print(f"✅ Voice '{clone_name}' already exists with ID: {voice_id}")
+        return voice_id
+
+    def _index_add(self, clone_name: str, voice_id: str):
+        self._voice_index.add(clone_name, voice_id)
 
-        for voice in voice_list:
-            if hasattr(voice, "name") and voice.name.lower() == clone_name.lower():
-                print(f"✅ Voice '{clone_name}' already exists with ID: {voice.voice_id}")
-                os.remove(final_path)
-                return voice.voice_id
+    def _index_remove(self, voice_id: str):
+        self._voice_index.remove(voice_id)
 
-        # ✅ Clone new voice
+    def refresh_voice_index(self) -> dict:
+        """Reload the name -> voice_id index from the ElevenLabs account."""
+        with provider_call("elevenlabs", "voice_list"):
+            voices = self.client.voices.get_all()
+        return self._set_index(voices)
+
+    def find_voice(self, clone_name: str):
+        """O(1) lookup of a remote voice by name (case-insensitive); refreshes the index when stale."""
+        if self._index_is_stale():
+            self.refresh_voice_index()
+        return self._voice_index.get(clone_name)
+
+    def _find_existing_voice(self, clone_name: str):
+        """Return the voice_id of an existing voice with this name, or None."""
+        if self._index_is_stale():
+            self.refresh_voice_index()
+        return self._lookup(clone_name)
+
+    def _create_voice(self, clone_name: str, sample) -> str:
+        """Upload one sample (file object) and create an instant voice clone."""
         print("🧬 Cloning new voice...")
-        with open(final_path, "rb") as f:
+        with provider_call("elevenlabs", "voice_clone"):
             voice = self.client.voices.ivc.create(
                 name=clone_name,
-                files=[f],
+                files=[sample],
             )
         print(f"✅ New voice cloned with ID: {voice.voice_id}")
+        self._index_add(clone_name, voice.voice_id)
+        return voice.voice_id
+
+    def delete_voice(self, voice_id: str):
+        """Delete a voice from ElevenLabs and drop it from the remote voice index."""
+        with provider_call("elevenlabs", "voice_delete"):
+            self.client.voices.delete(voice_id=voice_id)
+        self._index_remove(voice_id)
+
+
+class AsyncVoiceCloner(VoiceCloner):
+    """Async counterpart of VoiceCloner built on the shared AsyncElevenLabs client."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = get_async_elevenlabs_client(self.api_key)
+
+    async def process_and_clone_voice(self, input_audio, clone_name: str, quality: dict = None) -> str:
+        """
+        Accepts a path, a file-like object, a SpooledUpload or an AudioBuffer.
+        Decoding, the quality check and sample selection run in a worker thread.
+        :param quality: Report of an earlier AudioAnalyzer.check of this audio (skips the check)
+        Returns: voice_id
+        """
+        existing_id = await self._find_existing_voice(clone_name)
+        if existing_id:
+            return existing_id
+
+        sample = await asyncio.to_thread(self._prepare_sample, input_audio, clone_name, quality)
+        return await self._create_voice(clone_name, sample)
+
+    async def refresh_voice_index(self) -> dict:
+        """Reload the name -> voice_id index from the ElevenLabs account."""
+        with provider_call("elevenlabs", "voice_list"):
+            voices = await self.client.voices.get_all()
+        return self._set_index(voices)
+
+    async def find_voice(self, clone_name: str):
+        """O(1) lookup of a remote voice by name; refreshes the index when stale."""
+        if self._index_is_stale():
+            await self.refresh_voice_index()
+        return self._voice_index.get(clone_name)
 
-        # ✅ Cleanup
-        os.remove(final_path)
-        if input_audio_path != input_audio:
-            os.remove(input_audio_path)
+    async def _find_existing_voice(self, clone_name: str):
+        if self._index_is_stale():
+            await self.refresh_voice_index()
+        return self._lookup(clone_name)
 
+    async def _create_voice(self, clone_name: str, sample) -> str:
+        """Upload one sample (file object) and create an instant voice clone."""
+        print("🧬 Cloning new voice...")
+        with provider_call("elevenlabs", "voice_clone"):
+            voice = await self.client.voices.ivc.create(
+                name=clone_name,
+                files=[sample],
+            )
+        print(f"✅ New voice cloned with ID: {voice.voice_id}")
+        self._index_add(clone_name, voice.voice_id)
         return voice.voice_id
+
+    async def delete_voice(self, voice_id: str):
+        """Delete a voice from ElevenLabs and drop it from the remote voice index."""
+        with provider_call("elevenlabs", "voice_delete"):
+            await self.client.voices.delete(voice_id=voice_id)
+        self._index_remove(voice_id)
@@ -90,14 +90,18 @@
 # services/audio_summarizer.py
 
 import os
-import tempfile
+import asyncio
 from modules.audio_converter import AudioConverter
-from modules.stt import SpeechToText
-from modules.summarizer import Summarizer
-from modules.tts import TextToSpeech
-from modules.voice_clone import VoiceCloner
+from modules.stt import SpeechToText, AsyncSpeechToText
+from modules.summarizer import Summarizer, AsyncSummarizer
+from modules.tts import TextToSpeech, AsyncTextToSpeech
+from modules.voice_clone import VoiceCloner, AsyncVoiceCloner
 from modules.audio_crop import AudioCroper
-from elevenlabs import ElevenLabs
+from modules.audio_buffer import AudioBuffer
+from modules.audio_analysis import AudioAnalyzer
+from modules.noise_reduction import NoiseReducer
+from modules.stream_decoder import StreamingDecoder
+from services.pipeline import Pipeline, Stage
 
 class AudioSummarizerService:
     """Service to process long audio, summarize, clone voice, and produce output speech."""
@@ -109,70 +113,430 @@ class AudioSummarizerService:
         self.tts = TextToSpeech()
         self.voice_cloner = VoiceCloner()
         self.audio_croper = AudioCroper()
-        self.eleven_client = ElevenLabs(base_url="https://api.elevenlabs.io/")
+        self.analyzer = AudioAnalyzer()
+        self.noise_reducer = NoiseReducer(analyzer=self.analyzer)
+        # Async counterparts for the event-loop entry points (same on-disk caches)
+        self.async_transcriber = AsyncSpeechToText(cache=self.transcriber.cache)
+        self.async_summarizer = AsyncSummarizer(cache=self.summarizer.cache)
+        self.async_tts = AsyncTextToSpeech(cache=self.tts.cache)
+        self.async_voice_cloner = AsyncVoiceCloner()
+        self.pipeline_workers = int(os.getenv("PIPELINE_WORKERS", "4"))
+        # Decode once to the format VoiceCloner uses (mono, 16kHz, PCM 16-bit)
+        self.decode_sample_rate = 16000
+        self.decode_channels = 1
+        # Seconds of speech handed to the voice cloner
+        self.clone_window_sec = 4 * 60 + 30
+        self.summary_max_tokens = int(os.getenv("SUMMARY_MAX_TOKENS", "500"))
 
-    def process_audio(self, audio_path: str, pdf_name: str, output_path: str):
-        """
-        Full pipeline:
-        1. Crop 4:30 min section and clean for voice cloning
-        2. Clone voice and get voice_id
-        3. Transcribe full audio
-        4. Summarize transcription
-        5. Generate summarized speech using cloned voice
-        6. Delete cloned voice
-        7. Save final audio
-        """
-        # ------------------------------
-        # 1️⃣ Crop first 4:30 min for voice clone
-        # ------------------------------
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_clip:
-            clip_path = self.audio_croper.crop_audio(
-                input_audio=audio_path,
-                start_time=(0, 0),
-                end_time=(4, 30),
-                output_path=tmp_clip.name
-            )
+    # -------------------------------------------------------------
+    # 🧩 Pipeline stages
+    # -------------------------------------------------------------
+    def _decode(self, ctx: dict) -> AudioBuffer:
+        """Decode the upload once; every later stage shares this buffer."""
+        buffer = AudioBuffer.from_file(
+            ctx["audio_path"],
+            sample_rate=self.decode_sample_rate,
+            channels=self.decode_channels,
+        )
+        print(f"✅ Audio decoded: {buffer}")
+        return buffer
 
-        # ------------------------------
-        # 2️⃣ Create voice_id
-        # ------------------------------
+    def _analyze(self, ctx: dict) -> dict:
+        """Quality gate: reject silent, clipped or noisy audio before any API call."""
+        return self.analyzer.check(ctx["decode"])
+
+    def _crop(self, ctx: dict) -> AudioBuffer:
+        """Pick the most speech-dense 4:30 min for voice clone (skips intros, music and silence)."""
+        return self.analyzer.select_speech(ctx["decode"], self.clone_window_sec)
+
+    def _denoise(self, ctx: dict) -> AudioBuffer:
+        """Reduce background noise in the clone sample (skipped when the SNR is good)."""
+        snr_db = ctx["analyze"]["snr_db"] if ctx.get("analyze") else None
+        return self.noise_reducer.reduce(ctx["crop"], snr_db=snr_db)
+
+    def _clone(self, ctx: dict) -> str:
+        """Create voice_id from the cropped, denoised clip."""
         voice_id = self.voice_cloner.process_and_clone_voice(
-            input_audio=clip_path,
-            clone_name=pdf_name
+            input_audio=ctx["denoise"],
+            clone_name=ctx["pdf_name"],
+            quality=ctx.get("analyze"),  # already gated by the analyze stage
         )
         print(f"✅ Voice cloned: {voice_id}")
-        os.remove(clip_path)  # cleanup temp clip
+        return voice_id
 
-        # ------------------------------
-        # 3️⃣ Transcribe full audio
-        # ------------------------------
+    def _transcribe(self, ctx: dict) -> dict:
+        """Transcribe full audio in silence-aligned chunks."""
         print("📥 Transcribing full audio...")
-        transcription = self.transcriber.transcribe(audio_path)
-        print(f"✅ Transcription complete. Length: {len(transcription)} chars")
+        transcript = self.transcriber.transcribe_chunked(ctx["decode"], audio_hash=ctx.get("audio_hash"))
+        print(
+            f"✅ Transcription complete. Length: {len(transcript['text'])} chars "
+            f"in {len(transcript['segments'])} segment(s)"
+        )
+        return transcript
 
-        # ------------------------------
-        # 4️⃣ Summarize transcription
-        # ------------------------------
+    def _summarize(self, ctx: dict) -> str:
+        """Summarize transcription."""
         print("📝 Summarizing transcription...")
-        summary_text = self.summarizer.summarize(transcription)
+        summary_text = self.summarizer.summarize_map_reduce(
+            ctx["transcribe"]["text"],
+            max_tokens=self.summary_max_tokens,
+        )
         print("✅ Summarization complete")
+        return summary_text
 
-        # ------------------------------
-        # 5️⃣ Convert summary to speech
-        # ------------------------------
+    def _synthesize(self, ctx: dict) -> str:
+        """Convert summary to speech and save final audio."""
         print("🔊 Generating summarized speech...")
-        speech_bytes = self.tts.text_to_speech(summary_text, voice_id=voice_id)
+        speech_bytes = self.tts.text_to_speech_batched(ctx["summarize"], voice_id=ctx["clone"])
 
-        # Save final audio
+        output_path = ctx["output_path"]
         with open(output_path, "wb") as f:
             f.write(speech_bytes)
         print(f"✅ Final summarized audio saved: {output_path}")
+        return output_path
+
+    def _cleanup(self, ctx: dict):
+        """Delete cloned voice (runs even if an upstream stage failed)."""
+        voice_id = ctx.get("clone")
+        if not voice_id:
+            return
+        print(f"🗑️ Deleting temporary voice: {voice_id}")
+        self.voice_cloner.delete_voice(voice_id)
+        print("✅ Voice deleted successfully")
+
+    # -------------------------------------------------------------
+    # ⚡ Async stages (provider calls awaited on the event loop)
+    # -------------------------------------------------------------
+    async def _aclone(self, ctx: dict) -> str:
+        voice_id = await self.async_voice_cloner.process_and_clone_voice(
+            input_audio=ctx["denoise"],
+            clone_name=ctx["pdf_name"],
+            quality=ctx.get("analyze"),
+        )
+        print(f"✅ Voice cloned: {voice_id}")
+        return voice_id
+
+    async def _atranscribe(self, ctx: dict) -> dict:
+        print("📥 Transcribing full audio...")
+        transcript = await self.async_transcriber.transcribe_chunked(ctx["decode"], audio_hash=ctx.get("audio_hash"))
+        print(
+            f"✅ Transcription complete. Length: {len(transcript['text'])} chars "
+            f"in {len(transcript['segments'])} segment(s)"
+        )
+        return transcript
+
+    async def _asummarize(self, ctx: dict) -> str:
+        print("📝 Summarizing transcription...")
+        summary_text = await self.async_summarizer.summarize_map_reduce(
+            ctx["transcribe"]["text"],
+            max_tokens=self.summary_max_tokens,
+        )
+        print("✅ Summarization complete")
+        return summary_text
+
+    async def _asynthesize(self, ctx: dict) -> str:
+        print("🔊 Generating summarized speech...")
+        speech_bytes = await self.async_tts.text_to_speech_batched(ctx["summarize"], voice_id=ctx["clone"])
+
+        output_path = ctx["output_path"]
+        await asyncio.to_thread(self._write_file, output_path, speech_bytes)
+        print(f"✅ Final summarized audio saved: {output_path}")
+        return output_path
 
-        # ------------------------------
-        # 6️⃣ Delete cloned voice
-        # ------------------------------
+    async def _acleanup(self, ctx: dict):
+        voice_id = ctx.get("clone")
+        if not voice_id:
+            return
         print(f"🗑️ Deleting temporary voice: {voice_id}")
-        self.eleven_client.voices.delete(voice_id=voice_id)
+        await self.async_voice_cloner.delete_voice(voice_id)
         print("✅ Voice deleted successfully")
 
-        return output_path, summary_text
+    # -------------------------------------------------------------
+    # 🌊 Incremental stages (run while the upload is still arriving)
+    # -------------------------------------------------------------
+    async def _aingest(self, ctx: dict) -> AudioBuffer:
+        """Feed the request body into the decoder until the upload ends."""
+        buffer = await ctx["decoder"].ingest(ctx["body"])
+        print(f"✅ Upload decoded: {buffer}")
+        return buffer
+
+    async def _aanalyze_incremental(self, ctx: dict) -> dict:
+        """
+        Quality gate on the first clone window (the whole upload if shorter),
+        before any provider call. Its snapshot is the one the clone stage uses.
+        """
+        decoder = ctx["decoder"]
+        await decoder.wait_for(self.clone_window_sec)
+        audio = decoder.snapshot()
+        report = await asyncio.to_thread(self._analyze, {"decode": audio})
+        return {"audio": audio, "report": report}
+
+    async def _aclone_incremental(self, ctx: dict) -> str:
+        """Clone from the analyzed clone window, reusing its quality report."""
+        audio, report = ctx["analyze"]["audio"], ctx["analyze"]["report"]
+        print(f"🧬 {audio.duration:.1f}s decoded, starting voice clone...")
+        crop = await asyncio.to_thread(self._crop, {"decode": audio})
+        denoised = await asyncio.to_thread(self._denoise, {"crop": crop, "analyze": report})
+        return await self._aclone({"denoise": denoised, "pdf_name": ctx["pdf_name"], "analyze": report})
+
+    async def _atranscribe_incremental(self, ctx: dict) -> dict:
+        """Transcribe completed chunks while decoding continues."""
+        print("📥 Transcribing audio as it arrives...")
+        transcript = await self.async_transcriber.transcribe_incremental(ctx["decoder"])
+        print(
+            f"✅ Transcription complete. Length: {len(transcript['text'])} chars "
+            f"in {len(transcript['segments'])} segment(s)"
+        )
+        return transcript
+
+    @staticmethod
+    def _write_file(path: str, data: bytes):
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def build_pipeline(self, synthesize: bool = True, asynchronous: bool = False) -> Pipeline:
+        """
+        Summarization flow as a DAG:
+                                 ┌-> crop -> denoise -> clone ┐
+            decode -> analyze ───┴-> transcribe -> summarize ─┴-> synthesize -> cleanup (deferred)
+
+        :param synthesize: If False, the synthesize stage is left out so the caller
+                           can stream speech itself; cleanup then follows summarize.
+        :param asynchronous: Use the async provider stages (run the pipeline with `arun`).
+        """
+        if asynchronous:
+            clone, transcribe, summarize, synthesize_func, cleanup = (
+                self._aclone, self._atranscribe, self._asummarize, self._asynthesize, self._acleanup,
+            )
+        else:
+            clone, transcribe, summarize, synthesize_func, cleanup = (
+                self._clone, self._transcribe, self._summarize, self._synthesize, self._cleanup,
+            )
+        stages = [
+            Stage("decode", self._decode, depends_on=["audio_path"]),
+            Stage("analyze", self._analyze, depends_on=["decode"]),
+            Stage("crop", self._crop, depends_on=["analyze"]),
+            Stage("denoise", self._denoise, depends_on=["crop"]),
+            Stage("clone", clone, depends_on=["denoise", "pdf_name"]),
+            Stage("transcribe", transcribe, depends_on=["analyze"]),
+            Stage("summarize", summarize, depends_on=["transcribe"]),
+        ]
+        if synthesize:
+            stages.append(Stage("synthesize", synthesize_func, depends_on=["clone", "summarize", "output_path"]))
+        final = "synthesize" if synthesize else "summarize"
+        stages.append(Stage("cleanup", cleanup, depends_on=["clone", final], deferred=True, always_run=True))
+        name = "summarize_audio_async" if asynchronous else "summarize_audio"
+        return Pipeline(stages, max_workers=self.pipeline_workers, name=name)
+
+    def process_audio(
+        self,
+        audio_path: str,
+        pdf_name: str,
+        output_path: str,
+        progress=None,
+        defer=None,
+        audio_hash: str = None,
+    ):
+        """
+        Full pipeline (independent stages run concurrently):
+        0. Decode the audio once into a shared AudioBuffer and reject unusable audio
+        1. Select the most speech-dense 4:30 min for voice cloning and reduce its noise
+        2. Clone voice and get voice_id
+        3. Transcribe full audio in parallel chunks (in parallel with 1-2)
+        4. Summarize transcription
+        5. Generate summarized speech using cloned voice (parallel sentence batches)
+        6. Save final audio
+        7. Delete cloned voice (deferred)
+
+        :param progress: Optional callback receiving the name of each stage as it starts
+        :param defer: Optional scheduler for the cleanup stage, e.g. BackgroundTasks.add_task.
+                      If None, cleanup runs before returning.
+        :param audio_path: Path, file-like object or SpooledUpload of the input audio
+        :param audio_hash: Optional SHA-256 of the upload; repeat uploads reuse the cached transcript
+        """
+        results = self.build_pipeline().run(
+            context={
+                "audio_path": audio_path,
+                "pdf_name": pdf_name,
+                "output_path": output_path,
+                "audio_hash": audio_hash,
+            },
+            progress=progress,
+            defer=defer,
+        )
+        return results["synthesize"], results["summarize"]
+
+    def process_audio_stream(self, audio_path: str, pdf_name: str, progress=None, audio_hash: str = None, defer=None):
+        """
+        Same pipeline as `process_audio`, but speech is not written to disk:
+        returns a generator of MP3 chunks. The first segment is streamed as
+        ElevenLabs generates it; later segments are synthesized in parallel
+        meanwhile and yielded in order.
+        The cloned voice is deleted exactly once: when the stream is exhausted
+        or closed, or by `defer` (e.g. the response's BackgroundTasks) if the
+        stream is never consumed.
+        :return: (audio chunk generator, summary_text)
+        """
+        deferred = []
+        results = self.build_pipeline(synthesize=False).run(
+            context={"audio_path": audio_path, "pdf_name": pdf_name, "audio_hash": audio_hash},
+            progress=progress,
+            defer=deferred.append,
+        )
+        cleanup = self._once(deferred)
+        try:
+            chunks = self.tts.stream_progressive(results["summarize"], voice_id=results["clone"])
+        except Exception:
+            cleanup()
+            raise
+
+        def audio_stream():
+            try:
+                yield from chunks
+            finally:
+                cleanup()
+
+        if defer is not None:
+            defer(cleanup)
+        return audio_stream(), results["summarize"]
+
+    @staticmethod
+    def _once(tasks: list):
+        """Callable running the deferred tasks on its first call only."""
+        started = []
+
+        def run():
+            if not started:
+                started.append(True)
+                for task in tasks:
+                    task()
+        return run
+
+    @staticmethod
+    def _aonce(tasks: list):
+        """Async counterpart of `_once` for coroutine tasks."""
+        started = []
+
+        async def run():
+            if not started:
+                started.append(True)
+                for task in tasks:
+                    await task()
+        return run
+
+    # -------------------------------------------------------------
+    # ⚡ Async entry points
+    # -------------------------------------------------------------
+    async def aprocess_audio(
+        self,
+        audio_path: str,
+        pdf_name: str,
+        output_path: str,
+        progress=None,
+        defer=None,
+        audio_hash: str = None,
+    ):
+        """
+        Async counterpart of `process_audio`: provider calls are awaited on the
+        event loop, decoding and cropping run in worker threads.
+        :param defer: Optional scheduler for the async cleanup stage, e.g. BackgroundTasks.add_task
+        """
+        results = await self.build_pipeline(asynchronous=True).arun(
+            context={
+                "audio_path": audio_path,
+                "pdf_name": pdf_name,
+                "output_path": output_path,
+                "audio_hash": audio_hash,
+            },
+            progress=progress,
+            defer=defer,
+        )
+        return results["synthesize"], results["summarize"]
+
+    async def aprocess_audio_stream(self, audio_path: str, pdf_name: str, progress=None, audio_hash: str = None, defer=None):
+        """
+        Async counterpart of `process_audio_stream`.
+        :param defer: Scheduler that guarantees the cleanup runs even if the stream
+                      is never iterated, e.g. the StreamingResponse's BackgroundTasks.add_task
+        :return: (async generator of MP3 chunks, summary_text)
+        """
+        deferred = []
+        results = await self.build_pipeline(synthesize=False, asynchronous=True).arun(
+            context={"audio_path": audio_path, "pdf_name": pdf_name, "audio_hash": audio_hash},
+            progress=progress,
+            defer=deferred.append,
+        )
+        cleanup = self._aonce(deferred)
+        try:
+            chunks = self.async_tts.stream_progressive(results["summarize"], voice_id=results["clone"])
+        except Exception:
+            await cleanup()
+            raise
+
+        async def audio_stream():
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                await chunks.aclose()
+                await cleanup()
+
+        if defer is not None:
+            defer(cleanup)
+        return audio_stream(), results["summarize"]
+
+    def build_incremental_pipeline(self) -> Pipeline:
+        """
+        Summarization flow for a body that is still being uploaded:
+            ingest ───────────────────────────────────────────┐
+            analyze (clone window) ─┬─> clone ─────────────────┼-> synthesize -> cleanup (deferred)
+                                    └─> transcribe -> summarize┘
+        Transcription waits for the quality gate, as in the batch flow, so
+        unusable audio is rejected before any provider call.
+        """
+        return Pipeline([
+            Stage("ingest", self._aingest, depends_on=["decoder", "body"]),
+            Stage("analyze", self._aanalyze_incremental, depends_on=["decoder"]),
+            Stage("clone", self._aclone_incremental, depends_on=["analyze", "pdf_name"]),
+            Stage("transcribe", self._atranscribe_incremental, depends_on=["analyze"]),
+            Stage("summarize", self._asummarize, depends_on=["transcribe"]),
+            Stage("synthesize", self._asynthesize, depends_on=["ingest", "clone", "summarize", "output_path"]),
+            Stage("cleanup", self._acleanup, depends_on=["clone", "synthesize"], deferred=True, always_run=True),
+        ], name="summarize_audio_incremental")
+
+    async def aprocess_audio_incremental(self, body, pdf_name: str, output_path: str, progress=None, defer=None):
+        """
+        Like `aprocess_audio`, but reads the audio from an async byte stream
+        (e.g. request.stream()) and starts cloning and transcription before
+        the upload has finished.
+        :param body: Async iterable of encoded audio bytes
+        :return: (output_path, summary_text)
+        """
+        decoder = await StreamingDecoder(self.decode_sample_rate, self.decode_channels).start()
+        try:
+            results = await self.build_incremental_pipeline().arun(
+                context={
+                    "decoder": decoder,
+                    "body": body,
+                    "pdf_name": pdf_name,
+                    "output_path": output_path,
+                },
+                progress=progress,
+                defer=defer,
+            )
+        except Exception as e:
+            await decoder.abort(e)
+            raise
+        return results["synthesize"], results["summarize"]
+
+    def close(self):
+        """Release worker processes (noise reduction pool)."""
+        self.noise_reducer.close()
+
+    def cache_stats(self) -> dict:
+        """Hit / miss counters of the caches used by the pipeline."""
+        return {
+            "transcripts": self.transcriber.cache.stats(),
+            "summaries": self.summarizer.cache.stats(),
+            "speech": self.tts.cache.stats(),
+        }
@@ -0,0 +1,181 @@
+# services/job_queue.py
+
+import os
+import queue
+import threading
+import time
+import uuid
+from modules.config import load_config
+
+load_config()
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    """State of a single queued pipeline run."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, func, args: tuple = (), kwargs: dict = None):
+        self.id = uuid.uuid4().hex
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.status = Job.PENDING
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.on_finish = []
+        self.on_expire = []
+
+    def set_progress(self, step: str):
+        """Record the pipeline step currently being executed."""
+        self.progress = step
+
+    def to_dict(self) -> dict:
+        """Public, JSON-serializable view of the job."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    ⏳ Bounded job queue backed by a fixed pool of worker threads.
+    - submit() returns immediately with a Job (or raises QueueFullError).
+    - Workers pick jobs in FIFO order and store result / error on the Job.
+    - Finished jobs are kept for `job_ttl_sec` seconds so clients can poll them.
+      Expired jobs are swept on submit(), on get() and by idle workers, so their
+      outputs are removed even when no new job arrives.
+    """
+
+    def __init__(self, workers: int = None, max_queue: int = None, job_ttl_sec: int = None):
+        """
+        :param workers: Number of worker threads (falls back to JOB_WORKERS, default 2)
+        :param max_queue: Maximum number of pending jobs (falls back to JOB_QUEUE_SIZE, default 32)
+        :param job_ttl_sec: How long finished jobs stay queryable (falls back to JOB_TTL_SEC, default 3600)
+        """
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.max_queue = max_queue or int(os.getenv("JOB_QUEUE_SIZE", "32"))
+        self.job_ttl_sec = job_ttl_sec or int(os.getenv("JOB_TTL_SEC", "3600"))
+        # How often an idle worker sweeps expired jobs
+        self.sweep_interval_sec = min(60, self.job_ttl_sec)
+
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        print(f"⏳ JobQueue ready: {self.workers} workers, queue depth {self.max_queue}.")
+
+    # -------------------------------------------------------------
+    # 📥 Submit / query
+    # -------------------------------------------------------------
+    def submit(self, func, *args, **kwargs) -> Job:
+        """
+        Queue `func(*args, job=<Job>, **kwargs)` for execution.
+        The job is passed to `func` so it can report progress and register
+        `job.on_finish` callbacks that run once the job is finished.
+        """
+        self._ensure_workers()
+        self._evict_expired()
+
+        job = Job(func, args, kwargs)
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise QueueFullError(f"Job queue is full ({self.max_queue} pending jobs).")
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Return the job with the given id, or None if unknown / expired."""
+        self._evict_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        """Current queue depth and job counts by status."""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize(),
+            "jobs": counts,
+        }
+
+    # -------------------------------------------------------------
+    # ⚙️ Workers
+    # -------------------------------------------------------------
+    def _ensure_workers(self):
+        """Start worker threads lazily on first submit."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self):
+        while True:
+            try:
+                job = self._queue.get(timeout=self.sweep_interval_sec)
+            except queue.Empty:
+                self._evict_expired()
+                continue
+            job.status = Job.RUNNING
+            job.started_at = time.time()
+            try:
+                job.result = job.func(*job.args, job=job, **job.kwargs)
+                job.status = Job.DONE
+            except Exception as e:
+                print(f"❌ Job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = Job.FAILED
+            finally:
+                job.finished_at = time.time()
+                for callback in job.on_finish:
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"⚠️ Job {job.id} cleanup failed: {e}")
+                self._queue.task_done()
+
+    def _evict_expired(self):
+        """Forget finished jobs older than the TTL and run their `on_expire` callbacks."""
+        cutoff = time.time() - self.job_ttl_sec
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job in expired:
+                self._jobs.pop(job.id)
+
+        for job in expired:
+            for callback in job.on_expire:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"⚠️ Job {job.id} expiry cleanup failed: {e}")
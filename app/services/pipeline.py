@@ -0,0 +1,261 @@
+# services/pipeline.py
+
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from modules.metrics import stage_timer
+
+
+class Stage:
+    """
+    A single step of a pipeline.
+    :param name: Unique stage name; its return value is stored under this key
+    :param func: Callable receiving the results dict (context + outputs of finished stages)
+    :param depends_on: Names of stages (or context keys) that must be available first
+    :param deferred: If True, the stage runs after the foreground stages have returned
+    :param always_run: If True, the stage still runs when another stage failed
+    """
+
+    def __init__(self, name: str, func, depends_on=(), deferred: bool = False, always_run: bool = False):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.deferred = deferred
+        self.always_run = always_run
+
+
+class Pipeline:
+    """
+    🧩 Dependency-driven stage executor.
+    Stages whose dependencies are satisfied run concurrently on a thread pool
+    (`run`) or as asyncio tasks (`arun`, which also accepts coroutine stages).
+    Deferred stages (e.g. cleanup) are handed to a scheduler such as
+    FastAPI's BackgroundTasks so they run after the response is sent.
+    The first failure stops the run: no new stage is started except
+    `always_run` ones, and `arun` cancels the stages still in flight.
+    Every stage run is timed into the `voice_pipeline_stage_seconds` metric.
+    """
+
+    def __init__(self, stages=(), max_workers: int = None, name: str = "pipeline"):
+        """
+        :param stages: Initial stages
+        :param max_workers: Thread pool size for `run` (defaults to one per stage)
+        :param name: Pipeline label used in metrics
+        """
+        self.stages = {}
+        self.name = name
+        self.max_workers = max_workers
+        for stage in stages:
+            self.add(stage)
+
+    def add(self, stage: Stage) -> "Pipeline":
+        """Register a stage. Returns the pipeline for chaining."""
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        self.stages[stage.name] = stage
+        return self
+
+    # -------------------------------------------------------------
+    # 🔍 Validation
+    # -------------------------------------------------------------
+    def _order(self, context: dict) -> list:
+        """Topologically sort the stages, raising on unknown dependencies or cycles."""
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages and dep not in context:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown '{dep}'")
+
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done or name not in self.stages:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(self.stages[name])
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    # -------------------------------------------------------------
+    # 🗓️ Scheduling
+    # -------------------------------------------------------------
+    @staticmethod
+    def _has_error(failed: dict) -> bool:
+        """True once a stage raised (skipped / cancelled markers are not errors)."""
+        return any(isinstance(reason, BaseException) for reason in failed.values())
+
+    def _can_run(self, stage: Stage, failed: dict) -> bool:
+        # After any failure only always_run stages (e.g. cleanup) are started:
+        # independent stages would only spend provider calls on a doomed run
+        return stage.always_run or not self._has_error(failed)
+
+    def _ready(self, pending: dict, results: dict, failed: dict) -> list:
+        """
+        Pop and return pending stages whose dependencies have finished.
+        Once a stage has failed, every other pending stage is marked skipped
+        (unless always_run).
+        """
+        ready = []
+        for name, stage in list(pending.items()):
+            if not self._can_run(stage, failed):
+                failed[name] = "skipped"
+                del pending[name]
+                continue
+            deps = [d for d in stage.depends_on if d in self.stages]
+            if all(d in results or d in failed for d in deps):
+                ready.append(stage)
+                del pending[name]
+        return ready
+
+    # -------------------------------------------------------------
+    # ▶️ Execution
+    # -------------------------------------------------------------
+    def _call(self, stage: Stage, results: dict):
+        with stage_timer(self.name, stage.name):
+            return stage.func(results)
+
+    def run(self, context: dict = None, progress=None, defer=None) -> dict:
+        """
+        Execute the pipeline.
+        :param context: Initial values available to every stage
+        :param progress: Optional callback receiving each stage name as it starts
+        :param defer: Optional scheduler for deferred stages, called as defer(func).
+                      If None, deferred stages run inline before returning.
+        :return: Dict of context values and stage outputs
+        """
+        results = dict(context or {})
+        order = self._order(results)
+        foreground = [s for s in order if not s.deferred]
+        deferred = [s for s in order if s.deferred]
+        report = progress or (lambda name: None)
+
+        failed = {}
+        error = None
+        pending = {s.name: s for s in foreground}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or max(len(foreground), 1)) as pool:
+            while pending or running:
+                for stage in self._ready(pending, results, failed):
+                    report(stage.name)
+                    running[pool.submit(self._call, stage, results)] = stage.name
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        print(f"❌ Stage '{name}' failed: {e}")
+                        failed[name] = e
+                        error = error or e
+
+                if error is not None:
+                    # Threads cannot be interrupted: drop the stages that have not started yet
+                    for future, name in list(running.items()):
+                        if not self.stages[name].always_run and future.cancel():
+                            failed[running.pop(future)] = "cancelled"
+
+        def run_deferred():
+            for stage in deferred:
+                if not self._can_run(stage, failed):
+                    continue
+                report(stage.name)
+                try:
+                    results[stage.name] = self._call(stage, results)
+                except Exception as e:
+                    print(f"⚠️ Deferred stage '{stage.name}' failed: {e}")
+                    failed[stage.name] = e
+
+        if error is not None or defer is None:
+            run_deferred()
+        else:
+            defer(run_deferred)
+
+        if error is not None:
+            raise error
+        return results
+
+    async def arun(self, context: dict = None, progress=None, defer=None) -> dict:
+        """
+        Async counterpart of `run`. Coroutine stages are awaited on the event
+        loop; plain functions run in a worker thread via asyncio.to_thread.
+        :param defer: Optional scheduler for deferred stages, called as defer(coroutine_func),
+                      e.g. BackgroundTasks.add_task. If None, they are awaited before returning.
+        :return: Dict of context values and stage outputs
+        """
+        results = dict(context or {})
+        order = self._order(results)
+        foreground = [s for s in order if not s.deferred]
+        deferred = [s for s in order if s.deferred]
+        report = progress or (lambda name: None)
+
+        async def call(stage):
+            with stage_timer(self.name, stage.name):
+                if inspect.iscoroutinefunction(stage.func):
+                    return await stage.func(results)
+                return await asyncio.to_thread(stage.func, results)
+
+        failed = {}
+        error = None
+        pending = {s.name: s for s in foreground}
+        running = {}
+
+        while pending or running:
+            for stage in self._ready(pending, results, failed):
+                report(stage.name)
+                running[asyncio.ensure_future(call(stage))] = stage.name
+
+            if not running:
+                break
+
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                name = running.pop(task)
+                try:
+                    results[name] = task.result()
+                except Exception as e:
+                    print(f"❌ Stage '{name}' failed: {e}")
+                    failed[name] = e
+                    error = error or e
+
+            if error is not None:
+                # Cancel in-flight stages so no further provider calls are awaited
+                # (a stage already running in a worker thread finishes in the background)
+                doomed = [task for task, name in running.items() if not self.stages[name].always_run]
+                for task in doomed:
+                    task.cancel()
+                if doomed:
+                    await asyncio.gather(*doomed, return_exceptions=True)
+                for task in doomed:
+                    failed[running.pop(task)] = "cancelled"
+
+        async def run_deferred():
+            for stage in deferred:
+                if not self._can_run(stage, failed):
+                    continue
+                report(stage.name)
+                try:
+                    results[stage.name] = await call(stage)
+                except Exception as e:
+                    print(f"⚠️ Deferred stage '{stage.name}' failed: {e}")
+                    failed[stage.name] = e
+
+        if error is not None or defer is None:
+            await run_deferred()
+        else:
+            defer(run_deferred)
+
+        if error is not None:
+            raise error
+        return results
@@ -1,7 +1,7 @@
-import os
-import json
-from pathlib import Path
-from modules.voice_clone import VoiceCloner  # import your VoiceCloner class
+import asyncio
+from modules.voice_clone import VoiceCloner, AsyncVoiceCloner  # import your VoiceCloner class
+from modules.stream_decoder import StreamingDecoder
+from services.voice_registry import VoiceRegistry
 
 
 class VoiceClonerService:
@@ -9,87 +9,159 @@ class VoiceClonerService:
     🎙️ Service layer for handling voice cloning requests.
     - Takes input voice name and audio file.
     - Returns voice_id from ElevenLabs.
-    - Saves mapping of {voice_name: voice_id} in a JSON file.
+    - Saves mapping of {voice_name: voice_id} in the SQLite voice registry.
     """
 
-    def __init__(self, db_path: str = "file/database/voice.json"):
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)  # ensure dir exists
+    def __init__(self, db_path: str = "file/database/voice.db", legacy_json_path: str = "file/database/voice.json"):
+        self.registry = VoiceRegistry(db_path, legacy_json_path)
         self.cloner = VoiceCloner()
-
-        # Ensure JSON database file exists
-        if not self.db_path.exists():
-            with open(self.db_path, "w", encoding="utf-8") as f:
-                json.dump({}, f, indent=4)
-
-    # -------------------------------------------------------------
-    # 🔍 Load and Save Helper Methods
-    # -------------------------------------------------------------
-    def _load_json(self):
-        """Load existing voice data."""
-        try:
-            with open(self.db_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def _save_json(self, data: dict):
-        """Save voice data to JSON."""
-        with open(self.db_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        self.async_cloner = AsyncVoiceCloner()
 
     # -------------------------------------------------------------
     # 🧬 Main Function: Clone Voice and Save
     # -------------------------------------------------------------
     def create_voice(self, voice_name: str, audio_input) -> dict:
         """
-        Create (or reuse) a cloned voice and save to local JSON DB.
+        Create (or reuse) a cloned voice and save it to the voice registry.
         :param voice_name: Name for the cloned voice
         :param audio_input: Audio file path or file-like object
         :return: Dict containing {"voice_name": ..., "voice_id": ...}
         """
-        # Load existing voices
-        voice_data = self._load_json()
-
         # Reuse if exists
-        if voice_name in voice_data:
+        existing_id = self.registry.get(voice_name)
+        if existing_id:
             print(f"✅ Voice '{voice_name}' already exists.")
-            return {"voice_name": voice_name, "voice_id": voice_data[voice_name]}
+            return {"voice_name": voice_name, "voice_id": existing_id}
 
         # Clone new voice
         print("🎧 Cloning new voice via VoiceCloner module...")
         voice_id = self.cloner.process_and_clone_voice(audio_input, voice_name)
 
-        # Save mapping
-        voice_data[voice_name] = voice_id
-        self._save_json(voice_data)
+        # Save mapping (a concurrent request may have registered the name first)
+        stored_id, inserted = self.registry.insert_if_absent(voice_name, voice_id)
+        if not inserted and stored_id != voice_id:
+            print(f"⚠️ Voice '{voice_name}' was registered concurrently as {stored_id}; keeping that mapping.")
+            self._discard_clone(voice_id)
 
-        print(f"✅ Voice saved: {voice_name} -> {voice_id}")
-        return {"voice_name": voice_name, "voice_id": voice_id}
+        print(f"✅ Voice saved: {voice_name} -> {stored_id}")
+        return {"voice_name": voice_name, "voice_id": stored_id}
+
+    def _discard_clone(self, voice_id: str):
+        """Delete a clone that lost the registration race, so it does not use up a voice slot."""
+        try:
+            self.cloner.delete_voice(voice_id)
+            print(f"🗑️ Deleted duplicate clone {voice_id}.")
+        except Exception as e:
+            print(f"⚠️ Could not delete duplicate clone {voice_id}: {e}")
 
     # -------------------------------------------------------------
     # ❌ Optional: Delete a Voice
     # -------------------------------------------------------------
     def delete_voice(self, voice_name: str):
         """
-        Delete a cloned voice both from ElevenLabs and local JSON.
+        Delete a cloned voice both from ElevenLabs and the local registry.
         """
-        from elevenlabs import ElevenLabs
-
-        voice_data = self._load_json()
-        if voice_name not in voice_data:
+        voice_id = self.registry.get(voice_name)
+        if voice_id is None:
             print(f"⚠️ Voice '{voice_name}' not found in local DB.")
             return {"error": "Voice not found"}
 
-        voice_id = voice_data[voice_name]
-        client = ElevenLabs(base_url="https://api.elevenlabs.io/")
+        try:
+            self.cloner.delete_voice(voice_id)
+            self.registry.delete(voice_name)
+            print(f"🗑️ Deleted voice '{voice_name}' successfully.")
+            return {"deleted": voice_name}
+        except Exception as e:
+            print(f"❌ Failed to delete voice: {e}")
+            return {"error": str(e)}
 
+    # -------------------------------------------------------------
+    # ⚡ Async entry points (registry access runs in a worker thread)
+    # -------------------------------------------------------------
+    async def acreate_voice(self, voice_name: str, audio_input) -> dict:
+        """Async counterpart of `create_voice`."""
+        existing_id = await asyncio.to_thread(self.registry.get, voice_name)
+        if existing_id:
+            print(f"✅ Voice '{voice_name}' already exists.")
+            return {"voice_name": voice_name, "voice_id": existing_id}
+
+        print("🎧 Cloning new voice via VoiceCloner module...")
+        voice_id = await self.async_cloner.process_and_clone_voice(audio_input, voice_name)
+
+        stored_id, inserted = await asyncio.to_thread(self.registry.insert_if_absent, voice_name, voice_id)
+        if not inserted and stored_id != voice_id:
+            print(f"⚠️ Voice '{voice_name}' was registered concurrently as {stored_id}; keeping that mapping.")
+            await self._adiscard_clone(voice_id)
+
+        print(f"✅ Voice saved: {voice_name} -> {stored_id}")
+        return {"voice_name": voice_name, "voice_id": stored_id}
+
+    async def acreate_voice_incremental(self, voice_name: str, body) -> dict:
+        """
+        Clone from an upload that is still arriving: the sample is taken as soon
+        as `crop_duration_sec` seconds are decoded, while the rest of the body
+        is still being received.
+        :param body: Async iterable of encoded audio bytes (e.g. request.stream())
+        """
+        existing_id = await asyncio.to_thread(self.registry.get, voice_name)
+        if existing_id:
+            print(f"✅ Voice '{voice_name}' already exists.")
+            return {"voice_name": voice_name, "voice_id": existing_id}
+
+        decoder = await StreamingDecoder(sample_rate=16000, channels=1).start()
+        ingest = asyncio.ensure_future(decoder.ingest(body))
+        try:
+            await decoder.wait_for(self.async_cloner.crop_duration_sec)
+            print(f"🎧 {decoder.duration:.1f}s decoded, cloning voice while the upload continues...")
+            voice_id = await self.async_cloner.process_and_clone_voice(decoder.snapshot(), voice_name)
+            await ingest
+        except BaseException as e:
+            ingest.cancel()
+            await asyncio.gather(ingest, return_exceptions=True)
+            await decoder.abort(e if isinstance(e, Exception) else None)
+            raise
+
+        stored_id, inserted = await asyncio.to_thread(self.registry.insert_if_absent, voice_name, voice_id)
+        if not inserted and stored_id != voice_id:
+            print(f"⚠️ Voice '{voice_name}' was registered concurrently as {stored_id}; keeping that mapping.")
+            await self._adiscard_clone(voice_id)
+
+        print(f"✅ Voice saved: {voice_name} -> {stored_id}")
+        return {"voice_name": voice_name, "voice_id": stored_id}
+
+    async def _adiscard_clone(self, voice_id: str):
+        """Async counterpart of `_discard_clone`."""
         try:
-            client.voices.delete(voice_id=voice_id)
-            del voice_data[voice_name]
-            self._save_json(voice_data)
+            await self.async_cloner.delete_voice(voice_id)
+            print(f"🗑️ Deleted duplicate clone {voice_id}.")
+        except Exception as e:
+            print(f"⚠️ Could not delete duplicate clone {voice_id}: {e}")
+
+    async def adelete_voice(self, voice_name: str):
+        """Async counterpart of `delete_voice`."""
+        voice_id = await asyncio.to_thread(self.registry.get, voice_name)
+        if voice_id is None:
+            print(f"⚠️ Voice '{voice_name}' not found in local DB.")
+            return {"error": "Voice not found"}
+
+        try:
+            await self.async_cloner.delete_voice(voice_id)
+            await asyncio.to_thread(self.registry.delete, voice_name)
             print(f"🗑️ Deleted voice '{voice_name}' successfully.")
             return {"deleted": voice_name}
         except Exception as e:
             print(f"❌ Failed to delete voice: {e}")
             return {"error": str(e)}
+
+    # -------------------------------------------------------------
+    # 🔄 Remote voice index
+    # -------------------------------------------------------------
+    def refresh_remote_voices(self) -> dict:
+        """Force a reload of the ElevenLabs voice index."""
+        index = self.cloner.refresh_voice_index()
+        return {"remote_voices": len(index)}
+
+    async def arefresh_remote_voices(self) -> dict:
+        """Async counterpart of `refresh_remote_voices`."""
+        index = await self.async_cloner.refresh_voice_index()
+        return {"remote_voices": len(index)}
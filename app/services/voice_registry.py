@@ -0,0 +1,150 @@
+# services/voice_registry.py
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class VoiceRegistry:
+    """
+    🗃️ SQLite-backed {voice_name: voice_id} registry.
+    - WAL mode so readers never block the writer, safe across uvicorn workers.
+    - Atomic insert-if-absent and delete.
+    - In-memory read index, reloaded only when another process has committed.
+    - One-time import of the legacy voice.json file.
+    """
+
+    def __init__(self, db_path: str = "file/database/voice.db", legacy_json_path: str = "file/database/voice.json"):
+        """
+        :param db_path: SQLite database file
+        :param legacy_json_path: Old JSON database, imported once if present
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)  # ensure dir exists
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30,
+            isolation_level=None,  # explicit transactions only
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS voices ("
+            " name TEXT PRIMARY KEY,"
+            " voice_id TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        self._index = {}
+        self._data_version = None
+        self._import_legacy_json(Path(legacy_json_path))
+        self._refresh_index(force=True)
+
+    # -------------------------------------------------------------
+    # 🔁 Transactions and index
+    # -------------------------------------------------------------
+    def _transaction(self, func):
+        """Run func(conn) inside BEGIN IMMEDIATE ... COMMIT (write lock taken up front)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _refresh_index(self, force: bool = False):
+        """Reload the index if another connection committed since the last load."""
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if not force and version == self._data_version:
+                return
+            rows = self._conn.execute("SELECT name, voice_id FROM voices").fetchall()
+            self._index = dict(rows)
+            self._data_version = version
+
+    def _import_legacy_json(self, json_path: Path):
+        """Copy voices from the old JSON file into SQLite, exactly once."""
+        if not json_path.exists():
+            return
+
+        def do_import(conn):
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+                return 0
+            try:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                data = {}
+            now = time.time()
+            conn.executemany(
+                "INSERT OR IGNORE INTO voices (name, voice_id, created_at) VALUES (?, ?, ?)",
+                [(name, voice_id, now) for name, voice_id in data.items()],
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES ('json_imported', ?)", (str(json_path),))
+            return len(data)
+
+        imported = self._transaction(do_import)
+        if imported:
+            print(f"✅ Imported {imported} voice(s) from {json_path}")
+
+    # -------------------------------------------------------------
+    # 📚 Public API
+    # -------------------------------------------------------------
+    def get(self, voice_name: str):
+        """Return the voice_id for a name, or None."""
+        self._refresh_index()
+        with self._lock:
+            return self._index.get(voice_name)
+
+    def all(self) -> dict:
+        """Return a copy of the whole {voice_name: voice_id} mapping."""
+        self._refresh_index()
+        with self._lock:
+            return dict(self._index)
+
+    def insert_if_absent(self, voice_name: str, voice_id: str):
+        """
+        Atomically store a mapping unless the name already exists.
+        :return: (stored voice_id, inserted) – the existing id and False if the name was taken
+        """
+        def do_insert(conn):
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO voices (name, voice_id, created_at) VALUES (?, ?, ?)",
+                (voice_name, voice_id, time.time()),
+            )
+            if cursor.rowcount:
+                return voice_id, True
+            row = conn.execute("SELECT voice_id FROM voices WHERE name = ?", (voice_name,)).fetchone()
+            return row[0], False
+
+        stored_id, inserted = self._transaction(do_insert)
+        with self._lock:
+            self._index[voice_name] = stored_id
+        return stored_id, inserted
+
+    def delete(self, voice_name: str):
+        """
+        Atomically remove a mapping.
+        :return: The removed voice_id, or None if the name was not registered
+        """
+        def do_delete(conn):
+            row = conn.execute("SELECT voice_id FROM voices WHERE name = ?", (voice_name,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM voices WHERE name = ?", (voice_name,))
+            return row[0]
+
+        voice_id = self._transaction(do_delete)
+        with self._lock:
+            self._index.pop(voice_name, None)
+        return voice_id
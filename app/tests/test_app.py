@@ -0,0 +1,83 @@
+# tests/test_app.py
+import os
+import subprocess
+import sys
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")  # TestClient
+
+from fastapi.testclient import TestClient
+import main
+from api import dependencies
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    # No startup events (the client is not entered): nothing is warmed behind the test's back
+    monkeypatch.setattr(dependencies, "_services", {})
+    monkeypatch.setattr(dependencies, "_errors", {})
+    monkeypatch.setattr(main, "missing_settings", lambda: [])
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_text("#!/bin/sh\n")
+    ffmpeg.chmod(0o755)
+    monkeypatch.setenv("FFMPEG_PATH", str(ffmpeg))
+    monkeypatch.setenv("WARM_SERVICES", "1")
+    return TestClient(main.app)
+
+
+def _factories(monkeypatch, **factories):
+    monkeypatch.setattr(dependencies, "_FACTORIES", factories)
+
+
+# -------------------------------------------------------------
+# 💤 Lazy startup
+# -------------------------------------------------------------
+def test_importing_the_app_loads_no_service_or_provider_sdk():
+    # A fresh interpreter: this test session has imported the services already
+    code = (
+        "import sys, main; "
+        "print([m for m in ('api.audio_api', 'services.voice_cloner', 'elevenlabs', 'openai') if m in sys.modules])"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(main.__file__), capture_output=True, text=True, check=True,
+    )
+    assert completed.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_ready_once_every_service_is_built(client, monkeypatch):
+    _factories(monkeypatch, audio_api=object, voice_service=object)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["services"] == {"audio_api": "not_started", "voice_service": "not_started"}
+
+    dependencies.warm_services()
+    response = client.get("/ready")
+    assert response.status_code == 200 and response.json()["ready"] is True
+
+
+def test_failed_service_is_reported_by_ready(client, monkeypatch):
+    def broken():
+        raise RuntimeError("ELEVENLABS_API_KEY is not set")
+
+    _factories(monkeypatch, audio_api=object, voice_service=broken)
+    dependencies.warm_services()
+    body = client.get("/ready").json()
+    assert body["ready"] is False
+    assert body["services"] == {"audio_api": "ready", "voice_service": "RuntimeError: ELEVENLABS_API_KEY is not set"}
+
+
+def test_missing_settings_or_ffmpeg_are_not_ready(client, monkeypatch, tmp_path):
+    _factories(monkeypatch)
+    monkeypatch.setattr(main, "missing_settings", lambda: ["OPENAI_API_KEY"])
+    monkeypatch.setenv("FFMPEG_PATH", str(tmp_path / "missing-ffmpeg"))
+    body = client.get("/ready").json()
+    assert client.get("/ready").status_code == 503
+    assert body["missing_settings"] == ["OPENAI_API_KEY"] and body["ffmpeg"] is False
+
+
+def test_services_are_not_required_to_be_warm_when_warming_is_off(client, monkeypatch):
+    _factories(monkeypatch, audio_api=object)
+    monkeypatch.setenv("WARM_SERVICES", "0")
+    assert client.get("/ready").status_code == 200
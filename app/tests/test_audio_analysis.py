@@ -0,0 +1,81 @@
+# tests/test_audio_analysis.py
+import numpy as np
+import pytest
+from modules.audio_analysis import AudioAnalyzer, AudioQualityError
+from modules.audio_buffer import AudioBuffer
+
+RATE = 16000
+
+
+def _tone(seconds: float, amplitude: float = 0.5) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (np.sin(2 * np.pi * 220 * t) * amplitude).astype(np.float32)
+
+
+def _noise(seconds: float, amplitude: float = 0.001) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * RATE)) * amplitude).astype(np.float32)
+
+
+def _buffer(*parts: np.ndarray) -> AudioBuffer:
+    return AudioBuffer(np.concatenate(parts).reshape(-1, 1), RATE)
+
+
+@pytest.fixture
+def analyzer():
+    return AudioAnalyzer(min_speech_sec=2.0, hangover_sec=0.0)
+
+
+# -------------------------------------------------------------
+# 🗣️ Voice activity detection
+# -------------------------------------------------------------
+def test_speech_mask_marks_loud_frames_only(analyzer):
+    audio = _buffer(_noise(2.0), _tone(1.0), _noise(2.0))
+    mask = analyzer.speech_mask(audio)
+    assert np.count_nonzero(mask) * analyzer.frame_sec == pytest.approx(1.0, abs=0.05)
+    assert not mask[:90].any() and mask[110:140].all()
+
+
+def test_digital_silence_is_never_speech(analyzer):
+    audio = AudioBuffer(np.zeros((RATE, 1), dtype=np.float32), RATE)
+    assert not analyzer.speech_mask(audio).any()
+
+
+# -------------------------------------------------------------
+# 📊 Quality report
+# -------------------------------------------------------------
+def test_check_accepts_clean_speech(analyzer):
+    report = analyzer.check(_buffer(_noise(1.0), _tone(3.0), _noise(1.0)))
+    assert report["usable"] and report["reasons"] == []
+    assert report["speech_sec"] == pytest.approx(3.0, abs=0.05)
+    assert report["snr_db"] > 40
+
+
+def test_check_rejects_too_little_speech(analyzer):
+    with pytest.raises(AudioQualityError, match="too little speech") as info:
+        analyzer.check(_buffer(_noise(9.0), _tone(0.5)))
+    assert info.value.report["usable"] is False
+
+
+def test_check_rejects_clipped_audio(analyzer):
+    with pytest.raises(AudioQualityError, match="clipped"):
+        analyzer.check(_buffer(_noise(1.0), np.clip(_tone(3.0, amplitude=2.0), -1.0, 1.0)))
+
+
+# -------------------------------------------------------------
+# ✂️ Speech-dense segment selection
+# -------------------------------------------------------------
+def test_select_speech_keeps_short_audio_untouched(analyzer):
+    audio = _buffer(_tone(3.0))
+    assert analyzer.select_speech(audio, target_sec=5.0) is audio
+
+
+def test_select_speech_prefers_speech_dense_windows(analyzer):
+    # 5 s windows: silence, speech, silence, speech
+    audio = _buffer(_noise(5.0), _tone(5.0, 0.3), _noise(5.0), _tone(5.0, 0.6))
+    selected = analyzer.select_speech(audio, target_sec=10.0)
+    assert selected.duration == pytest.approx(10.0)
+    # Original order is kept: the quieter tone window comes first
+    first, second = selected.crop(0, 5.0), selected.crop(5.0, 10.0)
+    assert np.abs(first.samples).max() == pytest.approx(0.3, abs=0.01)
+    assert np.abs(second.samples).max() == pytest.approx(0.6, abs=0.01)
@@ -0,0 +1,105 @@
+# tests/test_audio_buffer.py
+import numpy as np
+import pytest
+import soundfile as sf
+from modules.audio_buffer import AudioBuffer
+
+RATE = 1000
+
+
+def _buffer(seconds: float, channels: int = 1, value: int = 1000) -> AudioBuffer:
+    return AudioBuffer(np.full((int(seconds * RATE), channels), value, dtype=np.int16), RATE)
+
+
+# -------------------------------------------------------------
+# ✂️ Views and conversions
+# -------------------------------------------------------------
+def test_crop_is_a_view_of_the_samples():
+    audio = _buffer(5.0)
+    crop = audio.crop(1.0, 3.0)
+    assert crop.duration == 2.0
+    assert np.shares_memory(crop.samples, audio.samples)
+
+
+def test_crop_clamps_the_end_and_rejects_a_start_past_the_end():
+    audio = _buffer(2.0)
+    assert audio.crop(1.5, 10.0).duration == 0.5
+    with pytest.raises(ValueError):
+        audio.crop(3.0)
+
+
+def test_mono_samples_are_reshaped_to_one_channel():
+    audio = AudioBuffer(np.zeros(100, dtype=np.int16), RATE)
+    assert audio.samples.shape == (100, 1) and audio.channels == 1
+
+
+def test_unsupported_dtype_is_rejected():
+    with pytest.raises(TypeError):
+        AudioBuffer(np.zeros(10, dtype=np.float64), RATE)
+
+
+def test_to_mono_averages_the_channels():
+    samples = np.stack([np.full(10, 1000), np.full(10, 3000)], axis=1).astype(np.int16)
+    mono = AudioBuffer(samples, RATE).to_mono()
+    assert mono.channels == 1 and (mono.samples == 2000).all()
+
+
+def test_int16_and_float32_round_trip():
+    audio = _buffer(1.0, value=16384)
+    as_float = audio.as_float32()
+    assert as_float.dtype == np.float32 and as_float[0, 0] == pytest.approx(0.5)
+    assert AudioBuffer(as_float, RATE).as_int16()[0, 0] == pytest.approx(16384, abs=1)
+    assert audio.as_int16() is audio.samples  # no copy
+
+
+# -------------------------------------------------------------
+# 🔇 Energy analysis
+# -------------------------------------------------------------
+def test_frame_energy_is_computed_blockwise():
+    audio = AudioBuffer(np.concatenate([np.zeros(500), np.full(500, 16384)]).astype(np.int16), RATE)
+    energy = audio.frame_energy(frame_sec=0.1, block_frames=3)
+    assert len(energy) == 10
+    assert energy[:5] == pytest.approx(0.0) and energy[5:] == pytest.approx(0.5)
+
+
+def _with_pauses(seconds: float, pauses: list) -> AudioBuffer:
+    """Loud audio with 0.2 s of silence starting at each of `pauses` (seconds)."""
+    samples = np.full(int(seconds * RATE), 8000, dtype=np.int16)
+    for pause in pauses:
+        samples[int(pause * RATE):int((pause + 0.2) * RATE)] = 0
+    return AudioBuffer(samples, RATE)
+
+
+def test_split_on_silence_cuts_in_the_pauses():
+    audio = _with_pauses(25.0, pauses=[8.5, 17.0])
+    bounds = audio.split_on_silence(max_chunk_sec=10.0)
+    assert [round(end, 2) for _start, end in bounds[:-1]] == [8.5, 17.0]
+
+
+def test_split_on_silence_covers_the_buffer_without_gaps():
+    audio = _with_pauses(47.3, pauses=[5.0, 31.0])
+    bounds = audio.split_on_silence(max_chunk_sec=10.0)
+    assert bounds[0][0] == 0.0 and bounds[-1][1] == pytest.approx(47.3)
+    for (_start, end), (next_start, _end) in zip(bounds, bounds[1:]):
+        assert next_start == end
+    assert all(end - start <= 10.0 + 1e-9 for start, end in bounds)
+
+
+def test_split_on_silence_keeps_short_audio_whole():
+    assert _buffer(3.0).split_on_silence(max_chunk_sec=10.0) == [(0.0, 3.0)]
+
+
+def test_split_on_silence_rejects_a_non_positive_length():
+    with pytest.raises(ValueError):
+        _buffer(3.0).split_on_silence(max_chunk_sec=0)
+
+
+# -------------------------------------------------------------
+# 💾 Encoding
+# -------------------------------------------------------------
+def test_to_file_like_encodes_a_named_wav():
+    audio = _buffer(1.0, channels=2)
+    out = audio.to_file_like("WAV", name="sample.wav")
+    assert out.name == "sample.wav" and out.tell() == 0
+    samples, rate = sf.read(out, dtype="int16")
+    assert rate == RATE and samples.shape == (RATE, 2)
@@ -0,0 +1,69 @@
+# tests/test_audio_converter.py
+import io
+import os
+import shutil
+import numpy as np
+import pytest
+import soundfile as sf
+from modules.audio_buffer import AudioBuffer
+from modules.audio_converter import AudioConverter
+
+needs_ffmpeg = pytest.mark.skipif(
+    shutil.which(os.getenv("FFMPEG_PATH") or "ffmpeg") is None, reason="ffmpeg not installed"
+)
+
+
+def _wav(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    out = io.BytesIO()
+    sf.write(out, (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16), rate, format="WAV")
+    return out.getvalue()
+
+
+@pytest.fixture
+def converter():
+    return AudioConverter(max_workers=3)
+
+
+# -------------------------------------------------------------
+# 📦 Batch conversion
+# -------------------------------------------------------------
+@needs_ffmpeg
+def test_batch_results_come_back_in_job_order(converter, tmp_path):
+    src = tmp_path / "talk.wav"
+    src.write_bytes(_wav())
+    jobs = [
+        (src, str(tmp_path / "a.flac"), "flac"),
+        (_wav(), str(tmp_path / "b.mp3"), "mp3"),
+        (str(src), str(tmp_path / "c.wav"), "wav", ["-ar", "8000"]),
+    ]
+    seen = []
+
+    results = converter.convert_batch(jobs, on_result=seen.append)
+    assert [r["dst"] for r in results] == [job[1] for job in jobs]
+    assert all(r["ok"] and r["bytes"] == os.path.getsize(r["dst"]) for r in results)
+    assert results[1]["src"] == "<bytes>"
+    assert sf.info(str(tmp_path / "c.wav")).samplerate == 8000
+    assert sorted(r["dst"] for r in seen) == sorted(job[1] for job in jobs)
+
+
+@needs_ffmpeg
+def test_failing_job_does_not_stop_the_batch(converter, tmp_path):
+    jobs = [
+        (b"this is not audio" * 100, str(tmp_path / "bad.wav"), "wav"),
+        (_wav(), str(tmp_path / "good.wav"), "wav"),
+    ]
+    bad, good = converter.convert_batch(jobs)
+    assert not bad["ok"] and bad["error"] and bad["bytes"] == 0
+    assert not os.path.exists(bad["dst"])  # partial output removed
+    assert good["ok"]
+
+
+def test_empty_batch_starts_nothing(converter):
+    assert converter.convert_batch([]) == []
+
+
+def test_audio_buffers_are_rejected_up_front(converter, tmp_path):
+    audio = AudioBuffer(np.zeros(100, dtype=np.int16), 16000)
+    with pytest.raises(TypeError):
+        converter.convert_batch([(audio, str(tmp_path / "out.wav"), "wav")])
@@ -0,0 +1,80 @@
+# tests/test_audio_crop.py
+import os
+import shutil
+import numpy as np
+import pytest
+import soundfile as sf
+from modules.audio_buffer import AudioBuffer
+from modules.audio_crop import AudioCroper
+
+RATE = 8000
+
+
+def _ramp(seconds: float, channels: int = 1) -> np.ndarray:
+    """Every frame holds its own index (mod 2**15), so a window's position is easy to check."""
+    frames = np.arange(int(seconds * RATE)) % 32768
+    return np.repeat(frames[:, None], channels, axis=1).astype(np.int16)
+
+
+@pytest.fixture
+def croper():
+    return AudioCroper()
+
+
+# -------------------------------------------------------------
+# ⏩ Seek-based file crop
+# -------------------------------------------------------------
+@pytest.mark.parametrize("extension", [".wav", ".flac"])
+def test_file_crop_reads_only_the_window(croper, tmp_path, extension, monkeypatch):
+    path = str(tmp_path / f"talk{extension}")
+    sf.write(path, _ramp(3.0, channels=2), RATE)
+    # The whole-file decoders must not be needed for seekable containers
+    monkeypatch.setattr(croper.transcoder, "stream_pcm", None)
+
+    cropped = croper.crop_audio(path, start_time=(0, 1), end_time=(0, 2))
+    samples = np.array(cropped.get_array_of_samples()).reshape(-1, 2)
+    assert cropped.frame_rate == RATE and cropped.channels == 2
+    assert len(samples) == RATE and samples[0, 0] == RATE and samples[-1, 0] == 2 * RATE - 1
+
+
+def test_file_crop_keeps_24_bit_samples(croper, tmp_path):
+    path = str(tmp_path / "talk.wav")
+    sf.write(path, _ramp(2.0), RATE, subtype="PCM_24")
+    cropped = croper.crop_audio(path, start_time=(0, 0), end_time=(0, 1))
+    assert cropped.sample_width == 4 and len(cropped) == 1000
+
+
+def test_file_crop_clamps_the_end_and_rejects_a_late_start(croper, tmp_path):
+    path = str(tmp_path / "talk.wav")
+    sf.write(path, _ramp(2.0), RATE)
+    assert len(croper.crop_audio(path, start_time=(0, 1), end_time=(4, 30))) == 1000
+    with pytest.raises(ValueError, match="shorter"):
+        croper.crop_audio(path, start_time=(0, 5), end_time=(0, 6))
+
+
+def test_crop_writes_the_window_when_given_an_output_path(croper, tmp_path):
+    path, out = str(tmp_path / "talk.wav"), str(tmp_path / "crop.wav")
+    sf.write(path, _ramp(3.0), RATE)
+    assert croper.crop_audio(path, start_time=(0, 1), end_time=(0, 2), output_path=out) == out
+    assert sf.info(out).frames == RATE
+
+
+@pytest.mark.skipif(
+    shutil.which(os.getenv("FFPROBE_PATH") or "ffprobe") is None, reason="ffprobe not installed"
+)
+def test_other_formats_are_cropped_through_an_ffmpeg_seek(croper, tmp_path):
+    wav, ogg = str(tmp_path / "talk.wav"), str(tmp_path / "talk.ogg")
+    sf.write(wav, _ramp(3.0), RATE)
+    croper.transcoder.transcode(wav, ogg, format="ogg")
+    cropped = croper.crop_audio(ogg, start_time=(0, 1), end_time=(0, 2))
+    assert len(cropped) == pytest.approx(1000, abs=30)
+
+
+# -------------------------------------------------------------
+# ✂️ In-memory crop
+# -------------------------------------------------------------
+def test_audio_buffer_crop_is_a_view(croper):
+    audio = AudioBuffer(_ramp(3.0), RATE)
+    cropped = croper.crop_audio(audio, start_time=(0, 1), end_time=(0, 2))
+    assert isinstance(cropped, AudioBuffer) and cropped.duration == 1.0
+    assert np.shares_memory(cropped.samples, audio.samples)
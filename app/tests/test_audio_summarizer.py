@@ -0,0 +1,93 @@
+# tests/test_audio_summarizer.py
+import asyncio
+import numpy as np
+import pytest
+from modules.audio_analysis import AudioAnalyzer, AudioQualityError
+from modules.audio_buffer import AudioBuffer
+from services.audio_summarizer import AudioSummarizerService
+
+RATE = 16000
+
+
+class FakeDecoder:
+    """Stands in for StreamingDecoder with the whole upload already decoded."""
+
+    def __init__(self, audio: AudioBuffer):
+        self.audio = audio
+
+    async def wait_for(self, seconds: float) -> float:
+        return self.audio.duration
+
+    def snapshot(self) -> AudioBuffer:
+        return self.audio
+
+    async def ingest(self, body) -> AudioBuffer:
+        return self.audio
+
+
+class FakeNoiseReducer:
+    def __init__(self):
+        self.snr_db = []
+
+    def reduce(self, audio, snr_db=None):
+        self.snr_db.append(snr_db)
+        return audio
+
+
+class FakeAsyncCloner:
+    def __init__(self):
+        self.quality = []
+
+    async def process_and_clone_voice(self, input_audio, clone_name, quality=None):
+        self.quality.append(quality)
+        return "voice-1"
+
+
+class FakeAsyncTranscriber:
+    def __init__(self):
+        self.calls = 0
+
+    async def transcribe_incremental(self, decoder):
+        self.calls += 1
+        return {"text": "", "segments": []}
+
+
+@pytest.fixture
+def service():
+    service = AudioSummarizerService.__new__(AudioSummarizerService)
+    service.analyzer = AudioAnalyzer(min_speech_sec=2.0)
+    service.clone_window_sec = 4.0
+    service.noise_reducer = FakeNoiseReducer()
+    service.async_voice_cloner = FakeAsyncCloner()
+    service.async_transcriber = FakeAsyncTranscriber()
+    return service
+
+
+def _speech(seconds: float) -> AudioBuffer:
+    t = np.arange(int(seconds * RATE)) / RATE
+    samples = np.sin(2 * np.pi * 220 * t) * (t % 1.0 < 0.7) * 0.5
+    return AudioBuffer(samples.astype(np.float32).reshape(-1, 1), RATE)
+
+
+def test_incremental_pipeline_rejects_unusable_audio_before_provider_calls(service):
+    silence = AudioBuffer(np.zeros((6 * RATE, 1), dtype=np.float32), RATE)
+    pipeline = service.build_incremental_pipeline()
+    context = {"decoder": FakeDecoder(silence), "body": None, "pdf_name": "doc", "output_path": "out.mp3"}
+
+    with pytest.raises(AudioQualityError):
+        asyncio.run(pipeline.arun(context))
+    assert service.async_voice_cloner.quality == []
+    assert service.async_transcriber.calls == 0
+
+
+def test_incremental_clone_reuses_the_quality_report(service):
+    decoder = FakeDecoder(_speech(6.0))
+
+    async def main():
+        analyzed = await service._aanalyze_incremental({"decoder": decoder})
+        await service._aclone_incremental({"analyze": analyzed, "pdf_name": "doc"})
+        return analyzed["report"]
+
+    report = asyncio.run(main())
+    assert service.noise_reducer.snr_db == [report["snr_db"]]
+    assert service.async_voice_cloner.quality == [report]
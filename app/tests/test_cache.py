@@ -0,0 +1,181 @@
+# tests/test_cache.py
+import asyncio
+import os
+import time
+import pytest
+from modules.cache import DiskCache
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def _entries(directory):
+    return sorted(name for name in os.listdir(directory) if not name.startswith("."))
+
+
+def _age(cache, key, seconds):
+    """Move an entry's access and write times `seconds` into the past."""
+    path = cache._path(cache._file_name(key))
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+# -------------------------------------------------------------
+# 📦 Bytes / JSON API
+# -------------------------------------------------------------
+def test_round_trip_and_counters(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=1024)
+    assert cache.get("missing") is None
+    cache.set("key", b"value")
+    assert cache.get("key") == b"value"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 5)
+
+
+def test_json_helpers(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=1024)
+    cache.set_json("doc", {"text": "héllo"})
+    assert cache.get_json("doc") == {"text": "héllo"}
+    assert cache.get_json("other") is None
+
+
+def test_async_helpers(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=1024)
+
+    async def main():
+        await cache.aset("bytes", b"abc")
+        await cache.aset_json("doc", [1, 2])
+        return await cache.aget("bytes"), await cache.aget_json("doc")
+
+    assert asyncio.run(main()) == (b"abc", [1, 2])
+
+
+def test_delete(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=1024)
+    cache.set("key", b"value")
+    cache.delete("key")
+    assert cache.get("key") is None and _entries(cache_dir) == []
+
+
+def test_make_key_separates_parts():
+    assert DiskCache.make_key("ab", "c") != DiskCache.make_key("a", "bc")
+    assert DiskCache.make_key("a", 1) == DiskCache.make_key("a", "1")
+
+
+# -------------------------------------------------------------
+# 🧹 Eviction and TTL
+# -------------------------------------------------------------
+def test_least_recently_used_entry_is_evicted(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=300)
+    cache.set("a", b"a" * 100)
+    cache.set("b", b"b" * 100)
+    _age(cache, "a", 20)
+    _age(cache, "b", 10)
+    assert cache.get("a") is not None  # "a" becomes the most recently used
+
+    cache.set("c", b"c" * 150)
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a" * 100 and cache.get("c") == b"c" * 150
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 250
+
+
+def test_size_cap_is_shared_by_instances_on_one_directory(cache_dir):
+    # Each instance stands in for a worker process with its own in-memory index
+    first, second = DiskCache(cache_dir, max_bytes=250), DiskCache(cache_dir, max_bytes=250)
+    first.set("a", b"a" * 100)
+    _age(first, "a", 10)
+    second.set("b", b"b" * 100)
+    second.set("c", b"c" * 100)
+
+    total = sum(os.path.getsize(os.path.join(cache_dir, name)) for name in _entries(cache_dir))
+    assert total <= 250
+    assert first.get("a") is None
+
+
+def test_directory_is_rescanned_only_when_over_budget(cache_dir, monkeypatch):
+    cache = DiskCache(cache_dir, max_bytes=250)
+    cache.set("a", b"a" * 100)  # first write builds the running total
+    scans = []
+    load_index = cache._load_index
+    monkeypatch.setattr(cache, "_load_index", lambda: scans.append(1) or load_index())
+
+    cache.set("b", b"b" * 100)
+    cache.set("b", b"B" * 100)  # replacing an entry does not count it twice
+    cache.delete("a")
+    cache.set("c", b"c" * 100)
+    assert scans == []
+    cache.set("d", b"d" * 100)
+    assert scans == [1] and cache.stats()["evictions"] == 1
+
+
+def test_running_total_drift_is_corrected_at_eviction(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=250)
+    cache.set("a", b"a" * 100)
+    cache._write_total(1000)  # e.g. a worker crashed between a removal and its update
+
+    cache.set("b", b"b" * 100)
+    assert cache.get("a") == b"a" * 100 and cache._read_total() == 200
+
+
+def test_values_larger_than_the_budget_are_not_stored(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=10)
+    cache.set("big", b"x" * 11)
+    assert cache.get("big") is None and _entries(cache_dir) == []
+
+
+def test_index_is_rebuilt_from_disk(cache_dir):
+    DiskCache(cache_dir, max_bytes=1024).set("key", b"value")
+    reopened = DiskCache(cache_dir, max_bytes=1024)
+    assert reopened.stats()["entries"] == 1
+    assert reopened.get("key") == b"value"
+
+
+def test_expired_entries_are_misses_and_removed(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=1024, ttl_sec=60)
+    cache.set("old", b"value")
+    cache.set("new", b"value")
+    _age(cache, "old", 120)
+
+    assert cache.get("old") is None
+    assert cache.get("new") == b"value"
+    assert len(_entries(cache_dir)) == 1
+
+
+def test_hits_do_not_extend_the_ttl(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=1024, ttl_sec=60)
+    cache.set("key", b"value")
+    _age(cache, "key", 50)
+    assert cache.get("key") == b"value"
+    _age(cache, "key", 20)
+    assert cache.get("key") is None
+
+
+# -------------------------------------------------------------
+# ✍️ Atomic writes
+# -------------------------------------------------------------
+def test_writes_replace_entries_without_leaving_temp_files(cache_dir):
+    cache = DiskCache(cache_dir, max_bytes=1024)
+    cache.set("key", b"first value")
+    cache.set("key", b"second")
+    assert cache.get("key") == b"second"
+    assert not [name for name in os.listdir(cache_dir) if name.startswith(".tmp-")]
+    assert cache.stats()["bytes"] == len(b"second")
+
+
+def test_failed_write_keeps_the_previous_entry(cache_dir, monkeypatch):
+    cache = DiskCache(cache_dir, max_bytes=1024)
+    cache.set("key", b"old")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        cache.set("key", b"new")
+    monkeypatch.undo()
+    assert cache.get("key") == b"old"
+    assert not [name for name in os.listdir(cache_dir) if name.startswith(".tmp-")]
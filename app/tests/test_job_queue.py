@@ -0,0 +1,113 @@
+# tests/test_job_queue.py
+import threading
+import time
+import pytest
+from services.job_queue import Job, JobQueue, QueueFullError
+
+
+def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def _finished(job):
+    return lambda: job.status in (Job.DONE, Job.FAILED) and job.finished_at is not None
+
+
+# -------------------------------------------------------------
+# ▶️ Execution
+# -------------------------------------------------------------
+def test_job_result_progress_and_on_finish():
+    jobs = JobQueue(workers=1)
+    finished = []
+
+    def work(value, job):
+        job.on_finish.append(lambda: finished.append(job.id))
+        job.set_progress("working")
+        return value * 2
+
+    job = jobs.submit(work, 21)
+    _wait_for(lambda: finished)
+    assert job.status == Job.DONE and job.result == 42
+    assert job.progress == "working" and finished == [job.id]
+    assert jobs.get(job.id) is job
+    assert job.to_dict()["status"] == Job.DONE
+
+
+def test_failed_job_keeps_the_error_and_still_runs_on_finish():
+    jobs = JobQueue(workers=1)
+    finished = []
+
+    def work(job):
+        job.on_finish.append(lambda: finished.append(True))
+        raise RuntimeError("boom")
+
+    job = jobs.submit(work)
+    _wait_for(_finished(job))
+    assert job.status == Job.FAILED and job.error == "boom"
+    _wait_for(lambda: finished)
+
+
+def test_submit_raises_when_the_queue_is_full():
+    jobs = JobQueue(workers=1, max_queue=1)
+    release = threading.Event()
+    running = jobs.submit(lambda job: release.wait(5))
+    try:
+        _wait_for(lambda: running.status == Job.RUNNING)
+        queued = jobs.submit(lambda job: None)
+        with pytest.raises(QueueFullError):
+            jobs.submit(lambda job: None)
+        assert jobs.stats()["queued"] == 1
+    finally:
+        release.set()
+    _wait_for(_finished(queued))
+
+
+# -------------------------------------------------------------
+# ⌛ Expiry
+# -------------------------------------------------------------
+def _expiring_job(jobs, expired):
+    def work(job):
+        job.on_expire.append(lambda: expired.append(job.id))
+        return "ok"
+
+    job = jobs.submit(work)
+    _wait_for(_finished(job))
+    return job
+
+
+def test_get_evicts_expired_jobs_and_runs_on_expire():
+    jobs = JobQueue(workers=1, job_ttl_sec=3600)
+    expired = []
+    job = _expiring_job(jobs, expired)
+
+    job.finished_at -= 3601
+    assert jobs.get(job.id) is None
+    assert expired == [job.id]
+
+
+def test_idle_workers_evict_expired_jobs():
+    jobs = JobQueue(workers=1, job_ttl_sec=3600)
+    jobs.sweep_interval_sec = 0.05
+    expired = []
+    job = _expiring_job(jobs, expired)
+
+    job.finished_at -= 3601
+    _wait_for(lambda: expired)
+    with jobs._lock:
+        assert job.id not in jobs._jobs
+
+
+def test_unfinished_jobs_never_expire():
+    jobs = JobQueue(workers=1, job_ttl_sec=1)
+    release = threading.Event()
+    job = jobs.submit(lambda job: release.wait(5))
+    try:
+        _wait_for(lambda: job.status == Job.RUNNING)
+        job.created_at -= 10
+        assert jobs.get(job.id) is job
+    finally:
+        release.set()
@@ -0,0 +1,78 @@
+# tests/test_noise_reduction.py
+import numpy as np
+import pytest
+from modules.audio_buffer import AudioBuffer
+from modules.noise_reduction import NoiseReducer
+
+RATE = 8000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    """200 -> 2000 Hz sweep during the first half of every second (speech-like: no steady bin)."""
+    t = np.arange(int(seconds * RATE)) / RATE
+    phase = t % 1.0
+    sweep = np.sin(2 * np.pi * (200 * phase + 1800 * phase ** 2))
+    return (sweep * (phase < 0.5) * 0.5).astype(np.float32)
+
+
+def _noisy_speech(seconds: float, noise: float = 0.05) -> AudioBuffer:
+    rng = np.random.default_rng(0)
+    samples = _tone(seconds) + rng.standard_normal(int(seconds * RATE)) * noise
+    return AudioBuffer(samples.astype(np.float32).reshape(-1, 1), RATE)
+
+
+class CountingAnalyzer:
+    def __init__(self, snr_db: float):
+        self.snr_db = snr_db
+        self.calls = 0
+
+    def analyze(self, audio):
+        self.calls += 1
+        return {"snr_db": self.snr_db}
+
+
+# -------------------------------------------------------------
+# ⏩ Skipping
+# -------------------------------------------------------------
+def test_clean_audio_is_returned_unchanged():
+    reducer = NoiseReducer(skip_snr_db=20, analyzer=CountingAnalyzer(snr_db=35))
+    audio = _noisy_speech(1.0)
+    if not reducer.available:
+        pytest.skip("noisereduce not installed")
+    assert reducer.reduce(audio) is audio
+    assert reducer.analyzer.calls == 1
+
+
+def test_known_snr_is_not_estimated_again():
+    reducer = NoiseReducer(skip_snr_db=20, analyzer=CountingAnalyzer(snr_db=0))
+    audio = _noisy_speech(1.0)
+    assert reducer.reduce(audio, snr_db=30) is audio
+    assert reducer.analyzer.calls == 0
+
+
+def test_empty_audio_is_skipped():
+    audio = AudioBuffer(np.zeros((0, 1), dtype=np.int16), RATE)
+    assert NoiseReducer().reduce(audio, snr_db=0) is audio
+
+
+# -------------------------------------------------------------
+# 🔇 Block-wise reduction
+# -------------------------------------------------------------
+def test_blocks_are_reassembled_in_order():
+    pytest.importorskip("noisereduce")
+    audio = _noisy_speech(6.0)
+    reducer = NoiseReducer(block_sec=1.0, overlap_sec=0.25, max_workers=1, stationary=True)
+    try:
+        reduced = reducer.reduce(audio, snr_db=0)
+    finally:
+        reducer.close()
+
+    assert reduced.dtype == np.int16 and reduced.samples.shape == audio.samples.shape
+    # The pauses (second half of every second) lose most of their noise ...
+    pauses = np.concatenate([np.arange(int((s + 0.6) * RATE), int((s + 0.9) * RATE)) for s in range(6)])
+    before = np.abs(audio.as_float32()[pauses]).mean()
+    after = np.abs(reduced.as_float32()[pauses]).mean()
+    assert after < before / 2
+    # ... while the tone stays where it was, across block seams
+    tone = np.concatenate([np.arange(int((s + 0.1) * RATE), int((s + 0.4) * RATE)) for s in range(6)])
+    assert np.corrcoef(_tone(6.0)[tone], reduced.as_float32()[tone, 0])[0, 1] > 0.9
@@ -0,0 +1,237 @@
+# tests/test_pipeline.py
+import asyncio
+import threading
+import time
+import pytest
+from modules import metrics
+from services.pipeline import Pipeline, Stage
+
+
+def _value(value):
+    return lambda ctx: value
+
+
+# -------------------------------------------------------------
+# 🔍 Validation and ordering
+# -------------------------------------------------------------
+def test_stages_receive_outputs_of_their_dependencies():
+    pipeline = Pipeline([
+        Stage("double", lambda ctx: ctx["a"] * 2, depends_on=["a"]),
+        Stage("plus_one", lambda ctx: ctx["double"] + 1, depends_on=["double"]),
+    ])
+    results = pipeline.run({"a": 5})
+    assert results == {"a": 5, "double": 10, "plus_one": 11}
+
+
+def test_progress_reports_stages_in_dependency_order():
+    started = []
+    pipeline = Pipeline([
+        Stage("c", _value(3), depends_on=["b"]),
+        Stage("b", _value(2), depends_on=["a"]),
+        Stage("a", _value(1)),
+    ])
+    pipeline.run(progress=started.append)
+    assert started == ["a", "b", "c"]
+
+
+def test_unknown_dependency_is_rejected():
+    pipeline = Pipeline([Stage("a", _value(1), depends_on=["missing"])])
+    with pytest.raises(ValueError, match="unknown 'missing'"):
+        pipeline.run()
+
+
+def test_cycle_is_rejected():
+    pipeline = Pipeline([
+        Stage("a", _value(1), depends_on=["b"]),
+        Stage("b", _value(2), depends_on=["a"]),
+    ])
+    with pytest.raises(ValueError, match="Cycle"):
+        pipeline.run()
+
+
+def test_duplicate_stage_name_is_rejected():
+    with pytest.raises(ValueError, match="Duplicate"):
+        Pipeline([Stage("a", _value(1)), Stage("a", _value(2))])
+
+
+# -------------------------------------------------------------
+# ⚡ Concurrency
+# -------------------------------------------------------------
+def test_independent_stages_run_concurrently():
+    # Each stage waits for the other at the barrier: only passes if both run at once
+    barrier = threading.Barrier(2, timeout=5)
+    pipeline = Pipeline([
+        Stage("left", lambda ctx: barrier.wait() is not None),
+        Stage("right", lambda ctx: barrier.wait() is not None),
+    ])
+    assert pipeline.run() == {"left": True, "right": True}
+
+
+def test_arun_runs_independent_coroutine_stages_concurrently():
+    async def nap(ctx):
+        await asyncio.sleep(0.2)
+        return "done"
+
+    pipeline = Pipeline([Stage("one", nap), Stage("two", nap), Stage("three", nap)])
+    started = time.perf_counter()
+    results = asyncio.run(pipeline.arun())
+    assert time.perf_counter() - started < 0.5
+    assert results == {"one": "done", "two": "done", "three": "done"}
+
+
+def test_arun_runs_plain_functions_in_threads():
+    pipeline = Pipeline([Stage("thread", lambda ctx: threading.current_thread() is threading.main_thread())])
+    assert asyncio.run(pipeline.arun()) == {"thread": False}
+
+
+# -------------------------------------------------------------
+# ❌ Failures
+# -------------------------------------------------------------
+def _boom(ctx):
+    raise RuntimeError("boom")
+
+
+def test_failure_skips_dependents_but_runs_always_run_stages():
+    ran = []
+    pipeline = Pipeline([
+        Stage("fail", _boom),
+        Stage("after", lambda ctx: ran.append("after"), depends_on=["fail"]),
+        Stage("cleanup", lambda ctx: ran.append("cleanup"), depends_on=["fail"], always_run=True),
+    ])
+    with pytest.raises(RuntimeError, match="boom"):
+        pipeline.run()
+    assert ran == ["cleanup"]
+
+
+def test_failure_stops_scheduling_independent_stages():
+    ran = []
+    slow_started = threading.Event()
+
+    def slow(ctx):
+        slow_started.set()
+        time.sleep(0.2)
+        ran.append("slow")
+
+    def fail(ctx):
+        slow_started.wait(5)
+        raise RuntimeError("boom")
+
+    pipeline = Pipeline([
+        Stage("fail", fail),
+        Stage("slow", slow),
+        Stage("later", lambda ctx: ran.append("later"), depends_on=["slow"]),
+    ], max_workers=2)
+    with pytest.raises(RuntimeError):
+        pipeline.run()
+    # "slow" was already running and finishes; nothing new starts after the failure
+    assert ran == ["slow"]
+
+
+def test_arun_cancels_in_flight_stages_on_failure():
+    cancelled = asyncio.Event()
+
+    async def slow(ctx):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def fail(ctx):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("boom")
+
+    async def main():
+        pipeline = Pipeline([Stage("slow", slow), Stage("fail", fail)])
+        started = time.perf_counter()
+        with pytest.raises(RuntimeError, match="boom"):
+            await pipeline.arun()
+        return time.perf_counter() - started
+
+    assert asyncio.run(main()) < 1
+    assert cancelled.is_set()
+
+
+class RecordingHistogram:
+    """Stands in for STAGE_SECONDS and keeps the label values of each observation."""
+
+    def __init__(self):
+        self.observed = {}
+
+    def labels(self, pipeline, stage, status):
+        self.observed[stage] = status
+        return self
+
+    def observe(self, value):
+        pass
+
+
+def test_stage_metrics_tell_cancelled_from_failed_stages(monkeypatch):
+    histogram = RecordingHistogram()
+    monkeypatch.setattr(metrics, "STAGE_SECONDS", histogram)
+
+    async def slow(ctx):
+        await asyncio.sleep(5)
+
+    async def fail(ctx):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("boom")
+
+    pipeline = Pipeline([Stage("ok", _value(1)), Stage("slow", slow), Stage("fail", fail)])
+    with pytest.raises(RuntimeError):
+        asyncio.run(pipeline.arun())
+    assert histogram.observed == {"ok": "ok", "slow": "cancelled", "fail": "error"}
+
+
+# -------------------------------------------------------------
+# ⏭️ Deferred stages
+# -------------------------------------------------------------
+def test_deferred_stages_are_handed_to_the_scheduler():
+    ran, scheduled = [], []
+    pipeline = Pipeline([
+        Stage("work", _value("result")),
+        Stage("cleanup", lambda ctx: ran.append(ctx["work"]), depends_on=["work"], deferred=True),
+    ])
+    results = pipeline.run(defer=scheduled.append)
+    assert results["work"] == "result" and ran == []
+
+    scheduled[0]()
+    assert ran == ["result"]
+
+
+def test_deferred_stages_run_inline_without_scheduler():
+    ran = []
+    pipeline = Pipeline([Stage("cleanup", lambda ctx: ran.append(1), deferred=True)])
+    pipeline.run()
+    assert ran == [1]
+
+
+def test_deferred_always_run_stage_runs_inline_after_failure():
+    ran, scheduled = [], []
+    pipeline = Pipeline([
+        Stage("fail", _boom),
+        Stage("cleanup", lambda ctx: ran.append(1), deferred=True, always_run=True),
+        Stage("report", lambda ctx: ran.append(2), deferred=True),
+    ])
+    with pytest.raises(RuntimeError):
+        pipeline.run(defer=scheduled.append)
+    assert ran == [1] and scheduled == []
+
+
+def test_arun_defers_coroutine_scheduler():
+    ran, scheduled = [], []
+
+    async def cleanup(ctx):
+        ran.append(ctx["work"])
+
+    async def main():
+        pipeline = Pipeline([
+            Stage("work", _value(7)),
+            Stage("cleanup", cleanup, depends_on=["work"], deferred=True),
+        ])
+        await pipeline.arun(defer=scheduled.append)
+        assert ran == []
+        await scheduled[0]()
+
+    asyncio.run(main())
+    assert ran == [7]
@@ -0,0 +1,123 @@
+# tests/test_spooled_upload.py
+import hashlib
+import io
+import os
+import tempfile
+import pytest
+from modules.spooled_upload import SpooledUpload, UploadTooLargeError
+
+
+def _upload(data: bytes, **kwargs) -> SpooledUpload:
+    return SpooledUpload.from_file(io.BytesIO(data), filename="talk.mp3", chunk_size=7, **kwargs)
+
+
+# -------------------------------------------------------------
+# 📥 Spooling
+# -------------------------------------------------------------
+def test_small_upload_stays_in_memory():
+    data = b"x" * 100
+    with _upload(data, max_memory_bytes=100) as upload:
+        assert upload.in_memory and upload.path is None
+        assert bytes(upload.source()) == data
+
+
+def test_upload_spills_to_one_file_above_the_threshold():
+    data = os.urandom(101)
+    with _upload(data, max_memory_bytes=100) as upload:
+        assert not upload.in_memory
+        assert upload.path.endswith(".mp3")
+        assert upload.source() == upload.path
+        with open(upload.path, "rb") as f:
+            assert f.read() == data
+        path = upload.path
+    assert not os.path.exists(path)
+
+
+def test_upload_over_the_limit_is_rejected_and_cleaned_up():
+    before = set(os.listdir(tempfile.gettempdir()))
+    with pytest.raises(UploadTooLargeError):
+        _upload(b"x" * 50, max_memory_bytes=10, max_bytes=40)
+    assert set(os.listdir(tempfile.gettempdir())) <= before
+
+
+def test_writes_after_finish_are_rejected():
+    with _upload(b"abc") as upload:
+        with pytest.raises(ValueError):
+            upload.write(b"more")
+
+
+@pytest.mark.parametrize("size", [0, 10, 5000])
+def test_sha256_matches_the_content(size):
+    data = os.urandom(size)
+    with _upload(data, max_memory_bytes=100) as upload:
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        assert upload.size == size
+
+
+# -------------------------------------------------------------
+# 📤 Reading
+# -------------------------------------------------------------
+@pytest.mark.parametrize("size", [50, 500])
+def test_open_returns_a_read_only_view(size):
+    data = os.urandom(size)
+    with _upload(data, max_memory_bytes=100) as upload:
+        view = upload.open()
+        assert isinstance(view, memoryview) and view.readonly
+        assert view.tobytes() == data
+        view.release()
+
+
+# -------------------------------------------------------------
+# 🔁 Adopting a framework spool file
+# -------------------------------------------------------------
+def _spool(data: bytes, max_size: int = 1024):
+    spool = tempfile.SpooledTemporaryFile(max_size=max_size)
+    spool.write(data)
+    spool.seek(0)
+    return spool
+
+
+def test_rolled_over_spool_is_adopted_without_a_copy():
+    data = os.urandom(4096)
+    spool = _spool(data)
+    before = set(os.listdir(tempfile.gettempdir()))
+
+    upload = SpooledUpload.from_spooled(spool, filename="talk.mp3", max_memory_bytes=16)
+    spool.close()  # the framework closes its handle after the request
+    try:
+        assert set(os.listdir(tempfile.gettempdir())) == before
+        assert not upload.in_memory
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        assert bytes(upload.source()) == data
+    finally:
+        upload.close()
+
+
+def test_named_file_is_adopted_by_path():
+    data = os.urandom(4096)
+    with tempfile.NamedTemporaryFile() as src:
+        src.write(data)
+        src.flush()
+        src.seek(0)
+        with SpooledUpload.from_spooled(src, max_memory_bytes=16) as upload:
+            assert upload.source() == src.name
+            assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        # The file belongs to its creator and is left in place
+        assert os.path.exists(src.name)
+
+
+def test_small_spool_is_copied_into_memory():
+    with SpooledUpload.from_spooled(_spool(b"abc")) as upload:
+        assert upload.in_memory and bytes(upload.open()) == b"abc"
+
+
+def test_stream_without_a_file_is_copied():
+    data = os.urandom(4096)
+    with SpooledUpload.from_spooled(io.BytesIO(data), filename="talk.mp3", max_memory_bytes=16) as upload:
+        assert upload.path.endswith(".mp3")
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+
+
+def test_adopted_spool_over_the_limit_is_rejected():
+    with pytest.raises(UploadTooLargeError):
+        SpooledUpload.from_spooled(_spool(os.urandom(4096)), max_memory_bytes=16, max_bytes=1024)
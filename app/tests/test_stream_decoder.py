@@ -0,0 +1,78 @@
+# tests/test_stream_decoder.py
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import numpy as np
+import pytest
+import soundfile as sf
+from modules.spooled_upload import UploadTooLargeError
+from modules.stream_decoder import StreamingDecoder
+
+pytestmark = pytest.mark.skipif(
+    shutil.which(os.getenv("FFMPEG_PATH") or "ffmpeg") is None, reason="ffmpeg not installed"
+)
+
+
+def _wav(seconds: float, rate: int = 16000) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    out = io.BytesIO()
+    sf.write(out, (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16), rate, format="WAV")
+    return out.getvalue()
+
+
+async def _chunks(data: bytes, size: int = 8192):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+        await asyncio.sleep(0)
+
+
+def test_ingest_decodes_the_whole_upload_and_hashes_it():
+    data = _wav(3.0)
+
+    async def main():
+        decoder = await StreamingDecoder(sample_rate=8000, channels=1).start()
+        return decoder, await decoder.ingest(_chunks(data))
+
+    decoder, audio = asyncio.run(main())
+    assert decoder.finished and decoder.error is None
+    assert audio.sample_rate == 8000 and audio.channels == 1
+    assert audio.duration == pytest.approx(3.0, abs=0.05)
+    assert decoder.sha256 == hashlib.sha256(data).hexdigest()
+
+
+def test_wait_for_returns_before_the_upload_ends():
+    data = _wav(10.0)
+
+    async def main():
+        decoder = await StreamingDecoder(sample_rate=16000, channels=1).start()
+        ingest = asyncio.ensure_future(decoder.ingest(_chunks(data)))
+        available = await decoder.wait_for(1.0)
+        seen_before_end = decoder.bytes_in < len(data)
+        snapshot = decoder.snapshot()
+        await ingest
+        return available, seen_before_end, snapshot
+
+    available, seen_before_end, snapshot = asyncio.run(main())
+    assert available >= 1.0 and seen_before_end
+    assert snapshot.duration == pytest.approx(available)
+
+
+def test_invalid_input_reports_the_ffmpeg_error():
+    async def main():
+        decoder = await StreamingDecoder().start()
+        with pytest.raises(RuntimeError, match="ffmpeg failed"):
+            await decoder.ingest(_chunks(b"this is not audio" * 100))
+
+    asyncio.run(main())
+
+
+def test_upload_over_the_limit_is_rejected():
+    async def main():
+        decoder = await StreamingDecoder(max_bytes=10_000).start()
+        with pytest.raises(UploadTooLargeError):
+            await decoder.ingest(_chunks(_wav(2.0)))
+        assert decoder.finished
+
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+# tests/test_stt.py
+import asyncio
+import numpy as np
+import pytest
+from modules.audio_buffer import AudioBuffer
+from modules.cache import DiskCache
+from modules.stt import AsyncSpeechToText
+
+RATE = 1000
+
+
+class FakeDecoder:
+    """Stands in for StreamingDecoder: audio becomes available when the test says so."""
+
+    sha256 = "fake-upload"
+
+    def __init__(self, samples: np.ndarray, frames: int):
+        self.samples = samples
+        self.frames = frames
+        self.finished = False
+
+    def finish(self):
+        self.frames = len(self.samples)
+        self.finished = True
+
+    async def wait_for(self, seconds: float) -> float:
+        return self.frames / RATE
+
+    def snapshot(self) -> AudioBuffer:
+        return AudioBuffer(self.samples[:self.frames], RATE)
+
+
+@pytest.fixture
+def stt(tmp_path, monkeypatch):
+    stt = AsyncSpeechToText(
+        api_key="test", model_id="test", base_url="http://stt.invalid",
+        cache=DiskCache(str(tmp_path), max_bytes=1024 * 1024),
+    )
+
+    async def transcribe_chunk(chunk, index):
+        return f"chunk{index}"
+
+    monkeypatch.setattr(stt, "_transcribe_chunk", transcribe_chunk)
+    return stt
+
+
+def test_transcribe_incremental_keeps_audio_decoded_during_a_split(stt, monkeypatch):
+    samples = np.random.default_rng(0).integers(-3000, 3000, size=(10 * RATE, 1), dtype=np.int16)
+    decoder = FakeDecoder(samples, frames=4 * RATE)
+
+    split = AudioBuffer.split_on_silence
+
+    def split_while_decoding_ends(self, *args, **kwargs):
+        decoder.finish()  # the rest of the upload is decoded while the first split runs
+        return split(self, *args, **kwargs)
+
+    monkeypatch.setattr(AudioBuffer, "split_on_silence", split_while_decoding_ends)
+    transcript = asyncio.run(stt.transcribe_incremental(decoder, chunk_sec=2.0, max_workers=2))
+
+    segments = transcript["segments"]
+    assert segments[0]["start"] == 0.0
+    assert segments[-1]["end"] == pytest.approx(10.0)
+    for previous, current in zip(segments, segments[1:]):
+        assert current["start"] == pytest.approx(previous["end"])
+    assert transcript["text"] == " ".join(f"chunk{i}" for i in range(len(segments)))
+
+
+def test_transcribe_incremental_caches_the_transcript(stt):
+    samples = np.zeros((3 * RATE, 1), dtype=np.int16)
+    decoder = FakeDecoder(samples, frames=0)
+    decoder.finish()
+
+    transcript = asyncio.run(stt.transcribe_incremental(decoder, chunk_sec=2.0))
+    assert stt.cache.get_json(stt._cache_key("fake-upload", "chunked")) == transcript
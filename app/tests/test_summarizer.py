@@ -0,0 +1,48 @@
+# tests/test_summarizer.py
+import pytest
+from modules.cache import DiskCache
+from modules.summarizer import Summarizer
+
+
+# -------------------------------------------------------------
+# 🧮 Summarizer.split_by_tokens
+# -------------------------------------------------------------
+@pytest.fixture
+def summarizer(tmp_path):
+    summarizer = Summarizer(api_key="test", cache=DiskCache(str(tmp_path), max_bytes=1024))
+    summarizer._encoding = None  # character estimate (≈4 chars/token) whether or not tiktoken is installed
+    return summarizer
+
+
+def test_count_tokens_estimate(summarizer):
+    assert summarizer.count_tokens("") == 0
+    assert summarizer.count_tokens("abcd") == 1
+    assert summarizer.count_tokens("abcde") == 2
+
+
+def test_chunks_respect_the_token_limit(summarizer):
+    sentences = [f"Sentence number {i} is here." for i in range(20)]  # 7 tokens each
+    chunks = summarizer.split_by_tokens(" ".join(sentences), chunk_tokens=20)
+    # Two sentences (14 tokens) fit, a third would exceed 20
+    assert len(chunks) == 10
+    assert all(len(chunk.split(". ")) == 2 for chunk in chunks)
+    assert " ".join(chunks) == " ".join(sentences)
+
+
+def test_chunks_break_at_paragraphs(summarizer):
+    chunks = summarizer.split_by_tokens("First part\n\nSecond part", chunk_tokens=3)
+    assert chunks == ["First part", "Second part"]
+
+
+def test_oversized_sentence_becomes_its_own_chunk(summarizer):
+    long_sentence = "word " * 100
+    chunks = summarizer.split_by_tokens(f"Short one. {long_sentence.strip()}. Short two.", chunk_tokens=10)
+    assert chunks[0] == "Short one."
+    assert chunks[-1] == "Short two."
+    assert len(chunks) == 3
+
+
+def test_default_chunk_size_comes_from_the_instance(summarizer):
+    summarizer.chunk_tokens = 5
+    # 3 + 3 tokens exceed 5; 3 + 2 fit
+    assert summarizer.split_by_tokens("Aaaa bbbb. Cccc dddd. Eeee.") == ["Aaaa bbbb.", "Cccc dddd. Eeee."]
@@ -0,0 +1,69 @@
+# tests/test_transcoder.py
+import io
+import os
+import shutil
+import numpy as np
+import pytest
+import soundfile as sf
+from modules.transcoder import STDERR_TAIL_BYTES, Transcoder, keep_stderr_tail, stderr_error
+
+needs_ffmpeg = pytest.mark.skipif(
+    shutil.which(os.getenv("FFMPEG_PATH") or "ffmpeg") is None, reason="ffmpeg not installed"
+)
+
+
+def _wav(seconds: float, rate: int = 16000, channels: int = 2) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    tone = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+    out = io.BytesIO()
+    sf.write(out, np.repeat(tone[:, None], channels, axis=1), rate, format="WAV")
+    return out.getvalue()
+
+
+# -------------------------------------------------------------
+# 🧾 stderr tail
+# -------------------------------------------------------------
+def test_stderr_tail_is_bounded():
+    tail = bytearray()
+    for _ in range(10):
+        keep_stderr_tail(tail, b"x" * (STDERR_TAIL_BYTES // 3))
+    keep_stderr_tail(tail, b"\nlast line")
+    assert len(tail) == STDERR_TAIL_BYTES and tail.endswith(b"last line")
+
+
+def test_stderr_error_reports_the_last_line_or_the_exit_code():
+    assert stderr_error(bytearray(b"warning\nInvalid data found\n"), 1) == "Invalid data found"
+    assert stderr_error(bytearray(), 183) == "exit code 183"
+
+
+# -------------------------------------------------------------
+# 🔁 Decoding
+# -------------------------------------------------------------
+@needs_ffmpeg
+@pytest.mark.parametrize("as_path", [True, False])
+def test_decode_downmixes_and_resamples(tmp_path, as_path):
+    data = _wav(2.0)
+    src = io.BytesIO(data)
+    if as_path:
+        src = tmp_path / "talk.wav"
+        src.write_bytes(data)
+
+    samples = Transcoder().decode(src, sample_rate=8000, channels=1)
+    assert samples.dtype == np.int16 and samples.shape[1] == 1
+    assert len(samples) == pytest.approx(16000, abs=50)
+
+
+@needs_ffmpeg
+def test_stream_pcm_yields_fixed_size_blocks_and_seeks(tmp_path):
+    path = tmp_path / "talk.wav"
+    path.write_bytes(_wav(3.0))
+
+    blocks = list(Transcoder().stream_pcm(path, 16000, 2, block_frames=4000, start_sec=1.0, duration_sec=1.5))
+    assert all(len(block) == 4000 for block in blocks[:-1])
+    assert sum(len(block) for block in blocks) == pytest.approx(24000, abs=50)
+
+
+@needs_ffmpeg
+def test_decode_failure_reports_ffmpeg_error():
+    with pytest.raises(RuntimeError, match="ffmpeg failed: .+"):
+        Transcoder().decode(b"this is not audio" * 100, 16000, 1)
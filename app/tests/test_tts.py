@@ -0,0 +1,89 @@
+# tests/test_tts.py
+import pytest
+from modules.cache import DiskCache
+from modules.tts import TextToSpeech
+
+
+# -------------------------------------------------------------
+# 🗣️ TextToSpeech.split_text
+# -------------------------------------------------------------
+def test_short_text_is_one_segment():
+    assert TextToSpeech.split_text("Hello there. How are you?", 100) == ["Hello there. How are you?"]
+
+
+def test_sentences_are_packed_up_to_the_limit():
+    text = "One two three. Four five six. Seven eight nine."
+    segments = TextToSpeech.split_text(text, 30)
+    assert segments == ["One two three. Four five six.", "Seven eight nine."]
+    assert all(len(segment) <= 30 for segment in segments)
+
+
+def test_paragraph_breaks_are_kept_inside_a_segment():
+    text = "First paragraph.\n\nSecond paragraph."
+    assert TextToSpeech.split_text(text, 100) == ["First paragraph.\n\nSecond paragraph."]
+
+
+def test_long_sentences_are_split_between_words():
+    sentence = " ".join(f"word{i}" for i in range(40))
+    segments = TextToSpeech.split_text(sentence, 50)
+    assert all(len(segment) <= 50 for segment in segments)
+    assert " ".join(segments).split() == sentence.split()
+
+
+def test_words_longer_than_the_limit_are_cut():
+    segments = TextToSpeech.split_text("x" * 25, 10)
+    assert segments == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_splitting_keeps_every_word_in_order():
+    text = "Alpha beta. Gamma delta epsilon!\n\nZeta eta? Theta iota kappa… Lambda mu."
+    for limit in (12, 20, 40):
+        assert " ".join(TextToSpeech.split_text(text, limit)).split() == text.split()
+
+
+def test_empty_text_has_no_segments():
+    assert TextToSpeech.split_text("   ", 10) == []
+
+
+# -------------------------------------------------------------
+# 💾 Segment cache
+# -------------------------------------------------------------
+@pytest.fixture
+def tts(tmp_path, monkeypatch):
+    tts = TextToSpeech(api_key="test", cache=DiskCache(str(tmp_path), max_bytes=1024 * 1024))
+    tts.calls = []
+
+    def synthesize(text, voice_id, previous_text, next_text):
+        tts.calls.append((text, previous_text, next_text))
+        return text.encode("utf-8")
+
+    monkeypatch.setattr(tts, "_synthesize_with_retry", synthesize)
+    return tts
+
+
+def test_inner_segments_are_conditioned_on_their_neighbours():
+    segments = ["intro", "a", "b", "outro"]
+    assert TextToSpeech._neighbours(segments, 1) == {"previous_text": "intro", "next_text": "b"}
+    assert TextToSpeech._neighbours(segments, 2) == {"previous_text": "a", "next_text": "outro"}
+
+
+def test_intro_and_outro_segments_are_sent_without_neighbours():
+    segments = ["intro", "a", "outro"]
+    assert TextToSpeech._neighbours(segments, 0) == {"previous_text": None, "next_text": None}
+    assert TextToSpeech._neighbours(segments, 2) == {"previous_text": None, "next_text": None}
+
+
+def test_intro_and_outro_are_reused_across_different_summaries(tts):
+    first = ["Welcome to the show.", "Topic one.", "Thanks for listening."]
+    second = ["Welcome to the show.", "Topic two.", "Thanks for listening."]
+    assert b"".join(tts._stream_batched(first, "voice", 2)) == "".join(first).encode("utf-8")
+
+    tts.calls.clear()
+    assert b"".join(tts._stream_batched(second, "voice", 2)) == "".join(second).encode("utf-8")
+    assert tts.calls == [("Topic two.", "Welcome to the show.", "Thanks for listening.")]
+
+
+def test_cache_key_normalizes_whitespace_and_includes_neighbours(tts):
+    assert tts._cache_key("Hello  world", "v") == tts._cache_key(" Hello world ", "v")
+    assert tts._cache_key("Hello", "v", previous_text="a") != tts._cache_key("Hello", "v", previous_text="b")
+    assert tts._cache_key("Hello", "v") != tts._cache_key("Hello", "other voice")
@@ -0,0 +1,64 @@
+# tests/test_voice_cloner.py
+import asyncio
+import pytest
+from services.voice_cloner import VoiceClonerService
+from services.voice_registry import VoiceRegistry
+
+
+class FakeCloner:
+    """Stands in for the ElevenLabs cloner. A concurrent request registers the name while this one clones."""
+
+    def __init__(self, registry, fail_delete: bool = False):
+        self.registry = registry
+        self.fail_delete = fail_delete
+        self.deleted = []
+
+    def process_and_clone_voice(self, audio_input, clone_name):
+        self.registry.insert_if_absent(clone_name, "id-winner")
+        return "id-loser"
+
+    def delete_voice(self, voice_id):
+        if self.fail_delete:
+            raise RuntimeError("provider unavailable")
+        self.deleted.append(voice_id)
+
+
+class FakeAsyncCloner(FakeCloner):
+    async def process_and_clone_voice(self, audio_input, clone_name):
+        return super().process_and_clone_voice(audio_input, clone_name)
+
+    async def delete_voice(self, voice_id):
+        super().delete_voice(voice_id)
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = VoiceClonerService.__new__(VoiceClonerService)
+    service.registry = VoiceRegistry(str(tmp_path / "voice.db"), str(tmp_path / "voice.json"))
+    service.cloner = FakeCloner(service.registry)
+    service.async_cloner = FakeAsyncCloner(service.registry)
+    return service
+
+
+def test_clone_that_loses_the_registration_race_is_deleted(service):
+    result = service.create_voice("alice", "audio.wav")
+    assert result == {"voice_name": "alice", "voice_id": "id-winner"}
+    assert service.cloner.deleted == ["id-loser"]
+
+
+def test_async_clone_that_loses_the_registration_race_is_deleted(service):
+    result = asyncio.run(service.acreate_voice("alice", "audio.wav"))
+    assert result["voice_id"] == "id-winner"
+    assert service.async_cloner.deleted == ["id-loser"]
+
+
+def test_failed_cleanup_is_logged_not_raised(service, capsys):
+    service.cloner.fail_delete = True
+    assert service.create_voice("alice", "audio.wav")["voice_id"] == "id-winner"
+    assert "Could not delete duplicate clone id-loser" in capsys.readouterr().out
+
+
+def test_existing_name_is_reused_without_cloning(service):
+    service.registry.insert_if_absent("alice", "id-1")
+    assert service.create_voice("alice", "audio.wav")["voice_id"] == "id-1"
+    assert service.cloner.deleted == []
@@ -0,0 +1,51 @@
+# tests/test_voice_registry.py
+import json
+import pytest
+from services.voice_registry import VoiceRegistry
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "voice.db"), str(tmp_path / "voice.json")
+
+
+def test_insert_if_absent_keeps_the_first_mapping(paths):
+    registry = VoiceRegistry(*paths)
+    assert registry.insert_if_absent("alice", "id-1") == ("id-1", True)
+    assert registry.insert_if_absent("alice", "id-2") == ("id-1", False)
+    assert registry.get("alice") == "id-1"
+    assert registry.all() == {"alice": "id-1"}
+
+
+def test_delete_returns_the_removed_id(paths):
+    registry = VoiceRegistry(*paths)
+    registry.insert_if_absent("alice", "id-1")
+    assert registry.delete("alice") == "id-1"
+    assert registry.delete("alice") is None
+    assert registry.get("alice") is None
+
+
+def test_index_refreshes_after_another_connection_commits(paths):
+    # Two registries on one database stand in for two uvicorn workers
+    first, second = VoiceRegistry(*paths), VoiceRegistry(*paths)
+    assert second.get("alice") is None
+
+    first.insert_if_absent("alice", "id-1")
+    assert second.get("alice") == "id-1"
+    assert second.insert_if_absent("alice", "id-2") == ("id-1", False)
+
+    first.delete("alice")
+    assert second.get("alice") is None
+
+
+def test_legacy_json_is_imported_once(paths):
+    db_path, json_path = paths
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"alice": "id-1"}, f)
+
+    registry = VoiceRegistry(db_path, json_path)
+    assert registry.get("alice") == "id-1"
+    registry.delete("alice")
+
+    # Re-opening must not bring deleted voices back from the JSON file
+    assert VoiceRegistry(db_path, json_path).get("alice") is None